@@ -0,0 +1,16 @@
+""" timing helper shared by the benchmark scripts """
+import time
+
+
+def time_it(label, func, count):
+    """
+    runs func once and prints the elapsed time and the rate
+
+    :param label: description of what is timed
+    :param func: function without arguments to time
+    :param count: number of items func processes, used to report the rate
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {count:>9} in {elapsed:8.3f}s  {count / elapsed:12,.0f}/s")
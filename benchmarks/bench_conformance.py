@@ -0,0 +1,42 @@
+"""
+benchmark for the cerberus conformance checks on every ItemDef in a Define-XML v2.1 file
+
+usage: python benchmarks/bench_conformance.py [define-xml file]
+"""
+import os
+import sys
+from cerberus import schema_registry, validator
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.define_2_1.rules.metadata_schema as METADATA
+from _timing import time_it
+
+DEFINE_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "tests", "data", "defineV21-SDTM.xml")
+
+
+def check_new_validator(docs):
+    # creates a validator for each check, as check_conformance did before the validators were cached
+    schema = schema_registry.get("ItemDef")
+    for doc in docs:
+        validator.Validator(schema).validate(doc)
+
+
+def check_cached_validator(docs):
+    checker = METADATA.MetadataSchema()
+    for doc in docs:
+        checker.check_conformance(doc, "ItemDef")
+
+
+def main():
+    define_file = sys.argv[1] if len(sys.argv) > 1 else DEFINE_FILE
+    loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1"))
+    loader.open_odm_document(define_file)
+    mdv = loader.MetaDataVersion()
+    docs = [item.to_dict() for item in mdv.ItemDef]
+    METADATA.MetadataSchema()
+    time_it("ItemDef new validator per check", lambda: check_new_validator(docs), len(docs))
+    time_it("ItemDef cached validator", lambda: check_cached_validator(docs), len(docs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+microbenchmark for constructing odmlib objects
+
+usage: python benchmarks/bench_construct.py [number of objects]
+"""
+import sys
+import odmlib.odm_1_3_2.model as ODM
+from _timing import time_it
+
+
+def create_item_data(count):
+    item_data = ODM.ItemData
+    for i in range(count):
+        item_data(ItemOID="IT.VS.VSORRES", Value="120")
+
+
+def create_compact_item_data(count):
+    item_data = ODM.ItemData.compact_class()
+    for i in range(count):
+        item_data(ItemOID="IT.VS.VSORRES", Value="120")
+
+
+def create_translated_text(count):
+    # XML attributes such as xml:lang arrive with the namespace in the name
+    lang = "{http://www.w3.org/XML/1998/namespace}lang"
+    for i in range(count):
+        ODM.TranslatedText(**{lang: "en", "_content": "Systolic Blood Pressure"})
+
+
+def assign_item_data(count):
+    item = ODM.ItemData(ItemOID="IT.VS.VSORRES", Value="120")
+    for i in range(count):
+        item.Value = "121"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    time_it("ItemData", lambda: create_item_data(count), count)
+    time_it("ItemData compact class", lambda: create_compact_item_data(count), count)
+    time_it("TranslatedText with xml:lang", lambda: create_translated_text(count), count)
+    time_it("ItemData.Value assignment", lambda: assign_item_data(count), count)
+
+
+if __name__ == "__main__":
+    main()
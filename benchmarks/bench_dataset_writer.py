@@ -0,0 +1,53 @@
+"""
+benchmark for writing Dataset-XML from odmlib ItemGroupData objects and with the columnar writer; the records repeat
+the AE rows in tests/data/ae_test.xml
+
+usage: python benchmarks/bench_dataset_writer.py [number of records]
+"""
+import os
+import sys
+import tempfile
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.dataset_1_0_1.model as ODM
+import odmlib.dataset_1_0_1.columnar as COL
+from _timing import time_it
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "tests", "data")
+
+
+def write_objects(odm_file, item_oids, rows):
+    root = ODM.ODM(FileOID="ODM.DATASET.001", DatasetXMLVersion="1.0.0", CreationDateTime="2022-03-20T14:58:25",
+                   ODMVersion="1.3.2", FileType="Snapshot")
+    root.ClinicalData = ODM.ClinicalData(StudyOID="cdisc.odmlib.001", MetaDataVersionOID="MDV.001")
+    for seq, row in enumerate(rows, 1):
+        igd = ODM.ItemGroupData(ItemGroupOID="IG.AE", ItemGroupDataSeq=seq)
+        for item_oid, value in zip(item_oids, row):
+            if value is not None:
+                igd.ItemData.append(ODM.ItemData(ItemOID=item_oid, Value=str(value)))
+        root.ClinicalData.ItemGroupData.append(igd)
+    root.write_xml(odm_file)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0"))
+    loader.open_odm_document(os.path.join(DATA_PATH, "define2-0-0-sdtm-test.xml"))
+    item_group_def = loader.MetaDataVersion().find("ItemGroupDef", "OID", "IG.AE")
+    writer = COL.ColumnarDatasetWriter(item_group_def, "ODM.DATASET.001", "cdisc.odmlib.001", "MDV.001")
+    dataset = COL.ColumnarDatasetReader(use_numpy=False).read(os.path.join(DATA_PATH, "ae_test.xml"))["IG.AE"]
+    columns = {item_oid: [None] * len(dataset) for item_oid in writer.item_oids}
+    for item_oid, column in dataset.columns.items():
+        columns[item_oid] = [value if present else None for value, present in zip(column.values, column.present)]
+    sample = list(zip(*[columns[item_oid] for item_oid in writer.item_oids]))
+    rows = [sample[i % len(sample)] for i in range(count)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        odm_file = os.path.join(tmp_dir, "ae.xml")
+        time_it("ItemGroupData objects and write_xml", lambda: write_objects(odm_file, writer.item_oids, rows), count)
+        time_it("ColumnarDatasetWriter.write_rows", lambda: writer.write_rows(odm_file, rows), count)
+        column_lists = {item_oid: [row[i] for row in rows] for i, item_oid in enumerate(writer.item_oids)}
+        time_it("ColumnarDatasetWriter.write_columns", lambda: writer.write_columns(odm_file, column_lists), count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+microbenchmark for the OID reference checks on a MetaDataVersion with many ItemDefs
+
+usage: python benchmarks/bench_oid_ref.py [number of ItemDefs]
+"""
+import sys
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.odm_1_3_2.rules.oid_ref as OID
+from _timing import time_it
+
+
+def create_mdv(count):
+    mdv = ODM.MetaDataVersion(OID="MDV.BENCH", Name="Benchmark MDV")
+    igd = ODM.ItemGroupDef(OID="IG.BENCH", Name="BENCH", Repeating="No")
+    # every tenth ItemDef is left unreferenced
+    igd.ItemRef = [ODM.ItemRef(ItemOID=f"IT.{i}", Mandatory="No") for i in range(count) if i % 10]
+    mdv.ItemGroupDef = [igd]
+    mdv.ItemDef = [ODM.ItemDef(OID=f"IT.{i}", Name=f"IT{i}", DataType="text") for i in range(count)]
+    return mdv
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    mdv = create_mdv(count)
+    oid_checker = OID.OIDRef()
+    mdv._init_oid_check(oid_checker)
+    time_it("check_oid_refs", oid_checker.check_oid_refs, count)
+    time_it("check_unreferenced_oids", oid_checker.check_unreferenced_oids, count)
+    time_it("find_oid_ref_violations", oid_checker.find_oid_ref_violations, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+benchmark for loading ClinicalData serially and with the parallel loader; the test file is generated by repeating the
+subjects in tests/data/odm-data-snapshot.xml
+
+usage: python benchmarks/bench_parallel_load.py [number of subjects] [number of processes]
+"""
+import os
+import re
+import sys
+import tempfile
+import odmlib.loader as LD
+import odmlib.odm_loader as OL
+import odmlib.parallel_loader as PL
+from _timing import time_it
+
+ODM_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "tests", "data", "odm-data-snapshot.xml")
+
+
+def create_odm_file(odm_file, count):
+    with open(ODM_FILE) as odm_in:
+        odm = odm_in.read()
+    subjects = re.findall(r"<SubjectData\b.*?</SubjectData>", odm, re.S)
+    repeated = []
+    for i in range(count):
+        subject = subjects[i % len(subjects)]
+        repeated.append(re.sub(r'SubjectKey="[^"]*"', f'SubjectKey="SS_{i:07d}"', subject, count=1))
+    start = odm.index(subjects[0])
+    end = odm.index(subjects[-1]) + len(subjects[-1])
+    with open(odm_file, "w") as odm_out:
+        odm_out.write(odm[:start] + "\n".join(repeated) + odm[end:])
+
+
+def load_serial(odm_file):
+    loader = LD.ODMLoader(OL.XMLODMLoader())
+    loader.open_odm_document(odm_file)
+    return loader.root().ClinicalData
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        odm_file = os.path.join(tmp_dir, "odm-data.xml")
+        create_odm_file(odm_file, count)
+        time_it("SubjectData serial load", lambda: load_serial(odm_file), count)
+        loader = PL.ParallelClinicalDataLoader(max_workers=max_workers)
+        time_it("SubjectData parallel load", lambda: loader.load_clinical_data(odm_file), count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+benchmark for fetching one subject from a large ODM file by parsing the whole file and with the subject index; the
+test file is generated by repeating the subjects in tests/data/odm-data-snapshot.xml
+
+usage: python benchmarks/bench_subject_index.py [number of subjects]
+"""
+import os
+import sys
+import tempfile
+import odmlib.loader as LD
+import odmlib.odm_loader as OL
+import odmlib.subject_index as SI
+from bench_parallel_load import create_odm_file
+from _timing import time_it
+
+
+def load_from_document(odm_file, subject_key):
+    loader = LD.ODMLoader(OL.XMLODMLoader())
+    loader.open_odm_document(odm_file)
+    for subject in loader.root().ClinicalData[0].SubjectData:
+        if subject.SubjectKey == subject_key:
+            return subject
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    subject_key = f"SS_{count // 2:07d}"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        odm_file = os.path.join(tmp_dir, "odm-data.xml")
+        create_odm_file(odm_file, count)
+        time_it("SubjectData from the parsed document", lambda: load_from_document(odm_file, subject_key), 1)
+        time_it("subject index build and save", lambda: SI.SubjectIndex(odm_file).open(), count)
+        index = SI.SubjectIndex(odm_file).open()
+        time_it("SubjectData from the subject index", lambda: index.load_subject(subject_key), 1)
+
+
+if __name__ == "__main__":
+    main()
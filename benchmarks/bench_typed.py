@@ -0,0 +1,76 @@
+"""
+microbenchmark for the date and time descriptors in odmlib.typed, and for loading a clinical data file where every
+ItemData has an AuditRecord with a DateTimeStamp
+
+usage: python benchmarks/bench_typed.py [number of objects]
+"""
+import os
+import sys
+import tempfile
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.define_2_1.model as DEFINE
+import odmlib.odm_loader as OL
+import odmlib.loader as LD
+from _timing import time_it
+
+
+def create_datetime_stamps(count):
+    # audit trails repeat a small number of distinct time stamps
+    stamps = [f"2021-03-{day:02d}T10:{minute:02d}:00" for day in range(1, 29) for minute in range(0, 60, 15)]
+    for i in range(count):
+        ODM.DateTimeStamp(_content=stamps[i % len(stamps)])
+
+
+def create_unique_datetime_stamps(count):
+    for i in range(count):
+        ODM.DateTimeStamp(_content=f"{2000 + i % 20}-01-01T{i % 24:02d}:{i % 60:02d}:{(i // 60) % 60:02d}")
+
+
+def create_item_group_defs(count):
+    for i in range(count):
+        DEFINE.ItemGroupDef(OID=f"IG.DS{i}", Name="DS", Repeating="No", Domain="DS", SASDatasetName="DS",
+                            Purpose="Tabulation", IsReferenceData="No", ArchiveLocationID="LF.DS",
+                            Structure="One record per disposition status")
+
+
+def write_audited_clinical_data(odm_file, count):
+    # each ItemGroupData holds 10 ItemData, so count ItemData are written with their AuditRecords
+    with open(odm_file, "w", encoding="utf-8") as odm_out:
+        odm_out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<ODM xmlns="http://www.cdisc.org/ns/odm/v1.3" FileOID="ODM.AUDIT" FileType="Snapshot" '
+                      'CreationDateTime="2021-03-01T10:00:00" ODMVersion="1.3.2">\n'
+                      '<ClinicalData StudyOID="ODM.STUDY" MetaDataVersionOID="MDV.001">\n')
+        for subject in range(count // 100):
+            odm_out.write(f'<SubjectData SubjectKey="SS_{subject:05d}"><StudyEventData StudyEventOID="SE.VISIT">'
+                          f'<FormData FormOID="FORM.VS">')
+            for repeat in range(1, 11):
+                odm_out.write(f'<ItemGroupData ItemGroupOID="IG.VS" ItemGroupRepeatKey="{repeat}">')
+                for item in range(10):
+                    odm_out.write(f'<ItemData ItemOID="IT.VS.{item}" Value="{120 + item}"><AuditRecord>'
+                                  f'<UserRef UserOID="USR.{subject % 5}"/><LocationRef LocationOID="LOC.1"/>'
+                                  f'<DateTimeStamp>2021-03-{repeat:02d}T10:{item * 5:02d}:00</DateTimeStamp>'
+                                  f'</AuditRecord></ItemData>')
+                odm_out.write('</ItemGroupData>')
+            odm_out.write('</FormData></StudyEventData></SubjectData>\n')
+        odm_out.write('</ClinicalData>\n</ODM>\n')
+
+
+def load_clinical_data(odm_file):
+    loader = LD.ODMLoader(OL.XMLODMLoader())
+    loader.open_odm_document(odm_file)
+    loader.root()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    time_it("DateTimeStamp (repeated values)", lambda: create_datetime_stamps(count), count)
+    time_it("DateTimeStamp (unique values)", lambda: create_unique_datetime_stamps(count), count)
+    time_it("define ItemGroupDef (SASName)", lambda: create_item_group_defs(count), count)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        odm_file = os.path.join(tmp_dir, "audited_clinical_data.xml")
+        write_audited_clinical_data(odm_file, count)
+        time_it("load ItemData with AuditRecord", lambda: load_clinical_data(odm_file), count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import odmlib.descriptor as DESC
+
+
+class UnsupportedRuleError(ValueError):
+    """ raised when a schema uses a cerberus rule or type that the native conformance checks do not implement """
+
+
+class NativeConformanceChecker:
+    """
+    checks odmlib objects against the cerberus schemas of a MetadataSchema without converting them to dictionaries;
+    each schema is compiled once into a check function that walks the attributes and elements of the odmlib objects
+    """
+    # tells ODMElement.verify_conformance to pass the odmlib object rather than the result of to_dict
+    native = True
+
+    def __init__(self, metadata_schema):
+        """
+        :param metadata_schema: MetadataSchema object from the rules of a model, e.g. odmlib.odm_1_3_2.rules
+        """
+        self.metadata_schema = metadata_schema
+        # compiled check functions by schema name and by id of the nested schemas
+        self._checks = {}
+        self._compiled = {}
+
+    def check_conformance(self, odm_obj, schema_name):
+        """
+        raises a ValueError that lists all the violations when odm_obj does not conform to the schema
+
+        :param odm_obj: odmlib object to check
+        :param schema_name: name of the schema, usually the name of the odmlib object class
+        :return: True when odm_obj conforms
+        """
+        violations = self.find_violations(odm_obj, schema_name)
+        if violations:
+            raise ValueError(violations)
+        return True
+
+    def find_violations(self, odm_obj, schema_name, path=None):
+        """
+        checks odm_obj and all its child elements against the schema
+
+        :param odm_obj: odmlib object to check
+        :param schema_name: name of the schema, usually the name of the odmlib object class
+        :param path: element path of odm_obj used in the violations; defaults to the class name
+        :return: list of {"path": element or attribute path, "message": cerberus style error message}
+        """
+        check = self._checks.get(schema_name)
+        if check is None:
+            schema = self.metadata_schema.get_schema(schema_name)
+            if schema is None:
+                raise ValueError(f"Schema {schema_name} not found in the metadata schema.")
+            check = self._compile_schema(schema)
+            self._checks[schema_name] = check
+        violations = []
+        check(odm_obj, type(odm_obj).__name__ if path is None else path, violations)
+        return violations
+
+    def find_list_violations(self, elements, schema_name, name, path, start=0):
+        """
+        checks some of the elements in the list of child elements name, as the schema of their parent defines them
+
+        :param elements: odmlib objects from the list of child elements
+        :param schema_name: name of the schema of the parent, usually the name of the parent class
+        :param name: name of the list of child elements, e.g. ItemDef
+        :param path: element path of the parent used in the violations
+        :param start: position of the first of the elements in the list of child elements
+        :return: list of {"path": element or attribute path, "message": cerberus style error message}
+        """
+        schema = self.metadata_schema.get_schema(schema_name)
+        if schema is None:
+            raise ValueError(f"Schema {schema_name} not found in the metadata schema.")
+        violations = []
+        rule = schema.get(name)
+        if rule is not None and "schema" in rule:
+            check_item = self._compile_rule(rule["schema"])
+            for i, element in enumerate(elements, start):
+                check_item(element, f"{path}/{name}[{i}]", violations)
+        return violations
+
+    def _compile_schema(self, schema):
+        """ returns a function that checks the attributes and elements of an odmlib object or dict against schema """
+        check = self._compiled.get(id(schema))
+        if check is not None:
+            return check
+        rules = []
+        known = frozenset(schema)
+
+        def check_object(obj, path, violations):
+            store = obj if isinstance(obj, dict) else obj.__dict__
+            for name, required, check_rule in rules:
+                value = store.get(name)
+                if value is not None:
+                    check_rule(value, path + "/" + name, violations)
+                elif required:
+                    violations.append({"path": path + "/" + name, "message": "required field"})
+            for name, value in store.items():
+                if value is not None and name not in known:
+                    violations.append({"path": path + "/" + name, "message": "unknown field"})
+        # nested schemas can refer back to this one, so it is registered before the rules are compiled
+        self._compiled[id(schema)] = check_object
+        try:
+            for name, rule in schema.items():
+                rules.append((name, rule.get("required", False), self._compile_rule(rule)))
+        except UnsupportedRuleError:
+            # the partly compiled check must not be used by a later call
+            del self._compiled[id(schema)]
+            raise
+        return check_object
+
+    def _compile_rule(self, rule):
+        """
+        returns a function that checks one attribute or element value against a cerberus rule; raises an
+        UnsupportedRuleError for the cerberus rules and types the native checks do not implement rather than
+        ignoring them
+        """
+        unsupported = [key for key in rule if key not in _RULE_KEYS]
+        if unsupported:
+            raise UnsupportedRuleError(f"The native conformance checks do not support the cerberus rules "
+                                       f"{', '.join(unsupported)}")
+        rule_type = rule.get("type")
+        if rule_type is not None and rule_type not in _VALUE_TYPES and rule_type not in ("dict", "list"):
+            raise UnsupportedRuleError(f"The native conformance checks do not support the cerberus type {rule_type}")
+        if "allowed" in rule and (rule_type in ("dict", "list") or "schema" in rule):
+            raise UnsupportedRuleError("The native conformance checks only support the cerberus allowed rule on values")
+        if rule_type is None and "schema" in rule:
+            # like cerberus, a schema rule without a type checks the value against the schema when it is a mapping
+            check_schema = self._compile_schema(rule["schema"])
+
+            def check_mapping(value, path, violations):
+                if isinstance(value, dict) or DESC.is_element(value):
+                    check_schema(value, path, violations)
+            return check_mapping
+        elif rule_type == "dict":
+            check_schema = self._compile_schema(rule["schema"]) if "schema" in rule else None
+
+            def check_dict(value, path, violations):
+                if not (isinstance(value, dict) or DESC.is_element(value)):
+                    violations.append({"path": path, "message": "must be of dict type"})
+                elif check_schema is not None:
+                    check_schema(value, path, violations)
+            return check_dict
+        elif rule_type == "list":
+            check_item = self._compile_rule(rule["schema"]) if "schema" in rule else None
+
+            def check_list(value, path, violations):
+                if not isinstance(value, list):
+                    violations.append({"path": path, "message": "must be of list type"})
+                elif check_item is not None:
+                    for i, item in enumerate(value):
+                        check_item(item, f"{path}[{i}]", violations)
+            return check_list
+        value_types = _VALUE_TYPES.get(rule_type, object)
+        allowed = frozenset(rule["allowed"]) if "allowed" in rule else None
+
+        def check_value(value, path, violations):
+            if not isinstance(value, value_types):
+                violations.append({"path": path, "message": f"must be of {rule_type} type"})
+            elif allowed is not None and value not in allowed:
+                violations.append({"path": path, "message": f"unallowed value {value}"})
+        return check_value
+
+
+# python types accepted for the cerberus types used in the odmlib schemas
+_VALUE_TYPES = {"string": str, "integer": int, "float": (float, int), "boolean": bool}
+# cerberus rules used in the odmlib schemas that the native checks implement
+_RULE_KEYS = frozenset(["type", "required", "allowed", "schema"])
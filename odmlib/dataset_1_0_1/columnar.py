@@ -0,0 +1,348 @@
+from array import array
+from itertools import repeat
+import odmlib.odm_parser as P
+import odmlib.ns_registry as NS
+import odmlib.odm_element as OE
+import codecs
+import datetime
+import io
+import os
+try:
+    import numpy as NP
+except ImportError:
+    NP = None
+
+DATASET_NS_URI = "http://www.cdisc.org/ns/Dataset-XML/v1.0"
+ODM_NS_URI = "http://www.cdisc.org/ns/odm/v1.3"
+ITEM_GROUP_DATA_SEQ = "{" + DATASET_NS_URI + "}ItemGroupDataSeq"
+ITEM_DATA_TAG = "{" + ODM_NS_URI + "}ItemData"
+# array typecodes for the define.xml ItemDef DataTypes stored as numbers; all other DataTypes are stored as text
+NUMERIC_TYPECODES = {"integer": "q", "float": "d", "double": "d"}
+# values used for the rows that have no ItemData in numeric columns
+MISSING_NUMBERS = {"q": 0, "d": float("nan")}
+
+
+class Column:
+    """
+    values of one ItemOID in the rows of a dataset; rows without an ItemData have present set to 0. Integers outside
+    the int64 range move the values of the column to a list of Python objects
+    """
+    __slots__ = ("item_oid", "data_type", "typecode", "values", "present")
+
+    def __init__(self, item_oid, data_type="text"):
+        """
+        :param item_oid: ItemOID of the ItemData in the column
+        :param data_type: define.xml ItemDef DataType used to type the values
+        """
+        self.item_oid = item_oid
+        self.data_type = data_type
+        self.typecode = NUMERIC_TYPECODES.get(data_type)
+        self.values = array(self.typecode) if self.typecode else []
+        self.present = bytearray()
+
+    def __len__(self):
+        return len(self.present)
+
+    def append(self, row, value):
+        """
+        sets the value of the column in row, filling any rows skipped since the last value as missing
+
+        :param row: position of the row in the dataset
+        :param value: ItemData Value string
+        """
+        if len(self.present) < row:
+            self.fill(row)
+        elif len(self.present) > row:
+            raise ValueError(f"ItemData {self.item_oid} occurs more than once in row {row}")
+        if self.typecode:
+            try:
+                value = int(value) if self.typecode == "q" else float(value)
+            except ValueError:
+                raise ValueError(f"ItemData {self.item_oid} value {value} in row {row} is not a valid "
+                                 f"{self.data_type}") from None
+            if isinstance(self.values, array):
+                try:
+                    self.values.append(value)
+                    self.present.append(1)
+                    return
+                except OverflowError:
+                    # the value does not fit in an int64 array
+                    self._to_objects()
+        self.values.append(value)
+        self.present.append(1)
+
+    def _to_objects(self):
+        """ replaces the array of values with a list of Python objects that has None for the missing values """
+        self.values = [value if is_present else None for value, is_present in zip(self.values, self.present)]
+
+    def fill(self, length):
+        """ adds missing values until the column has length rows """
+        missing = length - len(self.present)
+        if isinstance(self.values, array):
+            self.values.extend(array(self.values.typecode, [MISSING_NUMBERS[self.values.typecode]]) * missing)
+        else:
+            self.values.extend([None] * missing)
+        self.present.extend(bytes(missing))
+
+    def to_numpy(self):
+        """ converts the values to a NumPy array and present to a NumPy boolean array; requires NumPy """
+        if NP is None:
+            raise ImportError("Converting Dataset-XML columns to NumPy arrays requires the numpy package to be installed")
+        if isinstance(self.values, array):
+            self.values = NP.frombuffer(self.values, dtype=NP.int64 if self.values.typecode == "q" else NP.float64)
+        else:
+            self.values = NP.array(self.values, dtype=object)
+        self.present = NP.frombuffer(self.present, dtype=NP.bool_)
+
+
+class ColumnarDataset:
+    """ the ItemGroupData records of one ItemGroupOID stored as a column for each ItemOID """
+    def __init__(self, item_group_oid):
+        """
+        :param item_group_oid: ItemGroupOID of the ItemGroupData records in the dataset
+        """
+        self.item_group_oid = item_group_oid
+        # ItemGroupDataSeq of each row
+        self.seq = array("q")
+        # {ItemOID: Column} in the order the ItemOIDs are first found
+        self.columns = {}
+
+    def __len__(self):
+        return len(self.seq)
+
+    def __getitem__(self, item_oid):
+        return self.columns[item_oid]
+
+    def row_position(self, seq):
+        """
+        returns the position of the row with an ItemGroupDataSeq
+
+        :param seq: ItemGroupDataSeq of the row
+        :return: position of the row in the columns
+        """
+        # ItemGroupDataSeq usually numbers the rows from 1
+        if 0 < seq <= len(self.seq) and self.seq[seq - 1] == seq:
+            return seq - 1
+        for position, row_seq in enumerate(self.seq):
+            if row_seq == seq:
+                return position
+        raise ValueError(f"ItemGroupDataSeq {seq} not found in the {self.item_group_oid} dataset")
+
+
+class ColumnarDatasetReader:
+    """
+    streams a Dataset-XML file into a ColumnarDataset for each ItemGroupOID without creating odmlib objects for the
+    ItemGroupData and ItemData elements
+    """
+    def __init__(self, mdv=None, data_types=None, use_numpy=None, xml_backend=None):
+        """
+        :param mdv: define.xml MetaDataVersion odmlib object used to type the columns using ItemDef DataType
+        :param data_types: dictionary of {ItemOID: DataType} used instead of, or in addition to, mdv
+        :param use_numpy: if True the columns are converted to NumPy arrays; None converts them when NumPy is installed
+        :param xml_backend: None or "etree" for ElementTree, "lxml" to use lxml when it is installed
+        """
+        self.data_types = {}
+        if mdv is not None:
+            self.data_types.update({item.OID: item.DataType for item in mdv.ItemDef})
+        if data_types:
+            self.data_types.update(data_types)
+        self.use_numpy = NP is not None if use_numpy is None else use_numpy
+        self.xml_backend = xml_backend
+
+    def read(self, filename):
+        """
+        reads all the ItemGroupData records in a Dataset-XML file
+
+        :param filename: path and filename of the Dataset-XML document
+        :return: dictionary of {ItemGroupOID: ColumnarDataset}
+        """
+        nsr = NS.NamespaceRegistry(prefix="odm", uri=ODM_NS_URI, is_default=True)
+        iter_parser = P.ODMIterParser(filename, nsr, xml_backend=self.xml_backend)
+        datasets = {}
+        for elem in iter_parser.iter_elements("ItemGroupData"):
+            item_group_oid = elem.get("ItemGroupOID")
+            dataset = datasets.get(item_group_oid)
+            if dataset is None:
+                dataset = datasets[item_group_oid] = ColumnarDataset(item_group_oid)
+            row = len(dataset.seq)
+            seq = elem.get(ITEM_GROUP_DATA_SEQ)
+            dataset.seq.append(int(seq) if seq is not None else row + 1)
+            columns = dataset.columns
+            for item in elem:
+                if item.tag != ITEM_DATA_TAG:
+                    continue
+                item_oid = item.get("ItemOID")
+                value = item.get("Value")
+                if value is None:
+                    continue
+                column = columns.get(item_oid)
+                if column is None:
+                    column = columns[item_oid] = Column(item_oid, self.data_types.get(item_oid, "text"))
+                column.append(row, value)
+        for dataset in datasets.values():
+            for column in dataset.columns.values():
+                column.fill(len(dataset.seq))
+                if self.use_numpy:
+                    column.to_numpy()
+            if self.use_numpy:
+                dataset.seq = NP.frombuffer(dataset.seq, dtype=NP.int64)
+        return datasets
+
+
+class ColumnarDatasetWriter:
+    """
+    streams the records of one ItemGroupDef to a Dataset-XML file from columns or rows without creating odmlib objects
+    for the ItemGroupData and ItemData elements; the ItemData are written in the ItemRef order of the ItemGroupDef and
+    missing values are left out
+    """
+    def __init__(self, item_group_def, file_oid, study_oid, metadata_version_oid, odm_attributes=None,
+                 buffer_size=8192):
+        """
+        :param item_group_def: define.xml ItemGroupDef odmlib object with the ItemRefs of the dataset
+        :param file_oid: FileOID of the ODM element
+        :param study_oid: StudyOID of the ClinicalData element
+        :param metadata_version_oid: MetaDataVersionOID of the ClinicalData element
+        :param odm_attributes: dictionary of other ODM element attributes, e.g. Originator; these replace the defaults
+            for ODMVersion, FileType, DatasetXMLVersion and CreationDateTime
+        :param buffer_size: number of records collected before they are written to the output
+        """
+        self.item_group_oid = item_group_def.OID
+        self.item_oids = item_oid_order(item_group_def)
+        self.odm_attributes = {"FileOID": file_oid, "ODMVersion": "1.3.2", "FileType": "Snapshot",
+                               "DatasetXMLVersion": "1.0.0", "CreationDateTime": None}
+        if odm_attributes:
+            self.odm_attributes.update(odm_attributes)
+        if self.odm_attributes["CreationDateTime"] is None:
+            self.odm_attributes["CreationDateTime"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self.clinical_data_attributes = {"StudyOID": study_oid, "MetaDataVersionOID": metadata_version_oid}
+        self.buffer_size = buffer_size
+        # the ItemData start tags are the same for every record
+        self._item_tags = ["<ItemData ItemOID=\"" + OE._escape_attrib(item_oid) + "\" Value=\""
+                           for item_oid in self.item_oids]
+
+    def write_columns(self, odm_file, columns, seq=None):
+        """
+        writes a record for each row in the columns
+
+        :param odm_file: path and file to write the Dataset-XML, or a text or binary file object
+        :param columns: ColumnarDataset, or dictionary of {ItemOID: Column or sequence of values with None for missing}
+        :param seq: ItemGroupDataSeq of each row; defaults to the seq of a ColumnarDataset or numbers the rows from 1
+        """
+        if isinstance(columns, ColumnarDataset):
+            if seq is None:
+                seq = columns.seq
+            columns = columns.columns
+        item_oid_set = set(self.item_oids)
+        unknown = [item_oid for item_oid in columns if item_oid not in item_oid_set]
+        if unknown:
+            raise ValueError(f"ItemOIDs {', '.join(unknown)} are not in the ItemRefs of {self.item_group_oid}")
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"The columns of {self.item_group_oid} do not all have the same number of rows")
+        length = lengths.pop() if lengths else len(seq) if seq is not None else 0
+        if seq is None:
+            seq = range(1, length + 1)
+        elif len(seq) != length:
+            raise ValueError(f"There are {len(seq)} ItemGroupDataSeq values for {length} rows in {self.item_group_oid}")
+        values = []
+        for item_oid in self.item_oids:
+            column = columns.get(item_oid)
+            if column is None:
+                values.append(repeat(None, length))
+            elif isinstance(column, Column):
+                values.append(_present_values(column))
+            else:
+                values.append(column)
+        rows = zip(*values)
+        self._write(odm_file, zip(seq, rows))
+
+    def write_rows(self, odm_file, rows, start_seq=1):
+        """
+        writes a record for each row; rows can be a generator so the records do not all need to be in memory
+
+        :param odm_file: path and file to write the Dataset-XML, or a text or binary file object
+        :param rows: iterable of dictionaries of {ItemOID: value}, or of sequences of values in ItemRef order; missing
+            values are None or left out of the dictionaries
+        :param start_seq: ItemGroupDataSeq of the first row
+        """
+        item_oids = self.item_oids
+        item_oid_set = set(item_oids)
+
+        def records():
+            for seq, row in enumerate(rows, start_seq):
+                if isinstance(row, dict):
+                    if not item_oid_set.issuperset(row):
+                        unknown = [item_oid for item_oid in row if item_oid not in item_oid_set]
+                        raise ValueError(f"ItemOIDs {', '.join(unknown)} in row {seq} are not in the ItemRefs of "
+                                         f"{self.item_group_oid}")
+                    yield seq, [row.get(item_oid) for item_oid in item_oids]
+                elif len(row) != len(item_oids):
+                    raise ValueError(f"Row {seq} has {len(row)} values for the {len(item_oids)} ItemRefs of "
+                                     f"{self.item_group_oid}")
+                else:
+                    yield seq, row
+        self._write(odm_file, records())
+
+    def _write(self, odm_file, records):
+        if isinstance(odm_file, (str, os.PathLike)):
+            with open(odm_file, "w", encoding="utf-8") as out:
+                self._write_document(out, records)
+        elif isinstance(odm_file, (io.RawIOBase, io.BufferedIOBase)):
+            self._write_document(codecs.getwriter("utf-8")(odm_file), records)
+        else:
+            self._write_document(odm_file, records)
+
+    def _write_document(self, out, records):
+        buffer = ["<?xml version='1.0' encoding='utf-8'?>\n<ODM",
+                  _attributes(self.odm_attributes),
+                  " xmlns=\"" + ODM_NS_URI + "\" xmlns:data=\"" + DATASET_NS_URI + "\">",
+                  "<ClinicalData", _attributes(self.clinical_data_attributes), ">"]
+        start_tag = "<ItemGroupData ItemGroupOID=\"" + OE._escape_attrib(self.item_group_oid) + "\" data:ItemGroupDataSeq=\""
+        item_tags = self._item_tags
+        escape = OE._escape_attrib
+        count = 0
+        for seq, row in records:
+            buffer.append(start_tag + str(seq) + "\">")
+            for item_tag, value in zip(item_tags, row):
+                if value is not None:
+                    buffer.append(item_tag + escape(_value_text(value)) + "\" />")
+            buffer.append("</ItemGroupData>")
+            count += 1
+            if count == self.buffer_size:
+                out.write("".join(buffer))
+                buffer.clear()
+                count = 0
+        buffer.append("</ClinicalData></ODM>")
+        out.write("".join(buffer))
+
+
+def item_oid_order(item_group_def):
+    """
+    returns the ItemOIDs of an ItemGroupDef in the order of the ItemRef OrderNumbers, or in the order of the ItemRefs
+    when they are not all numbered
+
+    :param item_group_def: define.xml ItemGroupDef odmlib object
+    :return: list of ItemOIDs
+    """
+    item_refs = list(item_group_def.ItemRef)
+    if all(item_ref.OrderNumber is not None for item_ref in item_refs):
+        item_refs.sort(key=lambda item_ref: item_ref.OrderNumber)
+    return [item_ref.ItemOID for item_ref in item_refs]
+
+
+def _present_values(column):
+    """ iterates over the values of a Column with None for the rows that have no value """
+    for value, is_present in zip(column.values, column.present):
+        yield value if is_present else None
+
+
+def _value_text(value):
+    """ returns the Value text of an ItemData; integral floats are written without the .0 added by str """
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return str(value)
+
+
+def _attributes(attributes):
+    return "".join(" " + name + "=\"" + OE._escape_attrib(str(value)) + "\""
+                   for name, value in attributes.items() if value is not None)
@@ -0,0 +1,109 @@
+from collections.abc import Mapping
+import odmlib.dataset_1_0_1.columnar as COL
+
+
+class RecordLayout:
+    """ positions of the ItemOIDs in the records of one ItemGroupDef, built once from the define.xml ItemRef order """
+    def __init__(self, item_group_def):
+        """
+        :param item_group_def: define.xml ItemGroupDef odmlib object with the ItemRefs of the dataset
+        """
+        self.item_group_oid = item_group_def.OID
+        self.item_oids = COL.item_oid_order(item_group_def)
+        self.positions = {item_oid: position for position, item_oid in enumerate(self.item_oids)}
+
+    def record(self, item_group_data):
+        """
+        returns a view of an ItemGroupData that looks up its ItemData by ItemOID
+
+        :param item_group_data: dataset_1_0_1 ItemGroupData odmlib object
+        :return: Record
+        """
+        return Record(self, item_group_data)
+
+    def records(self, item_group_data):
+        """
+        iterates over views of the records of this layout's ItemGroupOID
+
+        :param item_group_data: iterable of ItemGroupData odmlib objects, e.g. ClinicalData.ItemGroupData
+        :return: generator of Record
+        """
+        item_group_oid = self.item_group_oid
+        for igd in item_group_data:
+            if igd.ItemGroupOID == item_group_oid:
+                yield Record(self, igd)
+
+    def values(self, item_group_data):
+        """
+        returns the values of an ItemGroupData in ItemRef order with None for the items left out of the record
+
+        :param item_group_data: dataset_1_0_1 ItemGroupData odmlib object
+        :return: list of values
+        """
+        return [None if item is None else item.Value for item in self._index(item_group_data)]
+
+    def _index(self, item_group_data):
+        """ returns the ItemData of an ItemGroupData in ItemRef order with None for the items left out """
+        items = [None] * len(self.item_oids)
+        positions = self.positions
+        for item in item_group_data.ItemData:
+            position = positions.get(item.ItemOID)
+            if position is None:
+                raise ValueError(f"ItemData {item.ItemOID} in ItemGroupData {item_group_data.ItemGroupDataSeq} is not "
+                                 f"in the ItemRefs of {self.item_group_oid}")
+            items[position] = item
+        return items
+
+
+class Record(Mapping):
+    """
+    read-only mapping of ItemOID to Value for an ItemGroupData; the items of the ItemGroupDef left out of a sparse
+    record have the value None, and ItemOIDs that are not in the ItemGroupDef raise a KeyError
+    """
+    __slots__ = ("layout", "item_group_data", "_items")
+
+    def __init__(self, layout, item_group_data):
+        """
+        :param layout: RecordLayout for the ItemGroupOID of the record
+        :param item_group_data: dataset_1_0_1 ItemGroupData odmlib object
+        """
+        self.layout = layout
+        self.item_group_data = item_group_data
+        self._items = None
+
+    def __getitem__(self, item_oid):
+        item = self.item(item_oid)
+        return None if item is None else item.Value
+
+    def __iter__(self):
+        return iter(self.layout.item_oids)
+
+    def __len__(self):
+        return len(self.layout.item_oids)
+
+    def item(self, item_oid):
+        """
+        returns the ItemData with an ItemOID
+
+        :param item_oid: ItemOID from the ItemRefs of the ItemGroupDef
+        :return: ItemData odmlib object, or None when the record leaves the item out
+        """
+        position = self.layout.positions[item_oid]
+        items = self._items
+        if items is None:
+            item_data = self.item_group_data.ItemData
+            # complete records have each ItemData at the position of its ItemRef
+            if position < len(item_data) and item_data[position].ItemOID == item_oid:
+                return item_data[position]
+            items = self._items = self.layout._index(self.item_group_data)
+        return items[position]
+
+
+def record_layouts(mdv):
+    """
+    creates a RecordLayout for each ItemGroupDef in a define.xml MetaDataVersion
+
+    :param mdv: define.xml MetaDataVersion odmlib object
+    :return: dictionary of {ItemGroupOID: RecordLayout}
+    """
+    return {igd.OID: RecordLayout(igd) for igd in mdv.ItemGroupDef}
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from cerberus import schema_registry, validator
+from cerberus import schema_registry
+import odmlib.schema_cache as SC
 
 
 class ConformanceChecker(ABC):
@@ -9,18 +10,8 @@ class ConformanceChecker(ABC):
             "Attempted to execute an abstract method validate_tree in the Validator class")
 
 
-class MetadataSchema(ConformanceChecker):
+class MetadataSchema(SC.SchemaCacheMixin, ConformanceChecker):
     """ The metadata schema for Define-XML v2.1 to aid in conformance checking """
-    def __init__(self):
-        self._set_metadata_registry()
-
-    def check_conformance(self, doc, schema_name):
-        schema = schema_registry.get(schema_name)
-        v = validator.Validator(schema)
-        is_valid = v.validate(doc)
-        if not is_valid:
-            raise ValueError(v.errors)
-        return is_valid
 
     @staticmethod
     def _set_metadata_registry():
@@ -1,54 +1,10 @@
+import odmlib.oid_ref as OR
 
-class OIDRef:
-    def __init__(self, skip_attrs=[], skip_elems=[]):
-        self.oid = {}
-        self.oid_ref = {}
-        self._init_oid_ref()
-        self.ref_def = {}
-        self._init_ref_def()
-        self.def_ref = {}
-        self._init_def_ref()
-        self.skip_attr = ["FileOID", "PriorFileOID", "StudyOID", "MetaDataVersionOID", "ItemGroupOID"] + skip_attrs
-        self.skip_elem = ["ODM", "Study", "MetaDataVersion", "ItemGroupDef"] + skip_elems
-        self.is_verified = False
 
-
-    def add_oid(self, oid, element):
-        """ odmlib expects all OIDs to be unique within the scope of an ODM document """
-        if oid in self.oid:
-            raise ValueError(f"OID {oid} is not unique - element {element}")
-        if element not in self.skip_elem:
-            self.oid[oid] = element
-
-    def add_oid_ref(self, oid, attr):
-        if attr not in self.skip_attr and attr in self.oid_ref:
-            self.oid_ref[attr].add(oid)
-
-    def is_oids_verified(self):
-        if self.oid and self.is_verified:
-            return True
-        else:
-            return False
-
-    def check_oid_refs(self):
-        for attr, oid_set in self.oid_ref.items():
-            for oid in oid_set:
-                if attr not in self.skip_attr:
-                    if oid not in self.oid:
-                        raise ValueError(f"OID {oid} referenced in the attribute {attr} is not found.")
-                    elif self.ref_def.get(attr) != self.oid.get(oid):
-                        raise ValueError(f"OID reference for attribute {attr} element types do not match: "
-                                         f"{self.ref_def.get(attr)} and {self.oid.get(oid)}")
-        return True
-
-    def check_unreferenced_oids(self):
-        """ identify ELEMENTS that are defined but not used """
-        orphans = {}
-        for oid, elem in self.oid.items():
-            for ref in self.def_ref[elem]:
-                if oid not in self.oid_ref[ref]:
-                    orphans[oid] = ref
-        return orphans
+class OIDRef(OR.BaseOIDRef):
+    default_skip_attrs = ["FileOID", "PriorFileOID", "StudyOID", "MetaDataVersionOID", "ItemGroupOID"]
+    default_skip_elems = ["ODM", "Study", "MetaDataVersion", "ItemGroupDef"]
+    ignore_unknown_refs = True
 
     def _init_oid_ref(self):
         # self.oid_ref["MetaDataVersionOID"] = set()
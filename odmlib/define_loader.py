@@ -1,14 +1,36 @@
 import odmlib.document_loader as DL
 import odmlib.odm_parser as P
+import odmlib.load_plan as LP
+import odmlib.lazy_list as LL
 import odmlib.ns_registry as NS
+import functools
 import json
 import importlib
 
 
 class XMLDefineLoader(DL.DocumentLoader):
-    def __init__(self, model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0", local_model=False):
+    def __init__(self, model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0", local_model=False,
+                 single_pass=False, xml_backend=None, trusted=False, lazy=False,
+                 compact=False):
+        """
+        :param model_package: name of the odmlib model package, e.g. define_2_0
+        :param ns_uri: namespace URI of the model
+        :param local_model: if True model_package is imported as a top-level package rather than from odmlib
+        :param single_pass: if True the children of each element are dispatched in one pass over them instead of a
+            find or findall call for each child element in the model
+        :param xml_backend: None or "etree" for ElementTree, "lxml" to use lxml when it is installed
+        :param trusted: if True the loaded values are stored without running the descriptor validation
+        :param lazy: if True the lists of child elements are loaded the first time they are used
+        :param compact: if True the objects are created from the slotted compact classes; compact objects keep their
+            attributes and elements in model declaration order, not document order, so they are written in model order
+        """
         self.filename = None
         self.parser = None
+        self.single_pass = single_pass
+        self.trusted = trusted
+        self.lazy = lazy
+        self.compact = compact
+        self.xml_backend = xml_backend
         if local_model:
             self.DEF = importlib.import_module(f"{model_package}.model")
         else:
@@ -17,37 +39,48 @@ class XMLDefineLoader(DL.DocumentLoader):
         self.nsr = NS.NamespaceRegistry()
 
     def load_document(self, elem, *args):
+        return self._load_element(elem, self.lazy)
+
+    def _load_element(self, elem, lazy):
         elem_name = elem.tag[elem.tag.find('}') + 1:]
+        plan = LP.LoadPlan.get_plan(self.DEF, elem_name, self.compact)
         if elem.text and not elem.text.isspace():
-            attrib = {**elem.attrib, **{"_content": elem.text}}
-            odm_obj = eval("self.DEF." + elem_name + "(**" + str(attrib) + ")")
+            odm_obj = plan.create({**elem.attrib, **{"_content": elem.text}}, self.trusted)
         else:
-            odm_obj = eval("self.DEF." + elem_name + "(**" + str(elem.attrib) + ")")
-        odm_obj_dict = eval("self.DEF." + elem_name + ".__dict__.items()")
-        for k, v in odm_obj_dict:
-            if type(v).__name__ == "ODMObject":
-                namespace = self.nsr.get_ns_entry_dict(v.namespace)
-                e = elem.find(v.namespace + ":" + k, namespace)
+            odm_obj = plan.create(elem.attrib, self.trusted)
+        if self.single_pass:
+            for (k, desc, is_list, path), elems in plan.dispatch_children(elem, self.nsr):
+                if is_list and lazy:
+                    plan.set_child(odm_obj, desc, LL.LazyList(self.load_document, elems), True)
+                elif is_list:
+                    plan.set_child(odm_obj, desc, [self._load_element(e, lazy) for e in elems], self.trusted)
+                else:
+                    plan.set_child(odm_obj, desc, self._load_element(elems[0], lazy), self.trusted)
+            return odm_obj
+        for k, desc, is_list, path in plan.children:
+            namespace = self.nsr.get_ns_entry_dict(desc.namespace)
+            if is_list:
+                elems = elem.findall(path, namespace)
+                if elems and lazy:
+                    plan.set_child(odm_obj, desc, LL.LazyList(self.load_document, elems), True)
+                elif elems:
+                    plan.set_child(odm_obj, desc, [self._load_element(e, lazy) for e in elems], self.trusted)
+            else:
+                e = elem.find(path, namespace)
                 if e is not None:
-                    odm_child_obj = self.load_document(e)
-                    exec("odm_obj." + k + " = odm_child_obj")
-            elif type(v).__name__ == "ODMListObject":
-                namespace = self.nsr.get_ns_entry_dict(v.namespace)
-                for e in elem.findall(v.namespace + ":" + k, namespace):
-                    odm_child_obj = self.load_document(e)
-                    eval("odm_obj." + k + ".append(odm_child_obj)")
+                    plan.set_child(odm_obj, desc, self._load_element(e, lazy), self.trusted)
         return odm_obj
 
     def create_document(self, filename, namespace_registry=None):
         self.filename = filename
         self._set_registry(namespace_registry)
-        self.parser = P.ODMParser(self.filename, self.nsr)
+        self.parser = P.ODMParser(self.filename, self.nsr, xml_backend=self.xml_backend)
         root = self.parser.parse()
         return root
 
     def create_document_from_string(self, odm_string, namespace_registry=None):
         self._set_registry(namespace_registry)
-        self.parser = P.ODMStringParser(odm_string, self.nsr)
+        self.parser = P.ODMStringParser(odm_string, self.nsr, xml_backend=self.xml_backend)
         root = self.parser.parse()
         return root
 
@@ -75,25 +108,37 @@ class XMLDefineLoader(DL.DocumentLoader):
 
 
 class JSONDefineLoader(DL.DocumentLoader):
-    def __init__(self, model_package="define_2_0"):
+    def __init__(self, model_package="define_2_0", trusted=False, lazy=False, compact=False):
+        """
+        :param model_package: name of the odmlib model package, e.g. define_2_0
+        :param trusted: if True the loaded values are stored without running the descriptor validation
+        :param lazy: if True the lists of child elements are loaded the first time they are used
+        :param compact: if True the objects are created from the slotted compact classes; compact objects keep their
+            attributes and elements in model declaration order, not document order, so they are written in model order
+        """
         self.filename = None
         self.odm_dict = {}
+        self.trusted = trusted
+        self.lazy = lazy
+        self.compact = compact
         self.DEF = importlib.import_module(f"odmlib.{model_package}.model")
 
     def load_document(self, odm_dict, key):
+        plan = LP.LoadPlan.get_plan(self.DEF, key, self.compact)
         attrib = {key: value for key, value in odm_dict.items() if not isinstance(value, (list, dict))}
-        odm_obj = eval("self.DEF." + key + "(**" + str(attrib) + ")")
-        odm_obj_items = eval("self.DEF." + key + ".__dict__.items()")
-        for k, v in odm_obj_items:
-            if type(v).__name__ == "ODMObject":
-                if k in odm_dict:
-                    odm_child_obj = self.load_document(odm_dict[k], k)
-                    exec("odm_obj." + k + " = odm_child_obj")
-            elif type(v).__name__ == "ODMListObject":
-                if k in odm_dict:
-                    for val in odm_dict[k]:
-                        odm_child_obj = self.load_document(val, k)
-                        eval("odm_obj." + k + ".append(odm_child_obj)")
+        odm_obj = plan.create(attrib, self.trusted)
+        for k, desc, is_list, path in plan.children:
+            if k in odm_dict:
+                if is_list and self.lazy:
+                    if odm_dict[k]:
+                        plan.set_child(odm_obj, desc, LL.LazyList(functools.partial(self.load_document, key=k),
+                                                                  odm_dict[k]), True)
+                elif is_list:
+                    children = [self.load_document(val, k) for val in odm_dict[k]]
+                    if children:
+                        plan.set_child(odm_obj, desc, children, self.trusted)
+                else:
+                    plan.set_child(odm_obj, desc, self.load_document(odm_dict[k], k), self.trusted)
         return odm_obj
 
     def create_document(self, filename):
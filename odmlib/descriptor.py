@@ -1,3 +1,61 @@
+# weak references to the observers, such as live OID indexes, of each odmlib object, keyed by the id of the object;
+# only the observers registered for an object are told about changes to its descriptor values before they are stored
+observers = {}
+
+
+def add_observer(instance, observer_ref):
+    """
+    registers an observer for changes to the descriptor values of one odmlib object; the observer must keep a
+    reference to instance while it is registered so the id is not reused
+
+    :param instance: odmlib object to observe
+    :param observer_ref: weakref.ref to an object with a value_changed method
+    """
+    observers.setdefault(id(instance), []).append(observer_ref)
+
+
+def remove_observer(instance_id, observer_ref):
+    """
+    stops an observer from being told about changes to one odmlib object
+
+    :param instance_id: id of the observed odmlib object
+    :param observer_ref: weakref.ref passed to add_observer
+    """
+    refs = observers.get(instance_id)
+    if refs is not None:
+        if observer_ref in refs:
+            refs.remove(observer_ref)
+        if not refs:
+            del observers[instance_id]
+
+
+def notify_observers(instance, name, value):
+    """
+    passes a change to a descriptor value to each observer of instance; an observer may return a replacement value
+
+    :param instance: odmlib object that is changing
+    :param name: name of the attribute or element that is changing
+    :param value: new value, or None when the value is deleted
+    :return: value to store
+    """
+    refs = observers.get(id(instance))
+    if refs:
+        for observer_ref in tuple(refs):
+            observer = observer_ref()
+            if observer is not None:
+                value = observer.value_changed(instance, name, value)
+    return value
+
+
+def is_element(value):
+    """
+    returns True if value is an odmlib object, including objects of the compact classes; odmlib objects are
+    recognized by the attributes their metaclass creates, so the check does not import the model classes
+
+    :param value: any value, such as an attribute or element value of an odmlib object
+    :return: True for odmlib objects
+    """
+    return hasattr(type(value), "_elem_names")
 
 
 class Descriptor:
@@ -19,16 +77,73 @@ class Descriptor:
                     self.__set__(instance, [])
                 else:
                     if self.element_class is None:
-                        instance.__dict__[self.name] = self.element_class
+                        Descriptor.__set__(self, instance, self.element_class)
                     else:
                         try:
-                            instance.__dict__[self.name] = self.element_class()
+                            Descriptor.__set__(self, instance, self.element_class())
                         except ValueError:
-                            instance.__dict__[self.name] = None
+                            Descriptor.__set__(self, instance, None)
             return instance.__dict__[self.name]
 
     def __set__(self, instance, value):
+        if observers:
+            value = notify_observers(instance, self.name, value)
         instance.__dict__[self.name] = value
 
     def __delete__(self, instance):
+        if observers:
+            notify_observers(instance, self.name, None)
         del instance.__dict__[self.name]
+
+
+class SlotDescriptor(Descriptor):
+    """
+    mixin for the descriptors of compact classes that reads and writes the value in the instance's slot rather than
+    through the CompactStorage view returned by the instance's __dict__; validation runs unchanged in the descriptor
+    classes that come before it in the method resolution order
+    """
+    # member descriptor of the slot that holds the value; set when the compact class is created
+    slot = None
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, cls)
+        except AttributeError:
+            # the value has not been set, so the default is created as it is for model classes
+            return Descriptor.__get__(self, instance, cls)
+
+    def __set__(self, instance, value):
+        if observers:
+            value = notify_observers(instance, self.name, value)
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance):
+        if observers:
+            notify_observers(instance, self.name, None)
+        try:
+            self.slot.__delete__(instance)
+        except AttributeError:
+            raise KeyError(self.name) from None
+
+
+_slot_descriptor_classes = {}
+
+
+def slot_descriptor(desc):
+    """
+    returns a copy of a descriptor that stores its value in a slot; the copy's class puts SlotDescriptor just before
+    Descriptor in the method resolution order of the descriptor's class
+
+    :param desc: descriptor of a model class
+    :return: descriptor for the compact version of the model class
+    """
+    desc_class = type(desc)
+    slot_class = _slot_descriptor_classes.get(desc_class)
+    if slot_class is None:
+        slot_class = type(desc_class.__name__, (desc_class, SlotDescriptor), {"__module__": desc_class.__module__})
+        _slot_descriptor_classes[desc_class] = slot_class
+    copy = slot_class.__new__(slot_class)
+    copy.__dict__.update(desc.__dict__)
+    return copy
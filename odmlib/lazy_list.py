@@ -0,0 +1,49 @@
+class LazyList(list):
+    """
+    list of child odmlib objects that keeps the unparsed XML elements or JSON dictionaries the children are loaded
+    from until the list is first used; created by the loaders in lazy mode
+    """
+    def __init__(self, load, nodes):
+        """
+        :param load: function that creates an odmlib object from one node
+        :param nodes: list of unparsed XML Elements or JSON dictionaries
+        """
+        super().__init__()
+        self._load = load
+        self._nodes = nodes
+
+    @property
+    def is_loaded(self):
+        return self._nodes is None
+
+    def materialize(self):
+        """ creates the odmlib objects from the unparsed nodes the first time it is called """
+        if self._nodes is not None:
+            nodes, self._nodes = self._nodes, None
+            list.extend(self, [self._load(node) for node in nodes])
+            self._load = None
+        return self
+
+    def __reduce_ex__(self, protocol):
+        # copies and pickles are plain lists of odmlib objects
+        return list, (list(self),)
+
+
+def _load_before(method_name):
+    list_method = getattr(list, method_name)
+
+    def method(self, *args, **kwargs):
+        if self._nodes is not None:
+            self.materialize()
+        return list_method(self, *args, **kwargs)
+    method.__name__ = method_name
+    method.__doc__ = list_method.__doc__
+    return method
+
+
+# every list operation reads or changes the list items, so each one loads the children first
+for _method_name in ("__contains__", "__eq__", "__ne__", "__lt__", "__le__", "__gt__", "__ge__", "__getitem__",
+                     "__setitem__", "__delitem__", "__iter__", "__reversed__", "__len__", "__repr__", "__add__",
+                     "__iadd__", "__mul__", "__rmul__", "__imul__", "append", "clear", "copy", "count", "extend",
+                     "index", "insert", "pop", "remove", "reverse", "sort"):
+    setattr(LazyList, _method_name, _load_before(_method_name))
@@ -0,0 +1,162 @@
+import odmlib.descriptor as DESC
+import odmlib.typed as T
+
+
+class LoadPlan:
+    """ precompiled instructions used by the loaders to construct an odmlib object and its child elements """
+    _plans = {}
+
+    def __init__(self, model, elem_name, compact=False):
+        """
+        builds the load plan for a model class; use get_plan to retrieve the cached plan for a class
+
+        :param model: model module that contains the class definitions (e.g. odmlib.odm_1_3_2.model)
+        :param elem_name: name of the ODM element and the model class that represents it
+        :param compact: if True the plan creates objects of the slotted compact version of the model class, which keep
+            their attributes and elements in model declaration order rather than document order
+        """
+        self.model = model
+        self.elem_name = elem_name
+        self.element_class = getattr(model, elem_name)
+        if compact:
+            self.element_class = self.element_class.compact_class()
+        # (descriptor name, descriptor, is list, namespace prefixed name) in model declaration order
+        self.children = []
+        for name, desc in self.element_class._elems.items():
+            self.children.append((name, desc, isinstance(desc, T.ODMListObject), desc.namespace + ":" + name))
+        # {attribute key: (attribute name, converter)} used in trusted mode; XML keys such as {uri}lang are added as seen
+        self._attribute_table = {}
+        for name, desc in self.element_class.__dict__.items():
+            if isinstance(desc, DESC.Descriptor) and not isinstance(desc, T.ODMObject):
+                self._attribute_table[name] = (name, self._converter(desc))
+        self._tag_table = {}
+        self._table_namespaces = None
+
+    @classmethod
+    def get_plan(cls, model, elem_name, compact=False):
+        """
+        returns the load plan for elem_name in model, building it the first time the class is loaded
+
+        :param model: model module that contains the class definitions
+        :param elem_name: name of the ODM element and the model class that represents it
+        :param compact: if True the plan creates objects of the slotted compact version of the model class, which keep
+            their attributes and elements in model declaration order rather than document order
+        :return: LoadPlan object
+        """
+        key = (model.__name__, elem_name, compact)
+        plan = cls._plans.get(key)
+        if plan is None:
+            plan = cls(model, elem_name, compact)
+            cls._plans[key] = plan
+        return plan
+
+    def create(self, attrib, trusted=False):
+        """
+        instantiates the model class from a dictionary of attributes
+
+        :param attrib: dictionary of attribute names and values, including _content for element text
+        :param trusted: if True the attributes are stored without running the descriptor validation
+        :return: odmlib object
+        """
+        if trusted:
+            return self.create_trusted(attrib)
+        return self.element_class(**attrib)
+
+    def create_trusted(self, attrib):
+        """
+        instantiates the model class and writes the attributes straight into the instance without validation;
+        integers and floats are still converted so the object matches one created by the constructor
+
+        :param attrib: dictionary of attribute names and values, including _content for element text
+        :return: odmlib object that has not been validated
+        """
+        odm_obj = self.element_class.__new__(self.element_class)
+        store = odm_obj.__dict__
+        for key, value in attrib.items():
+            entry = self._attribute_table.get(key)
+            if entry is None:
+                entry = self._add_attribute_key(key)
+            name, convert = entry
+            store[name] = value if convert is None or value is None else convert(value)
+        return odm_obj
+
+    @staticmethod
+    def set_child(odm_obj, desc, value, trusted=False):
+        """
+        assigns a child element or list of child elements to an odmlib object
+
+        :param odm_obj: odmlib object the child is assigned to
+        :param desc: ODMObject or ODMListObject descriptor for the child
+        :param value: odmlib object or list of odmlib objects
+        :param trusted: if True the value is stored without running the descriptor type checks
+        """
+        if trusted:
+            odm_obj.__dict__[desc.name] = value
+        else:
+            desc.__set__(odm_obj, value)
+
+    def _add_attribute_key(self, key):
+        # strip out non-default elementtree namespaces from the XML to work with just the name e.g. xml:lang
+        if "}" in key and key[key.find("}") + 1:] in self._attribute_table:
+            entry = self._attribute_table[key[key.find("}") + 1:]]
+            self._attribute_table[key] = entry
+            return entry
+        raise TypeError(f"Unknown keyword argument {key} in {self.elem_name}")
+
+    @staticmethod
+    def _converter(desc):
+        if isinstance(desc, T.Integer):
+            return _to_int
+        elif isinstance(desc, T.Float):
+            return _to_float
+        return None
+
+    def tag_table(self, nsr):
+        """
+        returns a {qualified tag: child position} table for the namespaces currently registered in nsr
+
+        :param nsr: NamespaceRegistry object used to qualify the child element tags
+        :return: dictionary that maps ElementTree tags such as {uri}ItemRef to a position in children
+        """
+        namespaces = tuple(nsr.namespaces.items())
+        if namespaces != self._table_namespaces:
+            self._tag_table = {}
+            for position, (name, desc, is_list, path) in enumerate(self.children):
+                if desc.namespace in nsr.namespaces:
+                    self._tag_table["{" + nsr.namespaces[desc.namespace] + "}" + name] = position
+            self._table_namespaces = namespaces
+        return self._tag_table
+
+    def dispatch_children(self, elem, nsr):
+        """
+        walks the children of elem once and groups them by the descriptor they are loaded into
+
+        :param elem: ElementTree Element to dispatch the children of
+        :param nsr: NamespaceRegistry object used to qualify the child element tags
+        :return: list of (child plan entry, list of child Elements) in model declaration order
+        """
+        table = self.tag_table(nsr)
+        found = {}
+        for child in elem:
+            position = table.get(child.tag)
+            if position is not None:
+                if position in found:
+                    found[position].append(child)
+                else:
+                    found[position] = [child]
+        return [(self.children[position], found[position]) for position in sorted(found)]
+
+
+def _to_int(value):
+    # values that do not convert are kept as they are and reported by validate
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
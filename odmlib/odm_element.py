@@ -2,12 +2,159 @@ import odmlib.descriptor as DESC
 import odmlib.typed as T
 import odmlib.ns_registry as NS
 import odmlib.oid_index as IDX
+import odmlib.xml_backend as XB
+import odmlib.valueset as VS
 from collections import OrderedDict
+from collections.abc import MutableMapping
+import codecs
+import io
 import json
+import os
 import xml.etree.ElementTree as ET
 
 
+def _compile_serializer(elem_names):
+    """
+    generates the to_dict serializer for a class given the names of its element descriptors; the instance __dict__
+    is walked so the output keeps the order the attributes and elements were set in, usually document order
+
+    :param elem_names: frozenset of the element names declared in the class and its bases
+    :return: function that serializes an instance of the class into a dictionary
+    """
+    def serialize(self):
+        property_dict = {}
+        for attr, obj in self.__dict__.items():
+            if obj is None:
+                continue
+            elif attr in elem_names:
+                if isinstance(obj, list):
+                    property_dict[attr] = [o._serialize() for o in obj]     # list of ELEMENTS
+                else:
+                    property_dict[attr] = obj._serialize()                  # element
+            else:
+                property_dict[attr] = obj                                   # attributes
+        return property_dict
+    return serialize
+
+
+def _compile_slot_serializer(slot_members, elem_names):
+    """
+    generates the to_dict serializer for a compact class from its slot table; the slots are read directly in model
+    declaration order, which is the order of a compact object's __dict__, without creating the CompactStorage view
+
+    :param slot_members: dictionary of the descriptor names and their slot member descriptors in declaration order
+    :param elem_names: frozenset of the element names declared in the class and its bases
+    :return: function that serializes an instance of the compact class into a dictionary
+    """
+    fields = tuple((name, member.__get__, name in elem_names) for name, member in slot_members.items())
+
+    def serialize(self):
+        property_dict = {}
+        for attr, get, is_elem in fields:
+            try:
+                obj = get(self)
+            except AttributeError:
+                continue
+            if obj is None:
+                continue
+            elif not is_elem:
+                property_dict[attr] = obj                                   # attributes
+            elif isinstance(obj, list):
+                property_dict[attr] = [o._serialize() for o in obj]         # list of ELEMENTS
+            else:
+                property_dict[attr] = obj._serialize()                      # element
+        return property_dict
+    return serialize
+
+
+class CompactStorage(MutableMapping):
+    """
+    dictionary interface to the slots of an object created from a compact class; used as the object's __dict__ so
+    the descriptors and serializers work unchanged. Items are always in model declaration order.
+    """
+    __slots__ = ("_obj", "_members")
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._members = obj._slot_members
+
+    def __getitem__(self, name):
+        try:
+            return self._members[name].__get__(self._obj)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        self._members[name].__set__(self._obj, value)
+
+    def __delitem__(self, name):
+        try:
+            self._members[name].__delete__(self._obj)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __contains__(self, name):
+        member = self._members.get(name)
+        if member is None:
+            return False
+        try:
+            member.__get__(self._obj)
+        except AttributeError:
+            return False
+        return True
+
+    def get(self, name, default=None):
+        member = self._members.get(name)
+        if member is None:
+            return default
+        try:
+            return member.__get__(self._obj)
+        except AttributeError:
+            return default
+
+    def items(self):
+        obj = self._obj
+        items = []
+        for name, member in self._members.items():
+            try:
+                items.append((name, member.__get__(obj)))
+            except AttributeError:
+                pass
+        return items
+
+    def keys(self):
+        return [name for name, value in self.items()]
+
+    def values(self):
+        return [value for name, value in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def _reduce_compact(self):
+    # compact classes are generated, so copies and pickles are rebuilt from the model class
+    return _new_compact, (self._model_class, dict(self.__dict__.items()))
+
+
+def _new_compact(cls, state):
+    compact_class = cls.compact_class()
+    obj = compact_class.__new__(compact_class)
+    storage = obj.__dict__
+    for name, value in state.items():
+        storage[name] = value
+    return obj
+
+
 class ODMMeta(type):
+    _compact_classes = {}
+
     @classmethod
     def __prepare__(cls, name, bases):
         """ preserves the order of declarations in each class """
@@ -39,6 +186,12 @@ class ODMMeta(type):
         # the default class namespace is odm
         if "namespace" not in clsdict:
             clsdict["namespace"] = "odm"
+        # specialised serializer that knows which names hold elements rather than attributes
+        elem_names = set(clsdict["_elems"])
+        for base in bases:
+            elem_names.update(getattr(base, "_elem_names", ()))
+        clsdict["_elem_names"] = frozenset(elem_names)
+        clsdict["_serialize"] = _compile_serializer(clsdict["_elem_names"])
         # elems = {key: val for key, val in clsdict.items() if isinstance(val, (T.ODMObject, T.ODMListObject))}
         # clsdict["_elems"] = elems
         # add attribute non-default namespaces
@@ -46,57 +199,375 @@ class ODMMeta(type):
         #       if val.namespace != "odm"}
         # clsdict["_attr_ns"] = ns
 
+        # tables used by the constructor: accepted keyword names, descriptors by name and required attributes
+        clsdict["_kwarg_names"] = {key: key for key in clsdict}
+        clsdict["_required"] = tuple(key for key, val in clsdict.items() if isinstance(val, DESC.Descriptor) and
+                                     not isinstance(val, T.ODMObject) and val.required)
+
         clsobj = super().__new__(cls, clsname, bases, dict(clsdict))
+        descriptors = {}
+        for base in reversed(clsobj.__mro__):
+            for key, val in base.__dict__.items():
+                if isinstance(val, DESC.Descriptor):
+                    descriptors[key] = val
+                else:
+                    descriptors.pop(key, None)
+        clsobj._descriptors = descriptors
+        # bind the valid values for enumerated attributes so they are not looked up on every assignment
+        value_sets = None
+        for key, val in clsdict.items():
+            if isinstance(val, T.ValidValues):
+                if value_sets is None:
+                    value_sets = VS.ValueSet.package_value_sets(clsdict.get("__module__", ""))
+                if clsname + "." + key in value_sets:
+                    val.bind_value_set(clsobj, value_sets[clsname + "." + key])
         return clsobj
 
+    def compact_class(cls):
+        """
+        returns a version of this model class that stores its attributes and elements in slots instead of a
+        per-instance dictionary, using far less memory per object. The compact class has the same name, descriptors
+        and methods, but it is not a subclass of the model class; the descriptors accept compact objects wherever
+        the model class is expected. Its descriptors are copies that read and write the slots directly. The
+        attributes and elements of a compact object are always kept in model declaration order, so verify_order
+        succeeds and reorder_object has no effect
+
+        :return: compact version of this class
+        """
+        if "_slot_members" in cls.__dict__:
+            return cls
+        compact = ODMMeta._compact_classes.get(cls)
+        if compact is None:
+            # the class's own declarations come first so the declaration order is kept
+            clsdict = {}
+            for base in cls.__mro__[:cls.__mro__.index(ODMElement)]:
+                for name, obj in base.__dict__.items():
+                    if name not in clsdict and name not in ("__dict__", "__weakref__"):
+                        clsdict[name] = obj
+            descriptors = [name for name, obj in clsdict.items() if isinstance(obj, DESC.Descriptor)]
+            for name in descriptors:
+                clsdict[name] = DESC.slot_descriptor(clsdict[name])
+            clsdict["__slots__"] = tuple("_slot_" + name for name in descriptors)
+            # the descriptors use the slots directly; the storage view is only created for code that reads __dict__
+            clsdict["__dict__"] = property(CompactStorage)
+            clsdict["__reduce__"] = _reduce_compact
+            compact = ODMMeta(cls.__name__, (ODMElement,), clsdict)
+            compact._model_class = cls
+            compact._slot_members = {name: compact.__dict__["_slot_" + name] for name in descriptors}
+            for name, member in compact._slot_members.items():
+                compact.__dict__[name].slot = member
+            compact._serialize = _compile_slot_serializer(compact._slot_members, compact._elem_names)
+            ODMMeta._compact_classes[cls] = compact
+        return compact
+
 
 class ODMWriter:
 
     @staticmethod
-    def write_odm(odm_file, odm_elem):
+    def write_odm(odm_file, odm_elem, xml_backend=None):
         """
         after converting ODMLIB to ElementTree, write the ElementTree to an ODM file
         :param odm_file: path and file to write the ODM XML
         :param odm_elem: Element object to write to ODM (presumably an ODM root)
+        :param xml_backend: None or "etree" for ElementTree, "lxml" to use lxml when it is installed
         """
-        tree = ET.ElementTree(odm_elem)
-        root = tree.getroot()
-        # workaround for elementtree NS bug - NamespaceRegistry assumes at least 1 default NS has been set
         nsr = NS.NamespaceRegistry()
-        nsr.set_odm_namespace_attributes(root)
-        tree.write(odm_file, xml_declaration=True, encoding='utf-8', method='xml', short_empty_elements=True)
+        XB.get_backend(xml_backend).write(odm_file, odm_elem, nsr)
+
+
+class ODMStreamWriter:
+    """ writes an odmlib hierarchy as XML directly to a file or stream without building an ElementTree """
+    def __init__(self, namespace_registry=None, buffer_size=8192):
+        """
+        :param namespace_registry: NamespaceRegistry with the namespaces declared on the root element
+        :param buffer_size: number of XML fragments collected before they are written to the output
+        """
+        self.nsr = namespace_registry if namespace_registry else NS.NamespaceRegistry()
+        self.buffer_size = buffer_size
+        self._out = None
+        self._buffer = []
+        self._target = None
+        self._subject_data = None
+
+    def write_odm(self, odm_file, odm_elem, subject_data=None):
+        """
+        stream the odmlib hierarchy as XML to a file or stream
+
+        :param odm_file: path and file to write the ODM XML, or a text or binary file object
+        :param odm_elem: odmlib object to write (presumably an ODM root)
+        :param subject_data: optional iterable, such as a generator, of SubjectData objects written into the
+            ClinicalData element of odm_elem after any SubjectData it already contains
+        """
+        target = self._find_clinical_data(odm_elem) if subject_data is not None else None
+        if isinstance(odm_file, (str, os.PathLike)):
+            with open(odm_file, "w", encoding="utf-8") as out:
+                self._write_document(out, odm_elem, target, subject_data)
+        elif isinstance(odm_file, (io.RawIOBase, io.BufferedIOBase)):
+            self._write_document(codecs.getwriter("utf-8")(odm_file), odm_elem, target, subject_data)
+        else:
+            self._write_document(odm_file, odm_elem, target, subject_data)
+
+    def _write_document(self, out, odm_elem, target, subject_data):
+        self._out = out
+        self._target = target
+        self._subject_data = subject_data
+        self._buffer = ["<?xml version='1.0' encoding='utf-8'?>\n"]
+        self._write_element(odm_elem, True)
+        self._flush()
+        self._out = None
+        self._target = None
+        self._subject_data = None
+
+    def _write_element(self, obj, is_root=False):
+        cls = obj.__class__
+        tag = cls.__name__ if obj.namespace == "odm" else obj.namespace + ":" + cls.__name__
+        attr_ns = cls.__dict__["_attr_ns"]
+        buffer = self._buffer
+        buffer.append("<" + tag)
+        children = []
+        for attr, val in obj.__dict__.items():
+            if isinstance(val, (ODMElement, list)):
+                children.append((attr, val))
+            elif attr != "_content" and val is not None:
+                name = attr_ns[attr] + ":" + attr if attr in attr_ns else attr
+                buffer.append(" " + name + "=\"" + _escape_attrib(str(val)) + "\"")
+        if is_root:
+            buffer.append(self._namespace_declarations())
+        content = obj.__dict__.get("_content")
+        is_target = obj is self._target
+        if not content and not is_target and not any(isinstance(val, ODMElement) or val for attr, val in children):
+            buffer.append(" />")
+            return
+        buffer.append(">")
+        if content:
+            buffer.append(_escape_cdata(str(content)))
+        if is_target:
+            # streamed SubjectData follow any existing SubjectData and precede the elements declared after them
+            positions = {name: position for position, name in enumerate(cls._elems)}
+            subject_data = self._subject_data
+            for attr, val in children:
+                if subject_data is not None and positions.get(attr, -1) > positions["SubjectData"]:
+                    self._write_subject_data(subject_data)
+                    subject_data = None
+                self._write_child(val)
+                if attr == "SubjectData" and subject_data is not None:
+                    self._write_subject_data(subject_data)
+                    subject_data = None
+            if subject_data is not None:
+                self._write_subject_data(subject_data)
+        else:
+            for attr, val in children:
+                self._write_child(val)
+        buffer.append("</" + tag + ">")
+        if len(buffer) >= self.buffer_size:
+            self._flush()
+
+    def _write_child(self, val):
+        if isinstance(val, list):
+            for o in val:
+                self._write_element(o)
+        else:
+            self._write_element(val)
+
+    def _write_subject_data(self, subject_data):
+        for subject in subject_data:
+            self._write_element(subject)
+
+    def _namespace_declarations(self):
+        """ namespace declarations for the root element, matching NamespaceRegistry.set_odm_namespace_attributes """
+        default_prefix = list(self.nsr.default_namespace.keys())[0]
+        declarations = " xmlns=\"" + _escape_attrib(self.nsr.default_namespace[default_prefix]) + "\""
+        for prefix, uri in self.nsr.namespaces.items():
+            if prefix != default_prefix:
+                declarations += " xmlns:" + prefix + "=\"" + _escape_attrib(uri) + "\""
+        return declarations
+
+    @staticmethod
+    def _find_clinical_data(odm_elem):
+        if odm_elem.__class__.__name__ == "ClinicalData":
+            return odm_elem
+        clinical_data = odm_elem.__dict__.get("ClinicalData")
+        if isinstance(clinical_data, list):
+            clinical_data = clinical_data[-1] if clinical_data else None
+        if clinical_data is None:
+            raise ValueError(f"{odm_elem.__class__.__name__} has no ClinicalData element to write SubjectData into")
+        return clinical_data
+
+    def _flush(self):
+        self._out.write("".join(self._buffer))
+        self._buffer.clear()
+
+
+class ODMJSONStreamWriter:
+    """ writes an odmlib hierarchy as JSON in chunks without building the intermediate dictionary """
+    def __init__(self, buffer_size=8192):
+        """
+        :param buffer_size: number of JSON fragments collected before they are written to the output
+        """
+        self.buffer_size = buffer_size
+        self._out = None
+        self._buffer = []
+
+    def write_json(self, odm_file, odm_elem):
+        """
+        stream the odmlib hierarchy as JSON to a file; the output is the same as json.dump(odm_elem.to_dict())
+
+        :param odm_file: path and file to write the JSON, or a text file object
+        :param odm_elem: odmlib object to write
+        """
+        if isinstance(odm_file, (str, os.PathLike)):
+            with open(odm_file, "w") as out:
+                self._write_document(out, odm_elem)
+        else:
+            self._write_document(odm_file, odm_elem)
+
+    def to_json(self, odm_elem):
+        """
+        :param odm_elem: odmlib object to serialize
+        :return: JSON string, the same as json.dumps(odm_elem.to_dict())
+        """
+        out = io.StringIO()
+        self._write_document(out, odm_elem)
+        return out.getvalue()
+
+    def _write_document(self, out, odm_elem):
+        self._out = out
+        self._buffer = []
+        self._write_object(odm_elem)
+        self._flush()
+        self._out = None
+
+    def _write_object(self, obj):
+        buffer = self._buffer
+        elem_names = obj._elem_names
+        separator = "{"
+        for attr, val in obj.__dict__.items():
+            if val is None:
+                continue
+            buffer.append(separator + _encode_json_string(attr) + ": ")
+            separator = ", "
+            if attr in elem_names:
+                if isinstance(val, list):
+                    buffer.append("[")
+                    for position, o in enumerate(val):
+                        if position:
+                            buffer.append(", ")
+                        self._write_object(o)
+                    buffer.append("]")
+                else:
+                    self._write_object(val)
+            elif isinstance(val, str):
+                buffer.append(_encode_json_string(val))
+            else:
+                buffer.append(json.dumps(val))
+        buffer.append("{}" if separator == "{" else "}")
+        if len(buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        self._out.write("".join(self._buffer))
+        self._buffer.clear()
+
+
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+
+def _escape_cdata(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attrib(text):
+    text = _escape_cdata(text)
+    if "\"" in text:
+        text = text.replace("\"", "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
 
 
 class ODMElement(metaclass=ODMMeta):
+    # subclasses have a __dict__ unless they are generated by compact_class
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         """
         abstract ODM element class used to set the properties of any ODM object
         """
+        kwarg_names = self._kwarg_names
+        descriptors = self._descriptors
         for name, val in kwargs.items():
-            if name not in self.__class__.__dict__.keys():
-                # strip out non-default elementtree namespaces from the XML to work with just the name e.g. xml:lang
-                if "}" in name:
-                    name = name[name.find('}') + 1:]
-                else:
-                    raise TypeError(f"Unknown keyword argument {name} in {self.__class__.__name__}")
-            setattr(self, name, val)
-        for attr, obj in self.__class__.__dict__.items():
-            if isinstance(obj, DESC.Descriptor) and (not isinstance(obj, T.ODMObject)) and (attr not in self.__dict__) and obj.required:
-                raise ValueError(f"Missing required keyword argument {attr} in {self.__class__.__name__}")
+            attr = kwarg_names.get(name)
+            if attr is None:
+                attr = self._kwarg_name(name)
+            desc = descriptors.get(attr)
+            if desc is not None:
+                desc.__set__(self, val)
+            else:
+                setattr(self, attr, val)
+        if self._required:
+            store = self.__dict__
+            for attr in self._required:
+                if attr not in store:
+                    raise ValueError(f"Missing required keyword argument {attr} in {self.__class__.__name__}")
+
+    @classmethod
+    def _kwarg_name(cls, name):
+        """ returns the attribute name for a keyword argument that is not a class attribute """
+        # strip out non-default elementtree namespaces from the XML to work with just the name e.g. xml:lang
+        if "}" not in name:
+            raise TypeError(f"Unknown keyword argument {name} in {cls.__name__}")
+        attr = name[name.find('}') + 1:]
+        if attr in cls._descriptors:
+            cls._kwarg_names[name] = attr
+        return attr
 
     def __setattr__(self, key, value):
         """ ensure the object being added is a type that belongs to the class """
-        if not hasattr(self, key):
+        if key not in self._descriptors and not hasattr(self, key):
             raise TypeError(f"Assignment error: {self.__class__.__name__} does not have a defined attribute {key}")
         super().__setattr__(key, value)
 
+    def validate(self):
+        """
+        runs the descriptor validation on every attribute and element in the odmlib hierarchy; use it on objects
+        created by a loader in trusted mode, which skips validation. Raises the same ValueError or TypeError that
+        the constructor raises for an invalid or missing value
+        """
+        cls_dict = self.__class__.__dict__
+        for name, value in list(self.__dict__.items()):
+            obj = cls_dict.get(name)
+            if not isinstance(obj, DESC.Descriptor):
+                raise TypeError(f"Assignment error: {self.__class__.__name__} does not have a defined attribute {name}")
+            if value is not None:
+                obj.__set__(self, value)
+        for attr, obj in cls_dict.items():
+            if isinstance(obj, DESC.Descriptor) and (not isinstance(obj, T.ODMObject)) and (attr not in self.__dict__) and obj.required:
+                raise ValueError(f"Missing required keyword argument {attr} in {self.__class__.__name__}")
+        for name in self._elems:
+            value = self.__dict__.get(name)
+            if isinstance(value, list):
+                for odm_obj in value:
+                    odm_obj.validate()
+            elif value is not None:
+                value.validate()
+
     def to_json(self):
         """
-        transforms odmlib hierarchy into a dict and converts that to JSON and returns it
+        transforms odmlib hierarchy into JSON and returns it
 
         :return: JSON representation of odmlib hierarchy
         """
-        return json.dumps(self.to_dict())
+        return ODMJSONStreamWriter().to_json(self)
 
     def to_xml(self, parent_elem=None, top_elem=None):
         """
@@ -146,16 +617,7 @@ class ODMElement(metaclass=ODMMeta):
         :return: dictionary serialization of odmlib hierarchy
         """
         # Note: namespaces used in the XML serialization are not part of the dictionary or json serializations
-        property_dict = {}
-        odm_content = {attr: obj for attr, obj in self.__dict__.items() if attr not in ["_fields", "_attr_ns", "_elems", "_attrs"]}
-        for attr, obj in odm_content.items():
-            if isinstance(obj, ODMElement):
-                property_dict[attr] = obj.to_dict()                    # element
-            elif isinstance(obj, list):
-                property_dict[attr] = [o.to_dict() for o in obj]       # list of ELEMENTS
-            elif obj is not None:
-                property_dict[attr] = obj                              # attributes
-        return property_dict
+        return self._serialize()
 
     def __repr__(self):
         args = ", ".join(name for name in self._fields)
@@ -179,8 +641,8 @@ class ODMElement(metaclass=ODMMeta):
         :param val: attribute value to search for
         :return: an odmlib object of the ODM element with the first time the attribute value matches val
         """
-        obj_list = eval("self." + obj_name)
-        if type(obj_list) == list:
+        obj_list = getattr(self, obj_name)
+        if isinstance(obj_list, list):
             for o in obj_list:
                 if o.__dict__[attr] == val:
                     return o
@@ -191,31 +653,67 @@ class ODMElement(metaclass=ODMMeta):
             else:
                 return None
 
-    def write_xml(self, odm_file, odm_writer=ODMWriter):
+    def write_xml(self, odm_file, odm_writer=ODMWriter, xml_backend=None):
         """
         write the odmlib hierarchy as an XML file
 
         :param odm_file: string ODM filename and path
         :param odm_writer: object used to write the elementree XML to a file
+        :param xml_backend: None or "etree" for ElementTree, "lxml" to use lxml when it is installed
         """
         odm_elem = self.to_xml()
         odm_writer = odm_writer()
-        odm_writer.write_odm(odm_file, odm_elem)
+        if xml_backend is None:
+            odm_writer.write_odm(odm_file, odm_elem)
+        else:
+            odm_writer.write_odm(odm_file, odm_elem, xml_backend=xml_backend)
 
-    def write_json(self, odm_file):
+    def stream_xml(self, odm_file, subject_data=None, odm_writer=ODMStreamWriter):
         """
-        write the odmlib hierarchy as a JSON file
+        write the odmlib hierarchy as an XML file directly, without first converting it to an ElementTree
 
-        :param odm_file: string ODM filename and path
+        :param odm_file: string ODM filename and path, or a file object
+        :param subject_data: optional iterable of SubjectData objects to write into the ClinicalData element
+        :param odm_writer: object used to stream the odmlib hierarchy to a file
+        """
+        odm_writer = odm_writer()
+        odm_writer.write_odm(odm_file, self, subject_data)
+
+    def write_json(self, odm_file, odm_writer=ODMJSONStreamWriter):
         """
-        with open(odm_file, 'w') as outfile:
-            json.dump(self.to_dict(), outfile)
+        write the odmlib hierarchy as a JSON file, streaming it without first converting it to a dictionary
+
+        :param odm_file: string ODM filename and path, or a text file object
+        :param odm_writer: object used to stream the odmlib hierarchy as JSON
+        """
+        odm_writer = odm_writer()
+        odm_writer.write_json(odm_file, self)
 
     def build_oid_index(self):
         idx = IDX.OIDIndex()
         self._init_oid_index(idx)
         return idx
 
+    def build_live_oid_index(self):
+        """
+        builds an OID index that is kept up to date as OIDs are set and elements are added to or removed from the
+        hierarchy below this object; close the index, or use it in a with statement, when it is no longer needed.
+        The lists of child elements in the hierarchy are replaced by TrackedList objects with the same elements
+
+        :return: LiveOIDIndex object
+        """
+        return IDX.LiveOIDIndex(self)
+
+    def build_attribute_index(self, keys):
+        """
+        builds an index of the odmlib objects below this object by attribute values in one walk of the hierarchy
+
+        :param keys: list of (element name, attribute name or tuple of attribute names) pairs, e.g.
+            [("ItemDef", "Name"), ("CodeListItem", "CodedValue"), ("ItemGroupDef", ("Domain", "Name"))]
+        :return: AttributeIndex object
+        """
+        return IDX.AttributeIndex(keys).build(self)
+
     def _init_oid_index(self, idx):
         """
         for odmlib object, loads all OIDs into a dict that functions as an OID index
@@ -236,11 +734,13 @@ class ODMElement(metaclass=ODMMeta):
 
     def verify_oids(self, oid_checker):
         """
-        checks all the OIDs for uniqueness and Def/Ref integrity; oid_checker throws a ValueError on failure
+        checks all the OIDs for uniqueness and Def/Ref integrity; oid_checker throws a ValueError on failure unless it
+        collects the errors, in which case the element paths are recorded for its report
 
         :param oid_checker: object that performs that checks OID uniqueness and Def/Ref checks
         """
-        self._init_oid_check(oid_checker)
+        path = type(self).__name__ if getattr(oid_checker, "collect_errors", False) else None
+        self._init_oid_check(oid_checker, path)
         return oid_checker.check_oid_refs()
 
     def unreferenced_oids(self, oid_checker):
@@ -248,19 +748,26 @@ class ODMElement(metaclass=ODMMeta):
             self.verify_oids(oid_checker)
         return oid_checker.check_unreferenced_oids()
 
-    def _init_oid_check(self, oid_checker):
+    def _init_oid_check(self, oid_checker, path=None):
         """
         for odmlib object, loads all OIDs and checks them for uniqueness; throws an error if uniqueness check fails
 
         :param oid_checker: object used to check OIDs for uniqueness and Def/Ref check
+        :param path: element path of this object, e.g. ODM/Study[0]/MetaDataVersion[0], passed to the oid_checker
+            when it collects errors; None otherwise
         """
         odm_content = {attr: obj for attr, obj in self.__dict__.items() if attr not in ["_fields", "_attr_ns", "_elems", "_attrs"]}
         for attr, obj in odm_content.items():
             if isinstance(obj, ODMElement):
-                obj._init_oid_check(oid_checker)                    # element
+                obj._init_oid_check(oid_checker, None if path is None else path + "/" + attr)      # element
             elif isinstance(obj, list):
-                for o in obj:
-                    o._init_oid_check(oid_checker)                  # list of ELEMENTS
+                for i, o in enumerate(obj):
+                    o._init_oid_check(oid_checker, None if path is None else f"{path}/{attr}[{i}]")  # list of ELEMENTS
+            elif path is not None:
+                if attr == "OID":
+                    oid_checker.add_oid(obj, self.__class__.__name__, path)
+                elif "OID" in attr:
+                    oid_checker.add_oid_ref(obj, attr, path)
             else:
                 # assumes consistency in OID naming. Exceptions: FileOID and PriorFileOID in ODM
                 if attr == "OID":
@@ -273,8 +780,11 @@ class ODMElement(metaclass=ODMMeta):
         """
         uses validator object to check object for conformance with the model
 
-        :param validator: object that validates the odmlib object against the model
+        :param validator: object that validates the odmlib object against the model; a validator with native set,
+            such as NativeConformanceChecker, checks the odmlib object without first converting it to a dictionary
         """
+        if getattr(validator, "native", False):
+            return validator.check_conformance(self, type(self).__name__)
         doc_dict = self.to_dict()
         result = validator.check_conformance(doc_dict, type(self).__name__)
         return result
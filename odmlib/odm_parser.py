@@ -1,6 +1,6 @@
-import xml.etree.ElementTree as ET
 import xmlschema as XSD
 import odmlib.ns_registry as NS
+import odmlib.xml_backend as XB
 from abc import ABC, abstractmethod
 import json
 
@@ -41,15 +41,16 @@ class ODMSchemaValidator(SchemaValidator):
 
 
 class BaseParser:
-    def __init__(self, ns_registry):
+    def __init__(self, ns_registry, xml_backend=None):
         if ns_registry:
             self.nsr = ns_registry
         else:
             self.nsr = NS.NamespaceRegistry(prefix="odm", uri="http://www.cdisc.org/ns/odm/v1.3", is_default=True)
+        self.backend = XB.get_backend(xml_backend)
 
     def register_namespaces(self):
         for prefix, url in self.nsr.namespaces.items():
-            ET.register_namespace(prefix, url)
+            self.backend.register_namespace(prefix, url)
 
     def __getattr__(self, item):
         """ enables the parser to dynamically parse any element given it's parent """
@@ -94,35 +95,82 @@ class ElementParser:
 
 
 class ODMParser(BaseParser, ElementParser):
-    def __init__(self, odm_file, namespace_registry=None):
+    def __init__(self, odm_file, namespace_registry=None, xml_backend=None):
         self.odm_file = odm_file
-        super().__init__(ns_registry=namespace_registry)
+        super().__init__(ns_registry=namespace_registry, xml_backend=xml_backend)
 
     def parse(self):
         self.register_namespaces()
-        odm_tree = ET.parse(self.odm_file)
+        odm_tree = self.backend.parse(self.odm_file)
         self.root = odm_tree.getroot()
         return self.root
 
     def parse_tree(self):
         self.register_namespaces()
-        return ET.parse(self.odm_file)
+        return self.backend.parse(self.odm_file)
 
 
 class ODMStringParser(BaseParser, ElementParser):
-    def __init__(self, odm_string, namespace_registry=None):
+    def __init__(self, odm_string, namespace_registry=None, xml_backend=None):
         self.odm_string = odm_string
-        super().__init__(ns_registry=namespace_registry)
+        super().__init__(ns_registry=namespace_registry, xml_backend=xml_backend)
 
     def parse(self):
         self.register_namespaces()
-        self.root = ET.fromstring(self.odm_string)
+        self.root = self.backend.fromstring(self.odm_string)
         return self.root
 
     def parse_tree(self):
         self.register_namespaces()
-        #return ET.ElementTree(ET.fromstring(self.odm_string))
-        return ET.fromstring(self.odm_string)
+        return self.backend.fromstring(self.odm_string)
+
+
+class ODMIterParser(BaseParser):
+    def __init__(self, odm_file, namespace_registry=None, xml_backend=None):
+        self.odm_file = odm_file
+        self.root = None
+        super().__init__(ns_registry=namespace_registry, xml_backend=xml_backend)
+
+    def iter_elements(self, elem_name, ns_prefix="odm", with_context=False):
+        """
+        streams the ODM file using iterparse and yields each elem_name element once it has been completely parsed;
+        every finished element outside the elem_name elements, such as the SubjectData, StudyEventData and FormData
+        around an ItemGroupData, is cleared and detached from its parent so the root only holds the open elements and
+        memory is bounded by one elem_name element
+
+        :param elem_name: name of the ODM element to yield, e.g. SubjectData
+        :param ns_prefix: prefix of the namespace registered for elem_name
+        :param with_context: if True (context, element) pairs are yielded, where context maps the local name of each
+            enclosing element, e.g. SubjectData, to a dictionary of its attributes
+        :return: generator of ElementTree Element objects
+        """
+        self.register_namespaces()
+        if ns_prefix not in self.nsr.namespaces:
+            raise ValueError(f"Error: Namespace with prefix {ns_prefix} has not been registered")
+        tag = "{" + self.nsr.namespaces[ns_prefix] + "}" + elem_name
+        ancestors = []
+        # number of open elements that are an elem_name element or inside one
+        target_depth = 0
+        for event, elem in self.backend.iterparse(self.odm_file, events=("start", "end")):
+            if event == "start":
+                if self.root is None:
+                    self.root = elem
+                if target_depth or elem.tag == tag:
+                    target_depth += 1
+                ancestors.append(elem)
+                continue
+            ancestors.pop()
+            if target_depth:
+                target_depth -= 1
+                if target_depth:
+                    continue
+                if with_context:
+                    yield {a.tag.rsplit("}", 1)[-1]: dict(a.attrib) for a in ancestors}, elem
+                else:
+                    yield elem
+            if ancestors:
+                elem.clear()
+                ancestors[-1].remove(elem)
 
 
 class ODMJSONStringParser:
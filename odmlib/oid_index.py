@@ -1,3 +1,6 @@
+import odmlib.descriptor as DESC
+import weakref
+
 
 class OIDIndex:
     def __init__(self):
@@ -15,3 +18,299 @@ class OIDIndex:
         elif oid not in self.oid_index:
             raise ValueError(f"OID {oid} not found in the OID index.")
         return self.oid_index[oid]
+
+    def remove_oid(self, oid, element):
+        """ removes element from the entries for oid """
+        elements = self.oid_index.get(oid)
+        if elements:
+            for position, indexed in enumerate(elements):
+                if indexed is element:
+                    del elements[position]
+                    break
+            if not elements:
+                del self.oid_index[oid]
+
+
+class LiveOIDIndex(OIDIndex):
+    """
+    OID index for an odmlib hierarchy that is updated as attributes are set and elements are added to or removed
+    from the hierarchy; elements added after the index is built are found after the elements already in the index.
+    Only the objects in the hierarchy are observed, and the index is held by weak reference, so it stops updating
+    when it is closed, used as a context manager or no longer referenced. To see elements added with list methods
+    such as append, the index replaces each list of child elements in the hierarchy with a TrackedList; the
+    replacement lists stay in place after the index is closed.
+    """
+    def __init__(self, root):
+        """
+        :param root: odmlib object at the top of the hierarchy to index, e.g. ODM or MetaDataVersion
+        """
+        super().__init__()
+        self.root = root
+        # every odmlib object in the hierarchy, keyed by id
+        self.elements = {}
+        self._ref = weakref.ref(self)
+        self._add_element(root)
+        # the observers are removed when the index is closed or garbage collected
+        self._finalizer = weakref.finalize(self, _remove_observers, self._ref, self.elements)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ stops updating the index when the hierarchy changes """
+        self._finalizer()
+
+    def value_changed(self, instance, name, value):
+        """
+        updates the index before an attribute or element of an odmlib object in the hierarchy changes
+
+        :param instance: odmlib object that is changing
+        :param name: name of the attribute or element that is changing
+        :param value: new value, or None when the value is deleted
+        :return: value to store; lists of elements are replaced by a TrackedList
+        """
+        if id(instance) not in self.elements:
+            return value
+        old_value = instance.__dict__.get(name)
+        if name in type(instance)._elem_names:
+            self._remove_children(old_value)
+            if isinstance(value, list) and not isinstance(value, TrackedList):
+                value = TrackedList(instance, value)
+            self._add_children(value)
+        elif "OID" in name:
+            if old_value is not None:
+                self.remove_oid(old_value, instance)
+            if value is not None:
+                self.add_oid(value, instance)
+        return value
+
+    def list_changed(self, owner, added, removed):
+        """
+        updates the index after elements are added to or removed from a TrackedList
+
+        :param owner: odmlib object that has the list of elements
+        :param added: list of elements added to the list
+        :param removed: list of elements removed from the list
+        """
+        if id(owner) in self.elements:
+            self._remove_children(removed)
+            self._add_children(added)
+
+    def _add_children(self, value):
+        if isinstance(value, list):
+            for element in value:
+                self._add_children(element)
+        elif DESC.is_element(value):
+            self._add_element(value)
+
+    def _remove_children(self, value):
+        if isinstance(value, list):
+            for element in value:
+                self._remove_children(element)
+        elif DESC.is_element(value):
+            self._remove_element(value)
+
+    def _add_element(self, element):
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            if id(element) in self.elements:
+                continue
+            self.elements[id(element)] = element
+            DESC.add_observer(element, self._ref)
+            store = element.__dict__
+            children = []
+            for name, value in store.items():
+                if isinstance(value, list):
+                    if not isinstance(value, TrackedList):
+                        value = TrackedList(element, value)
+                        store[name] = value
+                    children.extend(child for child in value if DESC.is_element(child))
+                elif DESC.is_element(value):
+                    children.append(value)
+                elif "OID" in name and value is not None:
+                    self.add_oid(value, element)
+            # children are indexed in document order
+            stack.extend(reversed(children))
+
+    def _remove_element(self, element):
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            if self.elements.pop(id(element), None) is None:
+                continue
+            DESC.remove_observer(id(element), self._ref)
+            for name, value in element.__dict__.items():
+                if isinstance(value, list):
+                    stack.extend(child for child in value if DESC.is_element(child))
+                elif DESC.is_element(value):
+                    stack.append(value)
+                elif "OID" in name and value is not None:
+                    self.remove_oid(value, element)
+
+
+def _remove_observers(observer_ref, elements):
+    for element_id in elements:
+        DESC.remove_observer(element_id, observer_ref)
+
+
+class TrackedList(list):
+    """
+    list of child elements that reports the elements added and removed to the live OID indexes of its owner; a live
+    OID index replaces the plain lists in a hierarchy with TrackedLists holding the same elements. sort and reverse
+    only change the order of the elements, which the live index does not follow: it lists the elements for an OID in
+    the order they were added to the index, not in document order
+    """
+    def __init__(self, owner, elements=()):
+        """
+        :param owner: odmlib object that has the list of elements
+        :param elements: initial elements in the list
+        """
+        super().__init__(elements)
+        self.owner = owner
+
+    def _changed(self, added, removed):
+        for observer_ref in tuple(DESC.observers.get(id(self.owner), ())):
+            observer = observer_ref()
+            if observer is not None and hasattr(observer, "list_changed"):
+                observer.list_changed(self.owner, added, removed)
+
+    def append(self, element):
+        super().append(element)
+        self._changed([element], [])
+
+    def extend(self, elements):
+        elements = list(elements)
+        super().extend(elements)
+        self._changed(elements, [])
+
+    def __iadd__(self, elements):
+        self.extend(elements)
+        return self
+
+    def __imul__(self, count):
+        before = list(self)
+        super().__imul__(count)
+        if self:
+            self._changed(before * (count - 1), [])
+        else:
+            self._changed([], before)
+        return self
+
+    def insert(self, position, element):
+        super().insert(position, element)
+        self._changed([element], [])
+
+    def remove(self, element):
+        super().remove(element)
+        self._changed([], [element])
+
+    def pop(self, position=-1):
+        element = super().pop(position)
+        self._changed([], [element])
+        return element
+
+    def clear(self):
+        removed = list(self)
+        super().clear()
+        self._changed([], removed)
+
+    def __setitem__(self, position, value):
+        removed = self[position]
+        if isinstance(position, slice):
+            value = list(value)
+            super().__setitem__(position, value)
+            self._changed(value, removed)
+        else:
+            super().__setitem__(position, value)
+            self._changed([value], [removed])
+
+    def __delitem__(self, position):
+        removed = self[position]
+        super().__delitem__(position)
+        self._changed([], removed if isinstance(position, slice) else [removed])
+
+    def __reduce_ex__(self, protocol):
+        # copies and pickles are plain lists that are not tracked
+        return list, (list(self),)
+
+
+class AttributeIndex:
+    """
+    index of odmlib objects by the values of one or more of their attributes, such as ItemDef Name or
+    SubjectData SubjectKey; a tuple of attribute names creates a composite key
+    """
+    def __init__(self, keys):
+        """
+        :param keys: list of (element name, attribute name or tuple of attribute names) pairs to index
+        """
+        # {element name: {attribute names tuple: {values tuple: [odmlib objects]}}}
+        self.indexes = {}
+        for elem_name, attrs in keys:
+            self.indexes.setdefault(elem_name, {})[self._as_tuple(attrs)] = {}
+
+    def build(self, root):
+        """
+        loads the requested keys for all odmlib objects in the hierarchy below root in one walk of the hierarchy
+
+        :param root: odmlib object at the top of the hierarchy to index
+        :return: self
+        """
+        stack = [root]
+        while stack:
+            element = stack.pop()
+            store = element.__dict__
+            attr_tables = self.indexes.get(type(element).__name__)
+            if attr_tables:
+                for attrs, table in attr_tables.items():
+                    values = tuple(store.get(attr) for attr in attrs)
+                    if None not in values:
+                        if values in table:
+                            table[values].append(element)
+                        else:
+                            table[values] = [element]
+            children = []
+            for value in store.values():
+                if isinstance(value, list):
+                    children.extend(child for child in value if DESC.is_element(child))
+                elif DESC.is_element(value):
+                    children.append(value)
+            # children are indexed in document order
+            stack.extend(reversed(children))
+        return self
+
+    def find_all(self, elem_name, attr, val):
+        """
+        returns the odmlib objects of type elem_name where the attribute attr value equals val
+
+        :param elem_name: text name of the ODM Element (case sensitive)
+        :param attr: attribute name, or tuple of attribute names for a composite key
+        :param val: attribute value, or tuple of attribute values for a composite key
+        :return: list of odmlib objects in document order; empty if none match
+        """
+        return self._table(elem_name, attr).get(self._as_tuple(val), [])
+
+    def find(self, elem_name, attr, val):
+        """
+        returns the first odmlib object of type elem_name where the attribute attr value equals val
+
+        :param elem_name: text name of the ODM Element (case sensitive)
+        :param attr: attribute name, or tuple of attribute names for a composite key
+        :param val: attribute value, or tuple of attribute values for a composite key
+        :return: odmlib object or None if none match
+        """
+        found = self.find_all(elem_name, attr, val)
+        return found[0] if found else None
+
+    def _table(self, elem_name, attr):
+        table = self.indexes.get(elem_name, {}).get(self._as_tuple(attr))
+        if table is None:
+            raise ValueError(f"{elem_name} {attr} is not in the attribute index. Add it to the keys when building the index.")
+        return table
+
+    @staticmethod
+    def _as_tuple(value):
+        return value if isinstance(value, tuple) else (value,)
@@ -0,0 +1,154 @@
+
+class BaseOIDRef:
+    """
+    checks OID uniqueness and the references between the Def and Ref elements of a model; the rules of each model
+    provide an OIDRef subclass that fills in the reference tables for its standard
+    """
+    # OID reference attributes and elements that are always ignored
+    default_skip_attrs = ["FileOID", "PriorFileOID"]
+    default_skip_elems = ["ODM"]
+    # if True references in attributes that are not in the reference tables are ignored
+    ignore_unknown_refs = False
+
+    def __init__(self, skip_attrs=[], skip_elems=[], collect_errors=False):
+        """
+        :param skip_attrs: additional OID reference attributes to ignore
+        :param skip_elems: additional elements to ignore when loading OIDs
+        :param collect_errors: if True duplicate OIDs and bad references are collected for oid_report instead of
+            raising a ValueError on the first one
+        """
+        self.collect_errors = collect_errors
+        self.oid = {}
+        # {element type: set of OIDs} kept as OIDs are added so the checks can use set operations
+        self.elem_oids = {}
+        self.oid_ref = {}
+        self._init_oid_ref()
+        self.ref_def = {}
+        self._init_ref_def()
+        self.def_ref = {}
+        self._init_def_ref()
+        self.skip_attr = self.default_skip_attrs + skip_attrs
+        self.skip_elem = self.default_skip_elems + skip_elems
+        self.is_verified = False
+        # collect_errors mode: duplicate OIDs, {OID: element path} and {(attr, OID): [element paths]}
+        self.duplicates = []
+        self.oid_paths = {}
+        self.ref_paths = {}
+
+    def add_oid(self, oid, element, path=None):
+        """ odmlib expects all OIDs to be unique within the scope of an ODM document """
+        if oid in self.oid:
+            if self.collect_errors:
+                self.duplicates.append({"oid": oid, "element": element, "path": path, "first_element": self.oid[oid],
+                                        "first_path": self.oid_paths.get(oid)})
+                return
+            raise ValueError(f"OID {oid} is not unique - element {element}")
+        if element not in self.skip_elem:
+            self.oid[oid] = element
+            if path is not None:
+                self.oid_paths[oid] = path
+            if element in self.elem_oids:
+                self.elem_oids[element].add(oid)
+            else:
+                self.elem_oids[element] = {oid}
+
+    def add_oid_ref(self, oid, attr, path=None):
+        if attr not in self.skip_attr and (attr in self.oid_ref or not self.ignore_unknown_refs):
+            self.oid_ref[attr].add(oid)
+            if path is not None:
+                if (attr, oid) in self.ref_paths:
+                    self.ref_paths[(attr, oid)].append(path)
+                else:
+                    self.ref_paths[(attr, oid)] = [path]
+
+    def is_oids_verified(self):
+        if self.oid and self.is_verified:
+            return True
+        else:
+            return False
+
+    def check_oid_refs(self):
+        """ raises a ValueError for the first OID reference that is not found or refers to the wrong element type """
+        self.is_verified = True
+        dangling, type_mismatch = self._find_ref_violations()
+        if self.collect_errors:
+            return not (self.duplicates or dangling or type_mismatch)
+        # the attributes are checked in order, each for a reference that is not found and then for a type mismatch
+        for attr in self.oid_ref:
+            if attr in dangling:
+                raise ValueError(f"OID {sorted(dangling[attr])[0]} referenced in the attribute {attr} is not found.")
+            if attr in type_mismatch:
+                elem = next(iter(type_mismatch[attr].values()))
+                raise ValueError(f"OID reference for attribute {attr} element types do not match: "
+                                 f"{self.ref_def.get(attr)} and {elem}")
+        return True
+
+    def find_oid_ref_violations(self):
+        """
+        computes all the OID reference violations at once using set operations
+
+        :return: dictionary with the dangling references {attr: set of OIDs not found}, the type mismatches
+            {attr: {OID: element type}} and the orphans {OID: reference attr} of the defined but unused OIDs
+        """
+        self.is_verified = True
+        dangling, type_mismatch = self._find_ref_violations()
+        return {"dangling": dangling, "type_mismatch": type_mismatch, "orphans": self._find_orphans()}
+
+    def oid_report(self):
+        """
+        lists all the duplicate OIDs, dangling references, type mismatches and orphans in a dictionary that can be
+        written as JSON; element paths are included when the checker was created with collect_errors set
+
+        :return: dictionary with a list of errors for each type of check
+        """
+        self.is_verified = True
+        dangling, type_mismatch = self._find_ref_violations()
+        return {
+            "duplicates": list(self.duplicates),
+            "dangling": [{"oid": oid, "attribute": attr, "paths": self.ref_paths.get((attr, oid), [])}
+                         for attr, oids in dangling.items() for oid in sorted(oids)],
+            "type_mismatch": [{"oid": oid, "attribute": attr, "expected": self.ref_def.get(attr), "element": elem,
+                               "path": self.oid_paths.get(oid), "paths": self.ref_paths.get((attr, oid), [])}
+                              for attr, oid_elems in type_mismatch.items() for oid, elem in oid_elems.items()],
+            "orphans": [{"oid": oid, "element": self.oid[oid], "attribute": ref, "path": self.oid_paths.get(oid)}
+                        for oid, ref in self._find_orphans().items()]
+        }
+
+    def check_unreferenced_oids(self):
+        """ identify ELEMENTS that are defined but not used """
+        return self._find_orphans()
+
+    def _find_ref_violations(self):
+        dangling = {}
+        type_mismatch = {}
+        for attr, oid_set in self.oid_ref.items():
+            if attr in self.skip_attr:
+                continue
+            not_found = oid_set.difference(self.oid)
+            if not_found:
+                dangling[attr] = not_found
+            wrong_type = oid_set.difference(not_found, self.elem_oids.get(self.ref_def.get(attr), ()))
+            if wrong_type:
+                type_mismatch[attr] = {oid: self.oid[oid] for oid in sorted(wrong_type)}
+        return dangling, type_mismatch
+
+    def _find_orphans(self):
+        unreferenced = {}
+        for elem, oids in self.elem_oids.items():
+            for ref in self.def_ref[elem]:
+                for oid in oids - self.oid_ref[ref]:
+                    unreferenced[oid] = ref
+        # orphans are returned in the order the OIDs were added
+        return {oid: unreferenced[oid] for oid in self.oid if oid in unreferenced}
+
+    def _init_oid_ref(self):
+        """ adds an empty set to oid_ref for each OID reference attribute of the model """
+        raise NotImplementedError("Attempted to execute an abstract method _init_oid_ref in the BaseOIDRef class")
+
+    def _init_ref_def(self):
+        """ maps each OID reference attribute in ref_def to the name of the element it refers to """
+        raise NotImplementedError("Attempted to execute an abstract method _init_ref_def in the BaseOIDRef class")
+
+    def _init_def_ref(self):
+        """ maps each element with an OID in def_ref to the list of attributes that refer to it """
+        raise NotImplementedError("Attempted to execute an abstract method _init_def_ref in the BaseOIDRef class")
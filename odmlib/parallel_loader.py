@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+import odmlib.odm_loader as OL
+import odmlib.ns_registry as NS
+import odmlib.typed as T
+import odmlib.xml_backend as XB
+import importlib
+import mmap
+import re
+
+# the attributes of a start tag for the byte-level tag patterns; an attribute value may contain >, so quoted values
+# are matched as a whole
+TAG_ATTRIBUTES = rb"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+ODM_TAG_PAT = re.compile(rb"<((?:[\w.-]+:)?ODM)\b" + TAG_ATTRIBUTES + rb">")
+CLINICAL_DATA_TAG_PAT = re.compile(rb"<(/?)((?:[\w.-]+:)?(?:ClinicalData|SubjectData))\b" + TAG_ATTRIBUTES + rb">")
+
+
+class ParallelClinicalDataLoader:
+    """
+    loads the ClinicalData in an ODM-XML file using a process pool; the file is split into byte ranges at SubjectData
+    boundaries, each worker parses a range of subjects into odmlib objects, and the objects are put back together in
+    document order. The boundaries are found by scanning for the start and end tags, so the file must not contain
+    ClinicalData or SubjectData tags inside comments or CDATA sections.
+    """
+    def __init__(self, loader=None, max_workers=None, subjects_per_chunk=200):
+        """
+        :param loader: XMLODMLoader object whose model, trusted, compact and xml_backend settings the workers use;
+            lazy loading is not used since the workers return fully loaded objects
+        :param max_workers: number of processes in the pool; None uses the number of CPUs and 0 runs in this process
+        :param subjects_per_chunk: number of SubjectData elements each worker loads at a time
+        """
+        self.loader = loader if loader is not None else OL.XMLODMLoader()
+        self.max_workers = max_workers
+        self.subjects_per_chunk = subjects_per_chunk
+
+    def load_clinical_data(self, filename, namespace_registry=None):
+        """
+        loads all the ClinicalData elements in an ODM-XML file
+
+        :param filename: path and filename of the ODM-XML document
+        :param namespace_registry: NamespaceRegistry object for the namespaces used in the document
+        :return: list of ClinicalData odmlib objects in document order
+        """
+        self.loader._set_namespace(namespace_registry)
+        settings = (self.loader.ODM.__name__, self.loader.trusted, self.loader.compact, self.loader.xml_backend,
+                    dict(self.loader.nsr.namespaces), dict(self.loader.nsr.default_namespace))
+        partitions = self._split(filename)
+        tasks = [(settings, filename, prefix, start, end, suffix) for chunks in partitions
+                 for prefix, start, end, suffix in chunks]
+        if self.max_workers == 0:
+            results = [_load_chunk(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(self.max_workers) as executor:
+                results = list(executor.map(_load_chunk, tasks))
+        clinical_data = []
+        position = 0
+        for chunks in partitions:
+            clinical_data.append(self._merge(results[position:position + len(chunks)]))
+            position += len(chunks)
+        return clinical_data
+
+    def _split(self, filename):
+        """
+        finds the ClinicalData elements and splits each one into chunks of subjects
+
+        :param filename: path and filename of the ODM-XML document
+        :return: list with a list of (prefix, start, end, suffix) chunks for each ClinicalData; prefix + the bytes from
+            start to end + suffix is a well-formed ODM document
+        """
+        partitions = []
+        with open(filename, "rb") as odm_in, mmap.mmap(odm_in.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            odm_tag = ODM_TAG_PAT.search(data)
+            if odm_tag is None:
+                raise ValueError(f"The ODM element was not found in {filename}")
+            # the XML declaration and the ODM start tag with its namespace declarations
+            header = data[:odm_tag.end()]
+            odm_end_tag = b"</" + odm_tag.group(1) + b">"
+            clinical_data_tag = None
+            subject_starts = []
+            for tag in CLINICAL_DATA_TAG_PAT.finditer(data, odm_tag.end()):
+                is_end, name = tag.group(1), tag.group(2)
+                if name.endswith(b"SubjectData"):
+                    if not is_end and clinical_data_tag is not None:
+                        subject_starts.append(tag.start())
+                elif not is_end and tag.group(0).endswith(b"/>"):
+                    partitions.append([(header, tag.start(), tag.end(), odm_end_tag)])
+                elif not is_end:
+                    clinical_data_tag = tag
+                    subject_starts = []
+                elif clinical_data_tag is not None:
+                    prefix = header + clinical_data_tag.group(0)
+                    suffix = tag.group(0) + odm_end_tag
+                    bounds = [clinical_data_tag.end()] + subject_starts[self.subjects_per_chunk::self.subjects_per_chunk]
+                    ends = bounds[1:] + [tag.start()]
+                    partitions.append([(prefix, start, end, suffix) for start, end in zip(bounds, ends)])
+                    clinical_data_tag = None
+        return partitions
+
+    @staticmethod
+    def _merge(chunks):
+        """ appends the child elements loaded from the other chunks of a ClinicalData to the first chunk """
+        clinical_data = chunks[0]
+        for chunk in chunks[1:]:
+            for name, desc in type(clinical_data)._elems.items():
+                elements = chunk.__dict__.get(name)
+                if elements and isinstance(desc, T.ODMListObject):
+                    getattr(clinical_data, name).extend(elements)
+        if len(chunks) > 1:
+            clinical_data.reorder_object()
+        return clinical_data
+
+
+def _load_chunk(task):
+    """
+    loads a chunk of a ClinicalData element in a worker process
+
+    :param task: (loader settings, filename, prefix bytes, start offset, end offset, suffix bytes)
+    :return: ClinicalData odmlib object with the child elements in the chunk
+    """
+    (model_name, trusted, compact, xml_backend, namespaces, default_namespace), filename, prefix, start, end, suffix = task
+    for prefix_name, uri in namespaces.items():
+        NS.NamespaceRegistry(prefix=prefix_name, uri=uri, is_default=prefix_name in default_namespace)
+    loader = OL.XMLODMLoader(trusted=trusted, compact=compact, xml_backend=xml_backend)
+    loader.ODM = importlib.import_module(model_name)
+    with open(filename, "rb") as odm_in:
+        odm_in.seek(start)
+        content = odm_in.read(end - start)
+    root = XB.get_backend(xml_backend).fromstring(prefix + content + suffix)
+    return loader._load_element(root[0], False)
@@ -0,0 +1,173 @@
+from concurrent.futures import ProcessPoolExecutor
+import odmlib.conformance as CONF
+import odmlib.typed as T
+import cerberus
+
+
+class ParallelValidator:
+    """
+    runs the conformance, element order and OID checks on a large odmlib object, such as a MetaDataVersion or a
+    ClinicalData, by splitting its lists of child elements into partitions that are checked in a process pool; the
+    OIDs found in each partition are checked against each other in a final step. The conformance checks use the
+    NativeConformanceChecker, and partitions whose schema has cerberus rules it does not implement are validated with
+    cerberus instead
+    """
+    def __init__(self, metadata_schema=None, oid_checker=None, check_order=True, max_workers=None, chunk_size=1000):
+        """
+        :param metadata_schema: MetadataSchema class from the model rules, e.g. odmlib.define_2_1.rules.metadata_schema;
+            None skips the conformance checks
+        :param oid_checker: OIDRef class from the model rules, e.g. odmlib.define_2_1.rules.oid_ref; None skips the
+            OID checks
+        :param check_order: if True the order of the child elements is checked
+        :param max_workers: number of processes in the pool; None uses the number of CPUs and 0 runs in this process
+        :param chunk_size: maximum number of elements in a partition
+        """
+        self.metadata_schema = metadata_schema
+        self.oid_checker = oid_checker
+        self.check_order = check_order
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+    def validate(self, root, partition_names=None):
+        """
+        checks root and all its child elements
+
+        :param root: odmlib object to check, e.g. a MetaDataVersion or a ClinicalData
+        :param partition_names: names of the lists of child elements to partition; defaults to all of them
+        :return: dictionary with the conformance and order violations and, if there is an oid_checker, the oid_report
+        """
+        schema_name = type(root).__name__
+        if partition_names is None:
+            partition_names = [name for name, desc in type(root)._elems.items() if isinstance(desc, T.ODMListObject)]
+        # root is checked without the partitioned lists, which are checked by the workers
+        shell = type(root).__new__(type(root))
+        store = shell.__dict__
+        for name, value in root.__dict__.items():
+            store[name] = [] if name in partition_names else value
+        tasks = [(self.metadata_schema, self.oid_checker is not None, self.check_order, schema_name, shell, None, 0)]
+        for name in partition_names:
+            elements = root.__dict__.get(name) or []
+            for start in range(0, len(elements), self.chunk_size):
+                tasks.append((self.metadata_schema, self.oid_checker is not None, self.check_order, schema_name,
+                              list(elements[start:start + self.chunk_size]), name, start))
+        if self.max_workers == 0:
+            results = [_check_partition(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(self.max_workers) as executor:
+                results = list(executor.map(_check_partition, tasks))
+        return self._reduce(results)
+
+    def _reduce(self, results):
+        """ merges the partition results and runs the OID checks across all the partitions """
+        report = {"conformance": [], "order": []}
+        for result in results:
+            report["conformance"].extend(result["conformance"])
+            report["order"].extend(result["order"])
+        if self.oid_checker is not None:
+            oid_checker = self.oid_checker(collect_errors=True)
+            for result in results:
+                for event, oid, name, path in result["oids"]:
+                    if event == "oid":
+                        oid_checker.add_oid(oid, name, path)
+                    else:
+                        oid_checker.add_oid_ref(oid, name, path)
+            report["oids"] = oid_checker.oid_report()
+        return report
+
+
+class OIDRecorder:
+    """ records the OIDs and OID references found in a partition so they can be checked together later """
+    collect_errors = True
+
+    def __init__(self):
+        self.oids = []
+
+    def add_oid(self, oid, element, path=None):
+        self.oids.append(("oid", oid, element, path))
+
+    def add_oid_ref(self, oid, attr, path=None):
+        self.oids.append(("ref", oid, attr, path))
+
+
+def _check_partition(task):
+    """
+    runs the checks on one partition in a worker process
+
+    :param task: (metadata_schema, check_oids, check_order, schema name of the root, root shell or list of elements,
+        name of the list of elements or None for the root shell, position of the first element in the list)
+    :return: dictionary with the conformance violations, order violations and recorded OIDs
+    """
+    metadata_schema, check_oids, check_order, schema_name, elements, name, start = task
+    result = {"conformance": [], "order": [], "oids": []}
+    if metadata_schema is not None:
+        result["conformance"] = _find_conformance_violations(metadata_schema(), schema_name, elements, name, start)
+    if name is None:
+        # the root shell
+        paths = [schema_name]
+        elements = [elements]
+    else:
+        paths = [f"{schema_name}/{name}[{i}]" for i in range(start, start + len(elements))]
+    recorder = OIDRecorder()
+    for element, path in zip(elements, paths):
+        if check_order:
+            try:
+                element.verify_order()
+            except ValueError as e:
+                result["order"].append({"path": path, "message": str(e)})
+        if check_oids:
+            element._init_oid_check(recorder, path)
+    result["oids"] = recorder.oids
+    return result
+
+
+def _find_conformance_violations(metadata_schema, schema_name, elements, name, start):
+    """
+    checks the root shell or a partition of a list of child elements with the native conformance checks; when the
+    schema uses cerberus rules the native checks do not implement, the partition is validated with cerberus against
+    the same MetadataSchema schema, as verify_conformance does
+
+    :param metadata_schema: MetadataSchema object from the model rules
+    :param schema_name: schema name of the root
+    :param elements: root shell, or list of elements from the list of child elements name
+    :param name: name of the list of child elements or None for the root shell
+    :param start: position of the first of the elements in the list
+    :return: list of {"path": element or attribute path, "message": cerberus error message}
+    """
+    checker = CONF.NativeConformanceChecker(metadata_schema)
+    try:
+        if name is None:
+            return checker.find_violations(elements, schema_name)
+        return checker.find_list_violations(elements, schema_name, name, schema_name, start)
+    except CONF.UnsupportedRuleError:
+        pass
+    schema = metadata_schema.get_schema(schema_name)
+    if name is None:
+        validator = cerberus.Validator(schema)
+        validator.validate(elements.to_dict())
+        return _flatten_errors(validator.errors, schema_name)
+    if name not in schema:
+        return []
+    # only the rule for the list is checked, so the fields of the root are neither required nor unknown
+    validator = cerberus.Validator({name: schema[name]})
+    validator.validate({name: [element.to_dict() for element in elements]})
+    violations = []
+    for error in validator.errors.get(name, []):
+        if isinstance(error, str):
+            violations.append({"path": f"{schema_name}/{name}", "message": error})
+        else:
+            for position, item_errors in error.items():
+                violations.extend(_flatten_errors({position + start: item_errors}, f"{schema_name}/{name}"))
+    return violations
+
+
+def _flatten_errors(errors, path):
+    """ flattens nested cerberus errors into the path and message violations reported by the native checks """
+    violations = []
+    for key, items in errors.items():
+        item_path = f"{path}[{key}]" if isinstance(key, int) else f"{path}/{key}"
+        for item in items:
+            if isinstance(item, str):
+                violations.append({"path": item_path, "message": item})
+            else:
+                violations.extend(_flatten_errors(item, item_path))
+    return violations
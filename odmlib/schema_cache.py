@@ -0,0 +1,45 @@
+from cerberus import schema_registry, validator
+
+# ids of the schema definitions registered by the MetadataSchema classes; any other definition in the registry was
+# added or replaced by the application after the model schemas were registered
+_model_schema_ids = set()
+
+
+class SchemaCacheMixin:
+    """
+    keeps the cerberus schemas and validators of a MetadataSchema class. The ODM and Define-XML schemas share the
+    global cerberus schema_registry, so each class keeps a copy of the registry taken when it is populated, once per
+    process, and caches a validator per schema name. The registry is still read on each check, so schemas that the
+    application registers later, or registers again under a model schema name, are used. The class using the mixin
+    provides _set_metadata_registry.
+    """
+    _schemas = None
+    _validators = None
+
+    def __init__(self):
+        cls = type(self)
+        if cls.__dict__.get("_schemas") is None:
+            self._set_metadata_registry()
+            cls._schemas = dict(schema_registry.all())
+            cls._validators = {}
+            # the copy keeps the definitions alive, so their ids are not reused
+            _model_schema_ids.update(id(schema) for schema in cls._schemas.values())
+
+    def check_conformance(self, doc, schema_name):
+        schema = self.get_schema(schema_name)
+        cached = self._validators.get(schema_name)
+        if cached is None or cached[0] is not schema:
+            cached = self._validators[schema_name] = (schema, validator.Validator(schema))
+        v = cached[1]
+        is_valid = v.validate(doc)
+        if not is_valid:
+            raise ValueError(v.errors)
+        return is_valid
+
+    def get_schema(self, schema_name):
+        """ returns the cerberus schema for schema_name, or None if there is no schema with that name """
+        schema = schema_registry.get(schema_name)
+        if schema is None or id(schema) in _model_schema_ids:
+            # the registry may hold the schema of another model with the same name
+            return self._schemas.get(schema_name, schema)
+        return schema
@@ -0,0 +1,213 @@
+import odmlib
+import hashlib
+import importlib
+import json
+import marshal
+import os
+import struct
+import tempfile
+
+SNAPSHOT_MAGIC = b"ODMLSNAP"
+# version of the snapshot layout; snapshots written with another version are treated as out of date
+SNAPSHOT_VERSION = 1
+# format version and length of the JSON header that follow the magic bytes
+HEADER_STRUCT = struct.Struct(">HI")
+
+
+class SnapshotCache:
+    """
+    caches loaded odmlib hierarchies, such as a define.xml, as binary snapshots that are reloaded without parsing the
+    XML or running the descriptor validation. A snapshot is out of date when the hash of its source file or the
+    version of the odmlib model modules it was created from changes. The body is written with marshal, so snapshots
+    are only for caching on the same Python version and not for exchanging data.
+    """
+    def __init__(self, snapshot_dir=None):
+        """
+        :param snapshot_dir: directory for the snapshot files; defaults to the directory of each source file
+        """
+        self.snapshot_dir = snapshot_dir
+
+    def load(self, source_file, load_source):
+        """
+        returns the odmlib object for source_file from its snapshot, or by calling load_source and saving a snapshot
+        when there is no snapshot or it is out of date
+
+        :param source_file: path and filename of the document the odmlib object is loaded from
+        :param load_source: function without arguments that loads the odmlib object from source_file
+        :return: odmlib object
+        """
+        snapshot_file = self.snapshot_file(source_file)
+        source_hash = file_hash(source_file)
+        odm_obj = None
+        if os.path.exists(snapshot_file):
+            try:
+                odm_obj = read_snapshot(snapshot_file, source_hash)
+            except (ValueError, ImportError):
+                # a truncated or corrupt snapshot, or one of model modules that no longer exist, is replaced
+                odm_obj = None
+        if odm_obj is None:
+            odm_obj = load_source()
+            write_snapshot(snapshot_file, odm_obj, source_hash)
+        return odm_obj
+
+    def snapshot_file(self, source_file):
+        """ returns the path and filename of the snapshot for source_file """
+        directory, name = os.path.split(os.path.abspath(source_file))
+        return os.path.join(self.snapshot_dir if self.snapshot_dir else directory, name + ".odmsnap")
+
+
+def write_snapshot(snapshot_file, odm_obj, source_hash=None):
+    """
+    writes an odmlib hierarchy as a binary snapshot; the class names and strings are each stored once in a table and
+    the objects refer to them by position
+
+    :param snapshot_file: path and filename of the snapshot
+    :param odm_obj: odmlib object to write
+    :param source_hash: hash of the source document, as returned by file_hash, used to find out of date snapshots
+    """
+    encoder = _SnapshotEncoder()
+    tree = encoder.encode(odm_obj)
+    modules = sorted({module for module, name, compact in encoder.classes})
+    header = json.dumps({"source_hash": source_hash, "model_version": model_version(modules), "modules": modules,
+                         "marshal_version": marshal.version}).encode("utf-8")
+    # the snapshot is written to a temporary file that replaces snapshot_file, so readers never see a partial file
+    fd, tmp_file = tempfile.mkstemp(prefix=os.path.basename(snapshot_file) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(snapshot_file)))
+    try:
+        with os.fdopen(fd, "wb") as snapshot_out:
+            snapshot_out.write(SNAPSHOT_MAGIC + HEADER_STRUCT.pack(SNAPSHOT_VERSION, len(header)) + header)
+            marshal.dump((encoder.classes, encoder.strings, tree), snapshot_out)
+        os.replace(tmp_file, snapshot_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+
+def read_snapshot(snapshot_file, source_hash=None):
+    """
+    reads an odmlib hierarchy from a binary snapshot without running the descriptor validation
+
+    :param snapshot_file: path and filename of the snapshot
+    :param source_hash: hash of the current source document; None skips the source check
+    :return: odmlib object, or None when the snapshot is out of date
+    :raises ValueError: when the file is not an odmlib snapshot or it is truncated or corrupt
+    """
+    with open(snapshot_file, "rb") as snapshot_in:
+        if snapshot_in.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{snapshot_file} is not an odmlib snapshot")
+        try:
+            version, header_length = HEADER_STRUCT.unpack(snapshot_in.read(HEADER_STRUCT.size))
+            if version != SNAPSHOT_VERSION:
+                return None
+            header = json.loads(snapshot_in.read(header_length).decode("utf-8"))
+            if header["marshal_version"] != marshal.version:
+                return None
+            if source_hash is not None and header["source_hash"] != source_hash:
+                return None
+            if header["model_version"] != model_version(header["modules"]):
+                return None
+            classes, strings, tree = marshal.load(snapshot_in)
+            return _decode(tree, _load_classes(classes), strings)
+        except (struct.error, EOFError, KeyError, IndexError, TypeError, AttributeError) as exc:
+            raise ValueError(f"{snapshot_file} is truncated or corrupt: {exc}") from exc
+
+
+def file_hash(filename):
+    """ returns the SHA-256 hex digest of a file """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file_in:
+        for block in iter(lambda: file_in.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_model_hashes = {}
+
+
+def model_version(modules):
+    """
+    returns the odmlib version combined with a hash of the source of the model modules, so a snapshot is out of date
+    when the model classes change
+
+    :param modules: names of the model modules, e.g. odmlib.define_2_0.model
+    :return: version string
+    """
+    digest = hashlib.sha256()
+    for module_name in modules:
+        module_hash = _model_hashes.get(module_name)
+        if module_hash is None:
+            module_hash = _model_hashes[module_name] = file_hash(importlib.import_module(module_name).__file__)
+        digest.update(module_name.encode("utf-8") + module_hash.encode("ascii"))
+    return odmlib.__version__ + ":" + digest.hexdigest()[:16]
+
+
+class _SnapshotEncoder:
+    """
+    converts an odmlib hierarchy to nested tuples: an object is (class position, (name position, value, ...)), a
+    string is its position in the string table, an int or float is wrapped in a 1-tuple and a list is a list
+    """
+    def __init__(self):
+        self.classes = []
+        self.strings = []
+        self._class_ids = {}
+        self._string_ids = {}
+
+    def encode(self, odm_obj):
+        cls = type(odm_obj)
+        class_id = self._class_ids.get(cls)
+        if class_id is None:
+            # compact classes are generated, so they are stored as the model class they are created from
+            model_class = getattr(cls, "_model_class", cls)
+            class_id = self._class_ids[cls] = len(self.classes)
+            self.classes.append((model_class.__module__, model_class.__name__, model_class is not cls))
+        fields = []
+        for name, value in odm_obj.__dict__.items():
+            fields.append(self._string(name))
+            fields.append(self._value(value))
+        return class_id, tuple(fields)
+
+    def _value(self, value):
+        if isinstance(value, str):
+            return self._string(value)
+        elif value is None or isinstance(value, bool):
+            return value
+        elif isinstance(value, (int, float)):
+            return (value,)
+        elif isinstance(value, list):
+            return [self.encode(item) for item in value]
+        elif hasattr(type(value), "_elem_names"):
+            return self.encode(value)
+        raise TypeError(f"Values of type {type(value).__name__} cannot be written to a snapshot")
+
+    def _string(self, text):
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+
+def _load_classes(classes):
+    loaded = []
+    for module_name, class_name, compact in classes:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        loaded.append(cls.compact_class() if compact else cls)
+    return loaded
+
+
+def _decode(node, classes, strings):
+    cls = classes[node[0]]
+    odm_obj = cls.__new__(cls)
+    store = odm_obj.__dict__
+    fields = node[1]
+    for i in range(0, len(fields), 2):
+        value = fields[i + 1]
+        value_type = type(value)
+        if value_type is int:
+            value = strings[value]
+        elif value_type is list:
+            value = [_decode(item, classes, strings) for item in value]
+        elif value_type is tuple:
+            value = value[0] if len(value) == 1 else _decode(value, classes, strings)
+        store[strings[fields[i]]] = value
+    return odm_obj
@@ -0,0 +1,300 @@
+import odmlib.odm_loader as OL
+import odmlib.parallel_loader as PL
+import odmlib.xml_backend as XB
+import codecs
+import json
+import mmap
+import os
+import re
+
+SUBJECT_TAG_PAT = re.compile(rb"<(/?)((?:[\w.-]+:)?(ClinicalData|SubjectData|StudyEventData|FormData))\b" +
+                             PL.TAG_ATTRIBUTES + rb">")
+ATTRIBUTE_PAT = re.compile(rb"""\s([\w.:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+TAG_NAME_PAT = re.compile(rb"<([\w.:-]+)")
+XML_DECLARATION_PAT = re.compile(rb"""(?:\xef\xbb\xbf)?<\?xml\s[^>]*?\bencoding\s*=\s*["']([A-Za-z][\w.-]*)["']""")
+REFERENCE_PAT = re.compile(r"&(?:#x([0-9a-fA-F]+)|#([0-9]+)|(lt|gt|amp|quot|apos));")
+# attribute value normalization turns literal whitespace characters into spaces
+WHITESPACE = str.maketrans("\t\n\r", "   ")
+ENTITIES = {"lt": "<", "gt": ">", "amp": "&", "quot": "\"", "apos": "'"}
+# byte order marks of the encodings that are not ASCII compatible, so the tags cannot be found by scanning bytes
+WIDE_BOMS = (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+# version of the sidecar index file; version 1 decoded the keys as UTF-8 and did not resolve character references,
+# version 2 kept one SubjectData for each SubjectKey
+INDEX_VERSION = 3
+
+
+class SubjectIndex:
+    """
+    byte offsets of the SubjectData elements in a large ODM-XML file, and optionally of their StudyEventData and
+    FormData elements, so one subject can be loaded without parsing the whole file. The index is built in one pass
+    over the memory-mapped file and can be saved as a JSON sidecar file next to it. Like the parallel loader, the
+    offsets are found by scanning for the start and end tags, so the file must not contain these tags inside comments
+    or CDATA sections, and it must use an ASCII compatible encoding such as UTF-8, ISO-8859-1 or Windows-1252. A
+    SubjectKey may be used in more than one ClinicalData, but only once in the ClinicalData of a StudyOID and
+    MetaDataVersionOID.
+    """
+    def __init__(self, filename, loader=None, include_events=False, index_file=None, namespace_registry=None):
+        """
+        :param filename: path and filename of the ODM-XML document
+        :param loader: XMLODMLoader object used to create the odmlib objects; defaults to the ODM 1.3.2 model
+        :param include_events: if True the offsets of the StudyEventData and FormData elements are indexed
+        :param index_file: path and filename of the sidecar index; defaults to filename + ".subjects.json"
+        :param namespace_registry: NamespaceRegistry object for the namespaces used in the document
+        """
+        self.filename = filename
+        self.loader = loader if loader is not None else OL.XMLODMLoader()
+        self.loader._set_namespace(namespace_registry)
+        self.include_events = include_events
+        self.index_file = index_file if index_file else str(filename) + ".subjects.json"
+        self.index = None
+
+    def open(self):
+        """ loads the sidecar index when it is up to date with the ODM-XML file, otherwise builds and saves it """
+        if not self.load():
+            self.build()
+            self.save()
+        return self
+
+    def build(self):
+        """ scans the ODM-XML file and indexes the ClinicalData, SubjectData and, optionally, the event elements """
+        index = {"version": INDEX_VERSION, "source": self._source_stamp(), "include_events": self.include_events,
+                 "odm_tag": None, "clinical_data": [], "subjects": {}}
+        with open(self.filename, "rb") as odm_in, mmap.mmap(odm_in.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding = self._document_encoding(data)
+            odm_tag = PL.ODM_TAG_PAT.search(data)
+            if odm_tag is None:
+                raise ValueError(f"The ODM element was not found in {self.filename}")
+            index["odm_tag"] = [odm_tag.start(), odm_tag.end()]
+            subject = event = form = None
+            for tag in SUBJECT_TAG_PAT.finditer(data, odm_tag.end()):
+                is_end, name = tag.group(1), tag.group(3)
+                is_empty = tag.group(0).endswith(b"/>")
+                if name == b"ClinicalData":
+                    if not is_end:
+                        attrs = _attributes(tag.group(0), encoding)
+                        index["clinical_data"].append({"tag": [tag.start(), tag.end()],
+                                                       "study_oid": attrs.get("StudyOID"),
+                                                       "metadata_version_oid": attrs.get("MetaDataVersionOID")})
+                elif name == b"SubjectData":
+                    if not is_end:
+                        attrs = _attributes(tag.group(0), encoding)
+                        subject_key = attrs.get("SubjectKey")
+                        if subject_key is None:
+                            raise ValueError(f"The SubjectData at byte {tag.start()} of {self.filename} has no "
+                                             f"SubjectKey")
+                        clinical_data = index["clinical_data"][-1]
+                        subjects = index["subjects"].setdefault(subject_key, [])
+                        if any(_is_in(index, other, clinical_data["study_oid"], clinical_data["metadata_version_oid"])
+                               for other in subjects):
+                            raise ValueError(f"SubjectKey {subject_key} occurs more than once in the ClinicalData of "
+                                             f"StudyOID {clinical_data['study_oid']} and MetaDataVersionOID "
+                                             f"{clinical_data['metadata_version_oid']} in {self.filename}")
+                        subject = {"start": tag.start(), "end": tag.end(), "tag_end": tag.end(),
+                                   "clinical_data": len(index["clinical_data"]) - 1}
+                        if self.include_events:
+                            subject["events"] = []
+                        subjects.append(subject)
+                    if is_end or is_empty:
+                        subject["end"] = tag.end()
+                        subject = None
+                elif not self.include_events or subject is None:
+                    continue
+                elif name == b"StudyEventData":
+                    if not is_end:
+                        attrs = _attributes(tag.group(0), encoding)
+                        event = {"oid": attrs.get("StudyEventOID"), "repeat_key": attrs.get("StudyEventRepeatKey"),
+                                 "start": tag.start(), "end": tag.end(), "tag_end": tag.end(), "forms": []}
+                        subject["events"].append(event)
+                    if is_end or is_empty:
+                        event["end"] = tag.end()
+                        event = None
+                elif event is not None:
+                    if not is_end:
+                        attrs = _attributes(tag.group(0), encoding)
+                        form = {"oid": attrs.get("FormOID"), "repeat_key": attrs.get("FormRepeatKey"),
+                                "start": tag.start(), "end": tag.end()}
+                        event["forms"].append(form)
+                    if is_end or is_empty:
+                        form["end"] = tag.end()
+                        form = None
+        self.index = index
+        return self
+
+    def save(self):
+        """ writes the index to the sidecar index file """
+        with open(self.index_file, "w", encoding="utf-8") as index_out:
+            json.dump(self.index, index_out)
+
+    def load(self):
+        """
+        reads the sidecar index file
+
+        :return: True if the index was loaded; False if there is no index file or it is out of date
+        """
+        if not os.path.exists(self.index_file):
+            return False
+        with open(self.index_file, "r", encoding="utf-8") as index_in:
+            index = json.load(index_in)
+        if (index.get("version") != INDEX_VERSION or index.get("source") != self._source_stamp()
+                or (self.include_events and not index.get("include_events"))):
+            return False
+        self.index = index
+        return True
+
+    def subject_keys(self):
+        """ returns the indexed SubjectKeys in document order, listing a SubjectKey in several ClinicalData once """
+        return list(self._get_index()["subjects"])
+
+    def load_subject(self, subject_key, study_oid=None, metadata_version_oid=None):
+        """
+        parses only the bytes of one SubjectData element
+
+        :param subject_key: SubjectKey of the SubjectData
+        :param study_oid: StudyOID of the ClinicalData; needed when the SubjectKey is in more than one ClinicalData
+        :param metadata_version_oid: MetaDataVersionOID of the ClinicalData with the SubjectData
+        :return: SubjectData odmlib object
+        """
+        subject = self._subject(subject_key, study_oid, metadata_version_oid)
+        return self._load_range(subject["start"], subject["end"], self._outer_tags(subject))
+
+    def load_study_event(self, subject_key, study_event_oid, repeat_key=None, study_oid=None,
+                         metadata_version_oid=None):
+        """
+        parses only the bytes of one StudyEventData element; requires an index built with include_events
+
+        :param subject_key: SubjectKey of the SubjectData
+        :param study_event_oid: StudyEventOID of the StudyEventData
+        :param repeat_key: StudyEventRepeatKey; None finds the first StudyEventData with study_event_oid
+        :param study_oid: StudyOID of the ClinicalData; needed when the SubjectKey is in more than one ClinicalData
+        :param metadata_version_oid: MetaDataVersionOID of the ClinicalData with the SubjectData
+        :return: StudyEventData odmlib object
+        """
+        subject = self._subject(subject_key, study_oid, metadata_version_oid)
+        event = self._find_event(subject, study_event_oid, repeat_key)
+        outer_tags = self._outer_tags(subject) + [(subject["start"], subject["tag_end"])]
+        return self._load_range(event["start"], event["end"], outer_tags)
+
+    def load_form(self, subject_key, study_event_oid, form_oid, event_repeat_key=None, form_repeat_key=None,
+                  study_oid=None, metadata_version_oid=None):
+        """
+        parses only the bytes of one FormData element; requires an index built with include_events
+
+        :param subject_key: SubjectKey of the SubjectData
+        :param study_event_oid: StudyEventOID of the StudyEventData with the FormData
+        :param form_oid: FormOID of the FormData
+        :param event_repeat_key: StudyEventRepeatKey; None finds the first StudyEventData with study_event_oid
+        :param form_repeat_key: FormRepeatKey; None finds the first FormData with form_oid
+        :param study_oid: StudyOID of the ClinicalData; needed when the SubjectKey is in more than one ClinicalData
+        :param metadata_version_oid: MetaDataVersionOID of the ClinicalData with the SubjectData
+        :return: FormData odmlib object
+        """
+        subject = self._subject(subject_key, study_oid, metadata_version_oid)
+        event = self._find_event(subject, study_event_oid, event_repeat_key)
+        for form in event["forms"]:
+            if form["oid"] == form_oid and (form_repeat_key is None or form["repeat_key"] == str(form_repeat_key)):
+                outer_tags = self._outer_tags(subject) + [(subject["start"], subject["tag_end"]),
+                                                          (event["start"], event["tag_end"])]
+                return self._load_range(form["start"], form["end"], outer_tags)
+        raise KeyError(f"FormData {form_oid} not found in StudyEventData {study_event_oid} of subject {subject_key}")
+
+    def _get_index(self):
+        if self.index is None:
+            self.open()
+        return self.index
+
+    def _subject(self, subject_key, study_oid, metadata_version_oid):
+        index = self._get_index()
+        subjects = [subject for subject in index["subjects"].get(subject_key, [])
+                    if _is_in(index, subject, study_oid, metadata_version_oid)]
+        if not subjects:
+            raise KeyError(f"SubjectKey {subject_key} not found in {self.filename}")
+        if len(subjects) > 1:
+            raise ValueError(f"SubjectKey {subject_key} is in more than one ClinicalData in {self.filename}; set "
+                             f"study_oid and metadata_version_oid to select one")
+        return subjects[0]
+
+    def _find_event(self, subject, study_event_oid, repeat_key):
+        if "events" not in subject:
+            raise ValueError("The subject index was built without the StudyEventData and FormData offsets; "
+                             "create it with include_events=True")
+        for event in subject["events"]:
+            if event["oid"] == study_event_oid and (repeat_key is None or event["repeat_key"] == str(repeat_key)):
+                return event
+        raise KeyError(f"StudyEventData {study_event_oid} not found")
+
+    def _outer_tags(self, subject):
+        """ returns the (start, end) offsets of the ODM and ClinicalData start tags that enclose the subject """
+        return [tuple(self.index["odm_tag"]), tuple(self.index["clinical_data"][subject["clinical_data"]]["tag"])]
+
+    def _load_range(self, start, end, outer_tags):
+        """
+        parses the bytes from start to end inside copies of the enclosing start tags and their end tags
+
+        :param start: offset of the start tag of the element to load
+        :param end: offset of the end of the end tag of the element to load
+        :param outer_tags: (start, end) offsets of the start tags that enclose the element, outermost first
+        :return: odmlib object
+        """
+        with open(self.filename, "rb") as odm_in, mmap.mmap(odm_in.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start_tags = [data[tag_start:tag_end] for tag_start, tag_end in outer_tags]
+            # the XML declaration before the ODM start tag is kept so the document is parsed with its encoding
+            header = data[:outer_tags[0][1]] + b"".join(start_tags[1:])
+            content = data[start:end]
+        end_tags = [b"</" + TAG_NAME_PAT.match(tag).group(1) + b">" for tag in reversed(start_tags)]
+        root = XB.get_backend(self.loader.xml_backend).fromstring(header + content + b"".join(end_tags))
+        elem = root
+        for _ in start_tags:
+            elem = elem[0]
+        return self.loader._load_element(elem, False)
+
+    def _document_encoding(self, data):
+        """ returns the encoding from the XML declaration, raising a ValueError if it is not ASCII compatible """
+        if data[:4].startswith(WIDE_BOMS):
+            raise ValueError(f"{self.filename} uses UTF-16 or UTF-32; the subject index requires an ASCII compatible "
+                             f"encoding")
+        declaration = XML_DECLARATION_PAT.match(data[:1024])
+        encoding = declaration.group(1).decode("ascii") if declaration else "utf-8"
+        try:
+            ascii_compatible = "<?>=/\"'".encode(encoding) == b"<?>=/\"'"
+        except LookupError:
+            raise ValueError(f"{self.filename} uses the unknown encoding {encoding}") from None
+        if not ascii_compatible:
+            raise ValueError(f"{self.filename} uses {encoding}; the subject index requires an ASCII compatible "
+                             f"encoding")
+        return encoding
+
+    def _source_stamp(self):
+        stat = os.stat(self.filename)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _is_in(index, subject, study_oid, metadata_version_oid):
+    """ returns True if the subject is in a ClinicalData with study_oid and metadata_version_oid, when they are set """
+    clinical_data = index["clinical_data"][subject["clinical_data"]]
+    return ((study_oid is None or clinical_data["study_oid"] == study_oid) and
+            (metadata_version_oid is None or clinical_data["metadata_version_oid"] == metadata_version_oid))
+
+
+def _attributes(start_tag, encoding="utf-8"):
+    """
+    returns the attributes of a start tag as a dictionary of strings
+
+    :param start_tag: bytes of the start tag
+    :param encoding: encoding of the document
+    :return: dictionary of attribute names and values with the character and entity references resolved
+    """
+    attrs = {}
+    for match in ATTRIBUTE_PAT.finditer(start_tag):
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        value = value.decode(encoding).replace("\r\n", " ").translate(WHITESPACE)
+        attrs[match.group(1).decode(encoding)] = REFERENCE_PAT.sub(_resolve_reference, value)
+    return attrs
+
+
+def _resolve_reference(match):
+    hex_code, decimal_code, entity = match.groups()
+    if hex_code:
+        return chr(int(hex_code, 16))
+    if decimal_code:
+        return chr(int(decimal_code))
+    return ENTITIES[entity]
@@ -1,9 +1,76 @@
 import odmlib.descriptor as DESC
 import re
 import odmlib.valueset as VS
+import odmlib.lazy_list as LL
 import datetime
 from validators import email as valid_email, url as valid_url
 from pathvalidate import is_valid_filename
+from functools import lru_cache
+
+# the patterns used by the date, time and SAS descriptors are compiled once when the module loads
+DATETIME_PAT = re.compile(r'^(-?(?:[1-9][0-9]*)?[0-9]{4})-(1[0-2]|0[1-9])-(3[01]|0[1-9]|[12][0-9])T(2[0-3]|[01][0-9]):([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[01][0-9]):[0-5][0-9])?$')
+PARTIAL_DATETIME_PAT = re.compile(r'^((([0-9][0-9][0-9][0-9])((-(([0][1-9])|([1][0-2])))((-(([0][1-9])|([1-2][0-9])|([3][0-1])))(T((([0-1][0-9])|([2][0-3]))((:([0-5][0-9]))(((:([0-5][0-9]))((\.[0-9]+)?))?)?)?((((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|(Z)))?))?)?)?))$')
+PARTIAL_DATE_PAT = re.compile(r'^(([0-9][0-9][0-9][0-9])(-(([0][1-9])|([1][0-2])))?)$')
+TIME_PAT = re.compile(r'^(2[0-3]|[01][0-9]):([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[01][0-9]):[0-5][0-9])?$')
+PARTIAL_TIME_PAT = re.compile(r'^((([0-1][0-9])|([2][0-3]))(:[0-5][0-9])?(((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|(Z))?)$')
+INCOMPLETE_DATETIME_PAT = re.compile(r'^(((([0-9][0-9][0-9][0-9]))|-)-(((([0][1-9])|([1][0-2])))|-)-(((([0][1-9])|([1-2][0-9])|([3][0-1])))|-)T(((([0-1][0-9])|([2][0-3])))|-):((([0-5][0-9]))|-):((([0-5][0-9](\.[0-9]+)?))|-)((((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|Z|-))?)$')
+INCOMPLETE_DATE_PAT = re.compile(r'^(((([0-9][0-9][0-9][0-9]))|-)-(((([0][1-9])|([1][0-2])))|-)-(((([0][1-9])|([1-2][0-9])|([3][0-1])))|-))$')
+INCOMPLETE_TIME_PAT = re.compile(r'^((((([0-1][0-9])|([2][0-3])))|-):((([0-5][0-9]))|-):((([0-5][0-9](\.[0-9]+)?))|-)((((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|Z|-))?)$')
+DURATION_DATETIME_PAT = re.compile(r'^((\+ | -)?P([0-9]([0-9]+)?)W)$')
+SAS_NAME_PAT = re.compile("[A-Za-z_][A-Za-z0-9_]*$")
+SAS_FORMAT_PAT = re.compile("[A-Za-z_$][A-Za-z0-9_.]*$")
+
+# dates and times repeat heavily in clinical data so the results of recent validations are remembered
+VALIDATED_VALUE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_datetime(value):
+    return DATETIME_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_partial_datetime(value):
+    return PARTIAL_DATETIME_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_date(value):
+    try:
+        datetime.datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_partial_date(value):
+    return PARTIAL_DATE_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_partial_time(value):
+    return TIME_PAT.match(value) is not None or PARTIAL_TIME_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_incomplete_datetime(value):
+    return INCOMPLETE_DATETIME_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_incomplete_date(value):
+    return INCOMPLETE_DATE_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_incomplete_time(value):
+    return INCOMPLETE_TIME_PAT.match(value) is not None
+
+
+@lru_cache(maxsize=VALIDATED_VALUE_CACHE_SIZE)
+def _is_duration_datetime(value):
+    return DURATION_DATETIME_PAT.match(value) is not None
 
 
 class Typed(DESC.Descriptor):
@@ -144,18 +211,14 @@ class SizedRegexString(SizedString, Regex):
 
 class DateTimeString(DESC.Descriptor):
     def __set__(self, instance, value):
-        iso_pat = r'^(-?(?:[1-9][0-9]*)?[0-9]{4})-(1[0-2]|0[1-9])-(3[01]|0[1-9]|[12][0-9])T(2[0-3]|[01][0-9]):([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[01][0-9]):[0-5][0-9])?$'
-        pat = re.compile(iso_pat)
-        if (value is not None) and (not pat.match(value)):
+        if (value is not None) and (not _is_datetime(value)):
             raise ValueError(f"Expected type datetime for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class PartialDateTimeString(DESC.Descriptor):
     def __set__(self, instance, value):
-        part_pat = r'^((([0-9][0-9][0-9][0-9])((-(([0][1-9])|([1][0-2])))((-(([0][1-9])|([1-2][0-9])|([3][0-1])))(T((([0-1][0-9])|([2][0-3]))((:([0-5][0-9]))(((:([0-5][0-9]))((\.[0-9]+)?))?)?)?((((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|(Z)))?))?)?)?))$'
-        compiled_part_pat = re.compile(part_pat)
-        if (value is not None) and (not compiled_part_pat.match(value)):
+        if (value is not None) and (not _is_partial_datetime(value)):
             raise ValueError(f"Expected type PartialDateTime for {self.name}, found value {value}")
         super().__set__(instance, value)
 
@@ -163,88 +226,65 @@ class PartialDateTimeString(DESC.Descriptor):
 class PartialDateString(DESC.Descriptor):
     def __set__(self, instance, value):
         if value and value.count('-') == 2:
-            try:
-                datetime.datetime.strptime(value, '%Y-%m-%d')
-            except ValueError:
-                raise ValueError(f"Expected type PartialDate for {self.name}, found value {value}")
-        else:
-            part_pat = r'^(([0-9][0-9][0-9][0-9])(-(([0][1-9])|([1][0-2])))?)$'
-            compiled_part_pat = re.compile(part_pat)
-            if (value is not None) and (not compiled_part_pat.match(value)):
+            if not _is_date(value):
                 raise ValueError(f"Expected type PartialDate for {self.name}, found value {value}")
+        elif (value is not None) and (not _is_partial_date(value)):
+            raise ValueError(f"Expected type PartialDate for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class PartialTimeString(DESC.Descriptor):
     def __set__(self, instance, value):
-        time_pat = r'^(2[0-3]|[01][0-9]):([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[01][0-9]):[0-5][0-9])?$'
-        compiled_time_pat = re.compile(time_pat)
-        part_pat = r'^((([0-1][0-9])|([2][0-3]))(:[0-5][0-9])?(((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|(Z))?)$'
-        compiled_part_pat = re.compile(part_pat)
-        if (value is not None) and (not (compiled_time_pat.match(value) or compiled_part_pat.match(value))):
+        if (value is not None) and (not _is_partial_time(value)):
             raise ValueError(f"Expected type IncompleteTime for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class IncompleteDateTimeString(DESC.Descriptor):
     def __set__(self, instance, value):
-        inc_pat = r'^(((([0-9][0-9][0-9][0-9]))|-)-(((([0][1-9])|([1][0-2])))|-)-(((([0][1-9])|([1-2][0-9])|([3][0-1])))|-)T(((([0-1][0-9])|([2][0-3])))|-):((([0-5][0-9]))|-):((([0-5][0-9](\.[0-9]+)?))|-)((((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|Z|-))?)$'
-        compiled_inc_pat = re.compile(inc_pat)
-        if (value is not None) and (not compiled_inc_pat.match(value)):
+        if (value is not None) and (not _is_incomplete_datetime(value)):
             raise ValueError(f"Expected type IncompleteDateTime for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class IncompleteDateString(DESC.Descriptor):
     def __set__(self, instance, value):
-        inc_pat = r'^(((([0-9][0-9][0-9][0-9]))|-)-(((([0][1-9])|([1][0-2])))|-)-(((([0][1-9])|([1-2][0-9])|([3][0-1])))|-))$'
-        compiled_inc_pat = re.compile(inc_pat)
-        if (value is not None) and (not compiled_inc_pat.match(value)):
+        if (value is not None) and (not _is_incomplete_date(value)):
             raise ValueError(f"Expected type IncompleteDate for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class IncompleteTimeString(DESC.Descriptor):
     def __set__(self, instance, value):
-        inc_pat = r'^((((([0-1][0-9])|([2][0-3])))|-):((([0-5][0-9]))|-):((([0-5][0-9](\.[0-9]+)?))|-)((((\+|-)(([0-1][0-9])|([2][0-3])):[0-5][0-9])|Z|-))?)$'
-        compiled_inc_pat = re.compile(inc_pat)
-        if (value is not None) and (not compiled_inc_pat.match(value)):
+        if (value is not None) and (not _is_incomplete_time(value)):
             raise ValueError(f"Expected type IncompleteTime for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class DurationDateTimeString(DESC.Descriptor):
     def __set__(self, instance, value):
-        dur_pat = r'^((\+ | -)?P([0-9]([0-9]+)?)W)$'
-        pat = re.compile(dur_pat)
-        if (value is not None) and (not pat.match(value)):
+        if (value is not None) and (not _is_duration_datetime(value)):
             raise ValueError(f"Expected type DurationDateTime for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class DateString(DESC.Descriptor):
     def __set__(self, instance, value):
-        try:
-            if value is not None:
-                datetime.datetime.strptime(value, '%Y-%m-%d')
-        except ValueError:
+        if (value is not None) and (not _is_date(value)):
             raise ValueError(f"Expected type date (YYYY-MM-DD) for {self.name}, found value {value}")
         super().__set__(instance, value)
 
 
 class SASName(DESC.Descriptor):
     def __set__(self, instance, value):
-        pat = re.compile("[A-Za-z_][A-Za-z0-9_]*$")
-        if (value is not None) and (not pat.match(value) or len(value) > 8):
+        if (value is not None) and (not SAS_NAME_PAT.match(value) or len(value) > 8):
             raise ValueError(f"{self.name} has an invalid sasName of {value}")
         super().__set__(instance, value)
 
 
 class SASFormat(DESC.Descriptor):
     def __set__(self, instance, value):
-        # is_valid = True
-        pat = re.compile("[A-Za-z_$][A-Za-z0-9_.]*$")
-        if (value is not None) and (not pat.match(value) or len(value) > 8):
+        if (value is not None) and (not SAS_FORMAT_PAT.match(value) or len(value) > 8):
             raise ValueError(f"{self.name} has an invalid sasFormat of {value}")
         super().__set__(instance, value)
 
@@ -271,12 +311,35 @@ class FileName(DESC.Descriptor):
 
 
 class ValidValues(DESC.Descriptor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # frozensets of valid values keyed by model class; ODMMeta binds them when the class is created
+        self.value_sets = {}
+
+    def bind_value_set(self, cls, value_set):
+        self.value_sets[cls] = value_set
+
     def __set__(self, instance, value):
-        if (value is not None) and value not in VS.ValueSet.value_set(type(instance).__name__ + "." + self.name):
-            raise TypeError(f"Invalid value {value} for {self.name}. Value must be one of "
-                            f"{', '.join(VS.ValueSet.value_set(self.name))}")
+        if value is not None:
+            value_set = self.value_sets.get(type(instance))
+            if value_set is None:
+                value_set = self._find_value_set(type(instance))
+            if value not in value_set:
+                raise ValueError(f"Invalid value {value} for {self.name}. Value must be one of "
+                                 f"{', '.join(sorted(value_set))}")
         super().__set__(instance, value)
 
+    def _find_value_set(self, cls):
+        # subclasses that inherit the descriptor use the value set of the class that declared it
+        for base in cls.__mro__[1:]:
+            if base in self.value_sets:
+                value_set = self.value_sets[base]
+                break
+        else:
+            value_set = frozenset(VS.ValueSet.value_set(cls.__name__ + "." + self.name))
+        self.value_sets[cls] = value_set
+        return value_set
+
 
 class ExtendedValidValues(DESC.Descriptor):
     def __set__(self, instance, value):
@@ -290,6 +353,14 @@ class ValueSetString(ValidValues, String):
     pass
 
 
+def _is_element_type(value, obj_type):
+    """ objects of a compact class are accepted wherever their model class is expected """
+    if isinstance(value, obj_type):
+        return True
+    model_class = getattr(type(value), "_model_class", None)
+    return model_class is not None and issubclass(model_class, obj_type)
+
+
 class ODMObject(DESC.Descriptor):
     def __init__(self, *args, element_class,  **kwargs):
         self.obj_type = element_class
@@ -298,16 +369,23 @@ class ODMObject(DESC.Descriptor):
         super().__init__(*args, **kwargs)
 
     def __set__(self, instance, value):
-        if not isinstance(value, self.obj_type) and not isinstance(value, list):
+        if not _is_element_type(value, self.obj_type) and not isinstance(value, list):
             raise TypeError(f"The {self.name} object must be of type {self.obj_type}")
         super().__set__(instance, value)
 
 
 class ODMListObject(ODMObject, list):
+    def __get__(self, instance, cls):
+        value = super().__get__(instance, cls)
+        # children loaded in lazy mode are created the first time the list is accessed
+        if type(value) is LL.LazyList:
+            value.materialize()
+        return value
+
     def __set__(self, instance, value):
         if isinstance(value, list):
             for obj in value:
-                if not isinstance(obj, self.obj_type):
+                if not _is_element_type(obj, self.obj_type):
                     raise TypeError(f"Every {self.name} object in the list must be of type {self.obj_type}")
         else:
             raise TypeError(f"The {self.name} object must be a list")
@@ -1,4 +1,7 @@
 
+import importlib
+
+
 class ValueSet:
     _value_set = {
         "ODM.FileType": ["Snapshot", "Transactional", "Query"],
@@ -85,3 +88,30 @@ class ValueSet:
             return cls._value_set[attribute]
         else:
             raise ValueError(f"Unknown value {attribute} in ValueSet. Unable to check value.")
+
+    @classmethod
+    def package_value_sets(cls, module_name):
+        """
+        returns the frozensets of valid values for the model package that contains module_name; a model package may
+        have its own valueset module (e.g. odmlib.odm_2_0.valueset) and the entries it does not define come from
+        this module. The value sets are resolved once per package
+
+        :param module_name: name of the module that defines the model classes, e.g. odmlib.odm_2_0.model
+        :return: dictionary of frozensets keyed by class name and attribute name, e.g. ItemRef.Mandatory
+        """
+        package = module_name.rpartition(".")[0]
+        if package not in _package_value_sets:
+            value_sets = {key: frozenset(values) for key, values in cls._value_set.items()}
+            if package:
+                try:
+                    package_vs = importlib.import_module(package + ".valueset")
+                except ModuleNotFoundError as e:
+                    if e.name != package + ".valueset":
+                        raise
+                else:
+                    value_sets.update({key: frozenset(values) for key, values in package_vs.ValueSet._value_set.items()})
+            _package_value_sets[package] = value_sets
+        return _package_value_sets[package]
+
+
+_package_value_sets = {}
@@ -0,0 +1,139 @@
+import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as LXML
+except ImportError:
+    LXML = None
+
+XML_NS_URI = "http://www.w3.org/XML/1998/namespace"
+
+
+class ElementTreeBackend:
+    """ parses and serializes XML using the Python standard library xml.etree.ElementTree """
+    name = "etree"
+
+    def register_namespace(self, prefix, uri):
+        ET.register_namespace(prefix, uri)
+
+    def parse(self, source):
+        return ET.parse(source)
+
+    def fromstring(self, odm_string):
+        return ET.fromstring(odm_string)
+
+    def iterparse(self, source, events):
+        return ET.iterparse(source, events=events)
+
+    def write(self, odm_file, odm_elem, nsr):
+        """
+        write an ElementTree Element generated by to_xml to an ODM file
+
+        :param odm_file: path and file to write the ODM XML, or a binary file object
+        :param odm_elem: Element object to write to ODM (presumably an ODM root)
+        :param nsr: NamespaceRegistry with the namespaces used in odm_elem
+        """
+        tree = ET.ElementTree(odm_elem)
+        root = tree.getroot()
+        # workaround for elementtree NS bug - NamespaceRegistry assumes at least 1 default NS has been set
+        nsr.set_odm_namespace_attributes(root)
+        tree.write(odm_file, xml_declaration=True, encoding='utf-8', method='xml', short_empty_elements=True)
+
+
+class LxmlBackend(ElementTreeBackend):
+    """ parses and serializes XML using the lxml C library; requires lxml to be installed """
+    name = "lxml"
+
+    def __init__(self):
+        if LXML is None:
+            raise ImportError("The lxml XML backend requires the lxml package to be installed")
+        self.parser = LXML.XMLParser(huge_tree=True, remove_comments=True, remove_pis=True)
+
+    def register_namespace(self, prefix, uri):
+        # lxml takes the prefixes from the parsed document; registration only matters for ElementTree serialization
+        ET.register_namespace(prefix, uri)
+
+    def parse(self, source):
+        return LXML.parse(source, self.parser)
+
+    def fromstring(self, odm_string):
+        # lxml does not accept str input that contains an XML encoding declaration
+        if isinstance(odm_string, str):
+            odm_string = odm_string.encode("utf-8")
+        return LXML.fromstring(odm_string, self.parser)
+
+    def iterparse(self, source, events):
+        return LXML.iterparse(source, events=events, huge_tree=True, remove_comments=True, remove_pis=True)
+
+    def write(self, odm_file, odm_elem, nsr):
+        """
+        write an ElementTree Element generated by to_xml to an ODM file using lxml.etree.xmlfile; each child of the
+        root is converted to lxml and serialized on its own, so only one child at a time is held as an lxml copy, but
+        the whole ElementTree built by to_xml stays in memory. Use ODMStreamWriter to write without an ElementTree.
+
+        :param odm_file: path and file to write the ODM XML, or a binary file object
+        :param odm_elem: Element object to write to ODM (presumably an ODM root)
+        :param nsr: NamespaceRegistry with the namespaces used in odm_elem
+        """
+        default_prefix = list(nsr.default_namespace.keys())[0]
+        nsmap = {(None if prefix == default_prefix else prefix): uri for prefix, uri in nsr.namespaces.items()
+                 if prefix != "xml"}
+        holder = LXML.Element(self._qualify_tag(odm_elem.tag, nsr), nsmap=nsmap)
+        with LXML.xmlfile(odm_file, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element(holder.tag, self._qualify_attributes(odm_elem.attrib, nsr), nsmap=nsmap):
+                if odm_elem.text:
+                    xf.write(odm_elem.text)
+                for child in odm_elem:
+                    lxml_child = self._convert(child, holder, nsr)
+                    xf.write(lxml_child)
+                    holder.remove(lxml_child)
+
+    def _convert(self, elem, parent, nsr):
+        """ recursively copy an ElementTree Element that uses prefixed names into lxml using qualified names """
+        lxml_elem = LXML.SubElement(parent, self._qualify_tag(elem.tag, nsr), self._qualify_attributes(elem.attrib, nsr))
+        lxml_elem.text = elem.text
+        lxml_elem.tail = elem.tail
+        for child in elem:
+            self._convert(child, lxml_elem, nsr)
+        return lxml_elem
+
+    @staticmethod
+    def _qualify_tag(tag, nsr):
+        if tag.startswith("{"):
+            return tag
+        prefix, _, name = tag.rpartition(":")
+        if not prefix:
+            prefix = list(nsr.default_namespace.keys())[0]
+        if prefix not in nsr.namespaces:
+            raise ValueError(f"Error: Namespace with prefix {prefix} has not been registered")
+        return "{" + nsr.namespaces[prefix] + "}" + name
+
+    @staticmethod
+    def _qualify_attributes(attrib, nsr):
+        attributes = {}
+        for attr, value in attrib.items():
+            if attr == "xmlns" or attr.startswith("xmlns:"):
+                continue
+            prefix, _, name = attr.rpartition(":")
+            if not prefix or attr.startswith("{"):
+                attributes[attr] = value
+            elif prefix == "xml":
+                attributes["{" + XML_NS_URI + "}" + name] = value
+            else:
+                attributes[nsr.get_ns_attribute_name(name, prefix)] = value
+        return attributes
+
+
+def get_backend(xml_backend=None):
+    """
+    return the XML backend object selected by name; lxml falls back to ElementTree when it is not installed
+
+    :param xml_backend: None or "etree" for ElementTree, "lxml" for lxml, or an ElementTreeBackend object
+    :return: XML backend object
+    """
+    if xml_backend is None or xml_backend == "etree":
+        return ElementTreeBackend()
+    elif xml_backend == "lxml":
+        return LxmlBackend() if LXML is not None else ElementTreeBackend()
+    elif isinstance(xml_backend, ElementTreeBackend):
+        return xml_backend
+    raise ValueError(f"Unknown XML backend {xml_backend}. Use etree or lxml.")
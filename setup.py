@@ -23,5 +23,9 @@ setup(
         "validators>=0.18.2",
         "Cerberus>=1.3.4",
         "pathvalidate>=2.3.1"
-    ]
+    ],
+    extras_require={
+        "lxml": ["lxml>=4.6.0"],
+        "numpy": ["numpy>=1.17"]
+    }
 )
@@ -436,3 +436,29 @@ class TestCheckODM(TestCase):
         cl = ODM.CodeList(OID="ODM.CL.NY_SUB_Y_N", Name="No Yes Response", DataType="text")
         cl.CodeListItem = [cli1, cli2]
         return [cl]
+
+    def test_cached_validator(self):
+        self.validator.check_conformance({"CodedValue": "HGB"}, "CodeListItem")
+        validator = METADATA.MetadataSchema()
+        self.assertIs(validator._validators["CodeListItem"][1], self.validator._validators["CodeListItem"][1])
+        with self.assertRaises(ValueError):
+            validator.check_conformance({"OrderNumber": 1}, "CodeListItem")
+
+    def test_schemas_not_replaced_by_define(self):
+        import odmlib.define_2_1.rules.metadata_schema as DEFINE_METADATA
+        DEFINE_METADATA.MetadataSchema()
+        item = ODM.ItemDef(OID="ODM.IT.AE.AEYN", Name="Any AEs?", DataType="text")
+        item.Question.TranslatedText = [ODM.TranslatedText(_content="Any AEs?", lang="en")]
+        self.assertTrue(METADATA.MetadataSchema().check_conformance(item.to_dict(), "ItemDef"))
+
+    def test_schema_registered_later(self):
+        C.schema_registry.add("CustomStudyName", {"_content": {"type": "string", "required": True}})
+        try:
+            self.assertTrue(self.validator.check_conformance({"_content": "CDISC-Protocol"}, "CustomStudyName"))
+            with self.assertRaises(ValueError):
+                self.validator.check_conformance({}, "CustomStudyName")
+            C.schema_registry.add("CustomStudyName", {"_content": {"type": "string", "allowed": ["Other"]}})
+            with self.assertRaises(ValueError):
+                self.validator.check_conformance({"_content": "CDISC-Protocol"}, "CustomStudyName")
+        finally:
+            C.schema_registry.remove("CustomStudyName")
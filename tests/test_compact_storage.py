@@ -0,0 +1,106 @@
+import unittest
+import copy
+import json
+import os
+import pickle
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.define_2_1.model as DEFINE
+import odmlib.odm_element as OE
+import odmlib.descriptor as DESC
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+
+
+class TestCompactStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+
+    def test_compact_class(self):
+        compact = ODM.ItemData.compact_class()
+        self.assertIs(compact, ODM.ItemData.compact_class())
+        self.assertIs(compact, compact.compact_class())
+        self.assertEqual(compact.__name__, "ItemData")
+        self.assertListEqual(compact._fields, ODM.ItemData._fields)
+        item = compact(ItemOID="IT.AGE", Value="64")
+        self.assertFalse(hasattr(item, "__weakref__"))
+        self.assertIsInstance(item, OE.ODMElement)
+        self.assertEqual(item.Value, "64")
+        self.assertDictEqual(item.to_dict(), ODM.ItemData(ItemOID="IT.AGE", Value="64").to_dict())
+        with self.assertRaises(TypeError):
+            item.Unknown = "value"
+        with self.assertRaises(ValueError):
+            compact(Value="64")
+
+    def test_slot_descriptors(self):
+        compact = DEFINE.ItemGroupDef.compact_class()
+        desc = compact.__dict__["Repeating"]
+        self.assertIsInstance(desc, DESC.SlotDescriptor)
+        self.assertIsInstance(desc, type(DEFINE.ItemGroupDef.__dict__["Repeating"]))
+        self.assertIsNot(desc, DEFINE.ItemGroupDef.__dict__["Repeating"])
+        igd = compact(OID="IG.VS", Name="VS", Repeating="Yes", Domain="VS", SASDatasetName="VS",
+                      IsReferenceData="No", Purpose="Tabulation", ArchiveLocationID="LF.VS", Structure="One record")
+        self.assertEqual(igd.Repeating, "Yes")
+        self.assertEqual(compact.__dict__["_slot_Repeating"].__get__(igd), "Yes")
+        # validation still runs before the value is stored in the slot
+        with self.assertRaises(ValueError):
+            igd.Repeating = "Maybe"
+        self.assertEqual(igd.Repeating, "Yes")
+        self.assertListEqual(igd.ItemRef, [])
+        del igd.Domain
+        self.assertNotIn("Domain", igd.__dict__)
+
+    def test_declaration_order(self):
+        compact = DEFINE.ItemGroupDef.compact_class()
+        igd = compact(OID="IG.VS", Name="VS", Repeating="Yes", Domain="VS", SASDatasetName="VS",
+                      IsReferenceData="No", Purpose="Tabulation", ArchiveLocationID="LF.VS", Structure="One record")
+        igd.ItemRef.append(DEFINE.ItemRef(ItemOID="IT.VS.STUDYID", Mandatory="Yes"))
+        igd.Description = DEFINE.Description()
+        igd.Description.TranslatedText.append(DEFINE.TranslatedText(_content="Vital Signs", lang="en"))
+        self.assertListEqual(list(igd.__dict__.keys())[-2:], ["Description", "ItemRef"])
+        self.assertTrue(igd.verify_order())
+        igd.reorder_object()
+        self.assertEqual(len(igd), 1)
+        self.assertEqual(igd[0].ItemOID, "IT.VS.STUDYID")
+        self.assertIn("def:Structure", igd.to_xml_string())
+
+    def test_compact_load_odm(self):
+        odm_file = os.path.join(self.data_path, 'odm-data-snapshot.xml')
+        documents = []
+        for compact in [False, True]:
+            loader = OL.XMLODMLoader(compact=compact)
+            loader.create_document(odm_file)
+            documents.append(loader.load_odm())
+        self.assertIs(type(documents[1].ClinicalData[0]), ODM.ClinicalData.compact_class())
+        self.assertDictEqual(documents[0].to_dict(), documents[1].to_dict())
+        self.assertDictEqual(json.loads(documents[0].to_json()), json.loads(documents[1].to_json()))
+        # the compact serializer reads the slots in the order of the compact object's __dict__
+        subject = documents[1].ClinicalData[0].SubjectData[0]
+        self.assertListEqual(list(subject.to_dict()), list(subject.__dict__))
+        documents[1].validate()
+
+    def test_compact_load_define(self):
+        define_file = os.path.join(self.data_path, 'defineV21-SDTM.xml')
+        documents = []
+        for compact in [False, True]:
+            loader = DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1",
+                                        compact=compact, lazy=compact)
+            loader.create_document(define_file)
+            documents.append(loader.load_metadataversion())
+        self.assertDictEqual(documents[0].to_dict(), documents[1].to_dict())
+        self.assertTrue(documents[1].verify_order())
+        igd = documents[1].find("ItemGroupDef", "OID", "IG.VS")
+        igd.ItemRef.append(DEFINE.ItemRef(ItemOID="IT.VS.NEW", Mandatory="No"))
+        self.assertEqual(igd.ItemRef[-1].ItemOID, "IT.VS.NEW")
+
+    def test_compact_copy_and_pickle(self):
+        compact = ODM.ItemGroupData.compact_class()
+        igd = compact(ItemGroupOID="IG.VS", ItemGroupRepeatKey="1")
+        igd.ItemData = [ODM.ItemData.compact_class()(ItemOID="IT.VSORRES", Value="120")]
+        for clone in [copy.deepcopy(igd), pickle.loads(pickle.dumps(igd))]:
+            self.assertIs(type(clone), compact)
+            self.assertDictEqual(clone.to_dict(), igd.to_dict())
+            self.assertIsNot(clone.ItemData[0], igd.ItemData[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 from unittest import TestCase
+import json
 import odmlib.odm_1_3_2.model as ODM
 import odmlib.odm_1_3_2.rules.metadata_schema as METADATA
 import odmlib.odm_1_3_2.rules.oid_ref as OID
@@ -96,6 +97,61 @@ class TestConformanceCheckODM(TestCase):
             # checks for non-unique OIDs and runs the ref/def check
             self.mdv.verify_oids(oid_checker)
 
+    def test_OID_refdef_violations(self):
+        attrs = {"OID": "MDV.TRACE-XML-ODM-01", "Name": "TRACE-XML MDV", "Description": "Trace-XML Example"}
+        self.mdv = ODM.MetaDataVersion(**attrs)
+        self.mdv.Protocol = self.add_protocol()
+        self.mdv.StudyEventDef = self.add_SED()
+        self.mdv.FormDef = self.add_FD()
+        self.mdv.ItemGroupDef = self.add_IGD_refdef()
+        self.mdv.ItemGroupDef[3].ItemRef.append(ODM.ItemRef(ItemOID="ODM.CL.NY_SUB_Y_N", Mandatory="No"))
+        self.mdv.ItemDef = self.add_ITD()
+        self.mdv.CodeList = self.add_CL()
+        self.mdv.MethodDef = self.add_MD()
+        self.mdv.ConditionDef = self.add_CD()
+        oid_checker = OID.OIDRef()
+        self.mdv._init_oid_check(oid_checker)
+        violations = oid_checker.find_oid_ref_violations()
+        self.assertDictEqual(violations["dangling"], {"ItemOID": {"ODM.IT.VS.BP.DIABP.VSORRES_BAD"}})
+        self.assertDictEqual(violations["type_mismatch"], {"ItemOID": {"ODM.CL.NY_SUB_Y_N": "CodeList"}})
+        self.assertEqual(violations["orphans"]["ODM.IT.VS.BP.DIABP.VSORRES"], "ItemOID")
+        self.assertEqual(violations["orphans"]["ODM.CL.NY_SUB_Y_N"], "CodeListOID")
+        with self.assertRaises(ValueError):
+            oid_checker.check_oid_refs()
+
+    def test_OID_check_order(self):
+        # the first attribute with a bad reference is reported, whether the OID is missing or of the wrong type
+        oid_checker = OID.OIDRef()
+        oid_checker.add_oid("ODM.F.DM", "FormDef")
+        oid_checker.add_oid("ODM.IT.DM.AGE", "ItemDef")
+        oid_checker.add_oid_ref("ODM.IT.DM.AGE", "FormOID")
+        oid_checker.add_oid_ref("ODM.IT.DM.MISSING", "ItemOID")
+        with self.assertRaisesRegex(ValueError, "attribute FormOID element types do not match"):
+            oid_checker.check_oid_refs()
+
+    def test_OID_collect_errors(self):
+        attrs = {"OID": "MDV.TRACE-XML-ODM-01", "Name": "TRACE-XML MDV", "Description": "Trace-XML Example"}
+        self.mdv = ODM.MetaDataVersion(**attrs)
+        self.mdv.Protocol = self.add_protocol()
+        self.mdv.StudyEventDef = self.add_SED()
+        self.mdv.FormDef = self.add_FD()
+        self.mdv.ItemGroupDef = self.add_IGD_refdef()
+        self.mdv.ItemDef = self.add_ITD_nonunique()
+        self.mdv.CodeList = self.add_CL()
+        self.mdv.MethodDef = self.add_MD()
+        self.mdv.ConditionDef = self.add_CD()
+        oid_checker = OID.OIDRef(collect_errors=True)
+        self.assertFalse(self.mdv.verify_oids(oid_checker))
+        report = oid_checker.oid_report()
+        self.assertListEqual(report["duplicates"], [{"oid": "ODM.IT.VS.BP.SYSBP.VSORRES", "element": "ItemDef",
+                                                     "path": "MetaDataVersion/ItemDef[9]", "first_element": "ItemDef",
+                                                     "first_path": "MetaDataVersion/ItemDef[5]"}])
+        self.assertListEqual(report["dangling"], [{"oid": "ODM.IT.VS.BP.DIABP.VSORRES_BAD", "attribute": "ItemOID",
+                                                   "paths": ["MetaDataVersion/ItemGroupDef[0]/ItemRef[1]"]}])
+        self.assertListEqual(report["type_mismatch"], [])
+        self.assertEqual(report["orphans"][1]["path"], "MetaDataVersion/ItemDef[1]")
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
     def test_OID_creation_dirty(self):
         attrs = {"OID": "MDV.TRACE-XML-ODM-01", "Description": "Trace-XML Example"}
         with self.assertRaises(ValueError):
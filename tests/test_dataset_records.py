@@ -0,0 +1,60 @@
+import unittest
+import os
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.odm_loader as OL
+import odmlib.ns_registry as NS
+import odmlib.dataset_1_0_1.model as ODM
+import odmlib.dataset_1_0_1.records as REC
+
+
+class TestDatasetRecords(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0"))
+        loader.open_odm_document(os.path.join(self.data_path, 'define2-0-0-sdtm-test.xml'))
+        self.mdv = loader.MetaDataVersion()
+        self.layout = REC.RecordLayout(self.mdv.find("ItemGroupDef", "OID", "IG.AE"))
+        odm_loader = OL.XMLODMLoader(model_package="dataset_1_0_1", ns_uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        NS.NamespaceRegistry(prefix="odm", uri="http://www.cdisc.org/ns/odm/v1.3", is_default=True)
+        ns = NS.NamespaceRegistry(prefix="data", uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        odm_loader.create_document(os.path.join(self.data_path, 'ae_test.xml'), ns)
+        self.odm = odm_loader.load_odm()
+
+    def test_sparse_record(self):
+        igd = self.odm.ClinicalData.ItemGroupData[1]
+        record = self.layout.record(igd)
+        self.assertEqual(record["IT.AE.AETERM"], "ANXIETY")
+        self.assertEqual(record["IT.AE.AEREL"], "POSSIBLY RELATED")
+        self.assertIsNone(record["IT.AE.AESPID"])
+        self.assertIsNone(record.item("IT.AE.AESPID"))
+        self.assertEqual(record.item("IT.AE.AESEQ").Value, "2")
+        self.assertEqual(list(record)[:4], ["IT.STUDYID", "IT.AE.DOMAIN", "IT.USUBJID", "IT.AE.AESEQ"])
+        self.assertEqual(len(record), len(self.layout.item_oids))
+        with self.assertRaises(KeyError):
+            record["IT.VS.VSTESTCD"]
+        self.assertEqual(record.get("IT.VS.VSTESTCD", "missing"), "missing")
+        self.assertEqual({item.ItemOID: item.Value for item in igd.ItemData},
+                         {item_oid: value for item_oid, value in record.items() if value is not None})
+
+    def test_records(self):
+        records = list(self.layout.records(self.odm.ClinicalData.ItemGroupData))
+        self.assertEqual([record["IT.AE.AESEQ"] for record in records], ["1", "2"])
+        self.assertEqual(REC.record_layouts(self.mdv)["IG.AE"].item_oids, self.layout.item_oids)
+        values = self.layout.values(self.odm.ClinicalData.ItemGroupData[0])
+        self.assertEqual(values[self.layout.positions["IT.AE.AETERM"]], "AGITATED")
+        self.assertIsNone(values[self.layout.positions["IT.AE.AESPID"]])
+
+    def test_complete_record(self):
+        igd = ODM.ItemGroupData(ItemGroupOID="IG.AE", ItemGroupDataSeq=1)
+        for item_oid in self.layout.item_oids:
+            igd.ItemData.append(ODM.ItemData(ItemOID=item_oid, Value=item_oid[3:]))
+        record = self.layout.record(igd)
+        self.assertEqual(record["IT.AE.AEENRF"], "AE.AEENRF")
+        self.assertIsNone(record._items)
+
+    def test_unknown_item(self):
+        igd = ODM.ItemGroupData(ItemGroupOID="IG.AE", ItemGroupDataSeq=1)
+        igd.ItemData.append(ODM.ItemData(ItemOID="IT.VS.VSTESTCD", Value="SYSBP"))
+        with self.assertRaises(ValueError):
+            self.layout.record(igd)["IT.AE.AETERM"]
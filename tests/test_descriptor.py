@@ -40,3 +40,16 @@ class TestDescriptor(unittest.TestCase):
         with self.assertRaises(TypeError):
             itd.new_thing = "hello"
 
+    def test_constructor_keyword_names(self):
+        lang = "{http://www.w3.org/XML/1998/namespace}lang"
+        for _ in range(2):
+            tt = ODM.TranslatedText(**{lang: "en", "_content": "Vital Signs"})
+            self.assertEqual(tt.lang, "en")
+        self.assertEqual(ODM.TranslatedText._kwarg_names[lang], "lang")
+        with self.assertRaises(TypeError):
+            ODM.TranslatedText(**{"{http://www.w3.org/XML/1998/namespace}space": "preserve"})
+        with self.assertRaises(TypeError):
+            ODM.TranslatedText(language="en")
+        with self.assertRaises(ValueError) as context:
+            ODM.ItemDef(OID="IT.VS.VSORRES", Name="Vital Signs Results")
+        self.assertEqual(str(context.exception), "Missing required keyword argument DataType in ItemDef")
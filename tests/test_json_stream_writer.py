@@ -0,0 +1,59 @@
+import unittest
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.odm_element as OE
+import odmlib.odm_1_3_2.model as ODM
+import json
+import io
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+JSON_FILE = os.path.join(DATA_DIR, 'test_json_stream_writer.json')
+
+
+class TestJSONStreamWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1"))
+        loader.open_odm_document(os.path.join(DATA_DIR, 'defineV21-SDTM.xml'))
+        self.define = loader.root()
+
+    def tearDown(self) -> None:
+        if os.path.exists(JSON_FILE):
+            os.remove(JSON_FILE)
+
+    def test_to_json_matches_json_dumps(self):
+        self.assertEqual(self.define.to_json(), json.dumps(self.define.to_dict()))
+
+    def test_write_json_matches_json_dump(self):
+        self.define.write_json(JSON_FILE)
+        with open(JSON_FILE, "r") as json_in:
+            self.assertEqual(json_in.read(), json.dumps(self.define.to_dict()))
+
+    def test_write_json_clinical_data_stream(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(os.path.join(DATA_DIR, 'odm-data-snapshot.xml'))
+        odm = loader.root()
+        out = io.StringIO()
+        OE.ODMJSONStreamWriter(buffer_size=16).write_json(out, odm.ClinicalData[0])
+        self.assertDictEqual(json.loads(out.getvalue()), odm.ClinicalData[0].to_dict())
+
+    def test_to_json_typed_values(self):
+        item_ref = ODM.ItemRef(ItemOID="IT.AETERM", Mandatory="No", OrderNumber=3)
+        self.assertEqual(item_ref.to_json(), '{"ItemOID": "IT.AETERM", "Mandatory": "No", "OrderNumber": 3}')
+        tt = ODM.TranslatedText(_content="Médecin \"A\"", lang="fr")
+        self.assertEqual(tt.to_json(), json.dumps(tt.to_dict()))
+
+    def test_to_dict_empty_list(self):
+        igd = ODM.ItemGroupDef(OID="IG.VS", Name="VS", Repeating="Yes")
+        igd.ItemRef = []
+        self.assertDictEqual(igd.to_dict(), {"OID": "IG.VS", "Name": "VS", "Repeating": "Yes", "ItemRef": []})
+        self.assertEqual(igd.to_json(), json.dumps(igd.to_dict()))
+
+    def test_subclass_element_names(self):
+        self.assertTrue(ODM.ItemGroupDef._elem_names.issuperset({"Description", "ItemRef", "Alias"}))
+        self.assertNotIn("OID", ODM.ItemGroupDef._elem_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
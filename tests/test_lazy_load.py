@@ -0,0 +1,81 @@
+import unittest
+import copy
+import os
+import odmlib.define_loader as DL
+import odmlib.odm_loader as OL
+import odmlib.loader as LO
+import odmlib.lazy_list as LL
+import odmlib.define_2_1.model as DEFINE
+
+
+class TestLazyLoad(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        self.define_file = os.path.join(self.data_path, 'defineV21-SDTM.xml')
+
+    def load_define_mdv(self, lazy):
+        loader = LO.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1",
+                                                 lazy=lazy))
+        loader.open_odm_document(self.define_file)
+        return loader.MetaDataVersion()
+
+    def test_children_loaded_on_access(self):
+        mdv = self.load_define_mdv(lazy=True)
+        item_defs = mdv.__dict__["ItemDef"]
+        self.assertIsInstance(item_defs, LL.LazyList)
+        self.assertFalse(item_defs.is_loaded)
+        self.assertFalse(mdv.__dict__["CodeList"].is_loaded)
+        self.assertIsInstance(mdv.ItemDef[0], DEFINE.ItemDef)
+        self.assertTrue(item_defs.is_loaded)
+        self.assertFalse(mdv.__dict__["CodeList"].is_loaded)
+        self.assertEqual(len(mdv.ItemDef), len(self.load_define_mdv(lazy=False).ItemDef))
+
+    def test_lazy_matches_eager(self):
+        eager = self.load_define_mdv(lazy=False)
+        lazy = self.load_define_mdv(lazy=True)
+        self.assertDictEqual(eager.to_dict(), lazy.to_dict())
+        self.assertEqual(eager.to_xml_string(), self.load_define_mdv(lazy=True).to_xml_string())
+        self.assertTrue(self.load_define_mdv(lazy=True).verify_order())
+
+    def test_lazy_find(self):
+        mdv = self.load_define_mdv(lazy=True)
+        igd = mdv.find("ItemGroupDef", "OID", "IG.VS")
+        self.assertEqual(igd.Name, "VS")
+        self.assertIsInstance(igd.__dict__["ItemRef"], LL.LazyList)
+        self.assertEqual(igd.ItemRef[0].ItemOID, "IT.STUDYID")
+
+    def test_lazy_list_update(self):
+        mdv = self.load_define_mdv(lazy=True)
+        count = len(self.load_define_mdv(lazy=False).CodeList)
+        mdv.__dict__["CodeList"].append(DEFINE.CodeList(OID="CL.NEW", Name="New", DataType="text"))
+        self.assertEqual(len(mdv.CodeList), count + 1)
+        self.assertEqual(mdv.CodeList[-1].OID, "CL.NEW")
+
+    def test_lazy_copy(self):
+        mdv = self.load_define_mdv(lazy=True)
+        method_defs = copy.copy(mdv.__dict__["MethodDef"])
+        self.assertIs(type(method_defs), list)
+        self.assertListEqual(method_defs, mdv.MethodDef)
+
+    def test_lazy_json(self):
+        json_file = os.path.join(self.data_path, 'cdash_odm_test.json')
+        documents = []
+        for lazy in [False, True]:
+            loader = OL.JSONODMLoader(lazy=lazy)
+            loader.create_document(json_file)
+            documents.append(loader.load_odm())
+        self.assertIsInstance(documents[1].Study[0].MetaDataVersion[0].__dict__["ItemDef"], LL.LazyList)
+        self.assertDictEqual(documents[0].to_dict(), documents[1].to_dict())
+
+    def test_lazy_iter_subject_data(self):
+        odm_file = os.path.join(self.data_path, 'odm-data-snapshot.xml')
+        loader = OL.XMLODMLoader(lazy=True)
+        subjects = list(loader.iter_subject_data(odm_file))
+        self.assertEqual(len(subjects), 2)
+        self.assertIs(type(subjects[0].__dict__["StudyEventData"]), list)
+        self.assertEqual(subjects[0].StudyEventData[0].FormData[0].ItemGroupData[0].ItemData[0].ItemOID,
+                         subjects[0].to_dict()["StudyEventData"][0]["FormData"][0]["ItemGroupData"][0]["ItemData"][0]["ItemOID"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import odmlib.odm_loader as OL
+import odmlib.loader as LD
+import odmlib.descriptor as DESC
+import odmlib.odm_1_3_2.model as ODM
+import os
+import copy
+import gc
+
+
+class TestLiveOIDIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.odm_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'cdash-odm-test.xml')
+        self.loader = LD.ODMLoader(OL.XMLODMLoader())
+        self.loader.open_odm_document(self.odm_file)
+        self.odm = self.loader.root()
+        self.idx = self.odm.build_live_oid_index()
+
+    def tearDown(self) -> None:
+        self.idx.close()
+
+    def test_live_index_matches_oid_index(self):
+        idx = self.odm.build_oid_index()
+        self.assertEqual(idx.oid_index.keys(), self.idx.oid_index.keys())
+        for oid, elements in idx.oid_index.items():
+            self.assertEqual([id(e) for e in elements], [id(e) for e in self.idx.find_all(oid)])
+
+    def test_append_item_def(self):
+        mdv = self.odm.Study[0].MetaDataVersion[0]
+        item = ODM.ItemDef(OID="ODM.IT.DM.NEW", Name="New Item", DataType="text")
+        mdv.ItemDef.append(item)
+        self.assertIs(self.idx.find_all("ODM.IT.DM.NEW")[0], item)
+        mdv.ItemGroupDef[0].ItemRef.append(ODM.ItemRef(ItemOID="ODM.IT.DM.NEW", Mandatory="No"))
+        self.assertEqual(len(self.idx.find_all("ODM.IT.DM.NEW")), 2)
+
+    def test_change_oid(self):
+        item = self.idx.find_all("ODM.IT.DM.SEX")[1]
+        item.OID = "ODM.IT.DM.GENDER"
+        self.assertIs(self.idx.find_all("ODM.IT.DM.GENDER")[0], item)
+        self.assertEqual(len(self.idx.find_all("ODM.IT.DM.SEX")), 1)
+
+    def test_remove_item_def(self):
+        mdv = self.odm.Study[0].MetaDataVersion[0]
+        cl = self.idx.find_all("ODM.CL.NY_SUB_Y_N")[-1]
+        mdv.CodeList.remove(cl)
+        self.assertEqual(len(self.idx.find_all("ODM.CL.NY_SUB_Y_N")), 6)
+        del mdv.CodeList[:]
+        self.assertTrue(all(e.CodeListOID == "ODM.CL.NY_SUB_Y_N" for e in self.idx.find_all("ODM.CL.NY_SUB_Y_N")))
+
+    def test_multiply_element_list(self):
+        mdv = self.odm.Study[0].MetaDataVersion[0]
+        code_lists = mdv.CodeList
+        code_lists *= 1
+        self.assertEqual(len(self.idx.find_all("ODM.CL.NY_SUB_Y_N")), 7)
+        code_lists *= 0
+        self.assertTrue(all(e.CodeListOID == "ODM.CL.NY_SUB_Y_N" for e in self.idx.find_all("ODM.CL.NY_SUB_Y_N")))
+
+    def test_replace_element_list(self):
+        mdv = self.odm.Study[0].MetaDataVersion[0]
+        mdv.ItemGroupDef = [ODM.ItemGroupDef(OID="IG.NEW", Name="NEW", Repeating="No")]
+        self.assertEqual(self.idx.find_all("IG.NEW")[0].Name, "NEW")
+        self.assertTrue(all(isinstance(e, ODM.ItemGroupRef) for e in self.idx.find_all("ODM.IG.DM")))
+        mdv.ItemGroupDef.append(ODM.ItemGroupDef(OID="IG.MORE", Name="MORE", Repeating="No"))
+        self.assertEqual(self.idx.find_all("IG.MORE")[0].Name, "MORE")
+
+    def test_close(self):
+        self.idx.close()
+        self.assertNotIn(id(self.odm), DESC.observers)
+        mdv = self.odm.Study[0].MetaDataVersion[0]
+        mdv.ItemDef.append(ODM.ItemDef(OID="ODM.IT.DM.NEW", Name="New Item", DataType="text"))
+        with self.assertRaises(ValueError):
+            self.idx.find_all("ODM.IT.DM.NEW")
+
+    def test_copy_is_not_tracked(self):
+        mdv = copy.deepcopy(self.odm.Study[0].MetaDataVersion[0])
+        self.assertIs(type(mdv.ItemDef), list)
+        mdv.ItemDef.append(ODM.ItemDef(OID="ODM.IT.DM.NEW", Name="New Item", DataType="text"))
+        with self.assertRaises(ValueError):
+            self.idx.find_all("ODM.IT.DM.NEW")
+
+    def test_context_manager(self):
+        self.idx.close()
+        mdv = self.odm.Study[0].MetaDataVersion[0]
+        with mdv.build_live_oid_index() as idx:
+            self.assertIn(id(mdv), DESC.observers)
+            mdv.ItemDef.append(ODM.ItemDef(OID="ODM.IT.DM.NEW", Name="New Item", DataType="text"))
+            self.assertEqual(idx.find_all("ODM.IT.DM.NEW")[0].Name, "New Item")
+        self.assertNotIn(id(mdv), DESC.observers)
+
+    def test_unreferenced_index(self):
+        self.idx.close()
+        self.idx = self.odm.build_live_oid_index()
+        self.assertIn(id(self.odm), DESC.observers)
+        self.idx = None
+        gc.collect()
+        self.assertNotIn(id(self.odm), DESC.observers)
+        self.idx = self.odm.build_live_oid_index()
+
+    def test_unrelated_objects_not_observed(self):
+        item = ODM.ItemDef(OID="ODM.IT.OTHER", Name="Other", DataType="text")
+        item.Name = "Changed"
+        self.assertNotIn(id(item), DESC.observers)
+        with self.assertRaises(ValueError):
+            self.idx.find_all("ODM.IT.OTHER")
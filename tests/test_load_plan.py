@@ -0,0 +1,80 @@
+import unittest
+import odmlib.load_plan as LP
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.define_2_1.model as DEFINE
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+import odmlib.ns_registry as NS
+import os
+
+
+class TestLoadPlan(unittest.TestCase):
+    def test_plan_is_cached(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemGroupDef")
+        self.assertIs(plan, LP.LoadPlan.get_plan(ODM, "ItemGroupDef"))
+        self.assertIsNot(plan, LP.LoadPlan.get_plan(DEFINE, "ItemGroupDef"))
+
+    def test_plan_children_order(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemGroupDef")
+        self.assertListEqual([child[0] for child in plan.children], list(ODM.ItemGroupDef._elems.keys()))
+        name, desc, is_list, path = plan.children[0]
+        self.assertEqual(name, "Description")
+        self.assertFalse(is_list)
+        self.assertEqual(path, "odm:Description")
+
+    def test_plan_define_namespace(self):
+        plan = LP.LoadPlan.get_plan(DEFINE, "ItemRef")
+        name, desc, is_list, path = plan.children[-1]
+        self.assertEqual(name, "WhereClauseRef")
+        self.assertTrue(is_list)
+        self.assertEqual(path, "def:WhereClauseRef")
+
+    def test_plan_create(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemData")
+        item = plan.create({"ItemOID": "IT.AGE", "Value": "64"})
+        self.assertIsInstance(item, ODM.ItemData)
+        self.assertEqual(item.Value, "64")
+
+    def test_plan_unknown_element(self):
+        with self.assertRaises(AttributeError):
+            LP.LoadPlan.get_plan(ODM, "NotAnElement")
+
+    def test_dispatch_children_declaration_order(self):
+        odm_string = """<ItemGroupDef xmlns="http://www.cdisc.org/ns/odm/v1.3" OID="IG.VS" Name="VS" Repeating="Yes">
+            <ItemRef ItemOID="IT.VSTESTCD" Mandatory="Yes"/>
+            <Description><TranslatedText>Vital Signs</TranslatedText></Description>
+            <ItemRef ItemOID="IT.VSORRES" Mandatory="No"/>
+            <Alias Context="SDTM" Name="VS"/>
+        </ItemGroupDef>"""
+        loader = OL.XMLODMLoader()
+        root = loader.create_document_from_string(odm_string)
+        plan = LP.LoadPlan.get_plan(ODM, "ItemGroupDef")
+        dispatched = plan.dispatch_children(root, NS.NamespaceRegistry())
+        self.assertListEqual([child[0] for child, elems in dispatched], ["Description", "ItemRef", "Alias"])
+        self.assertEqual(len(dispatched[1][1]), 2)
+        igd = loader.load_document(root)
+        self.assertTrue(igd.verify_order())
+        self.assertListEqual([ir.ItemOID for ir in igd.ItemRef], ["IT.VSTESTCD", "IT.VSORRES"])
+
+    def test_single_pass_matches_find(self):
+        odm_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'cdash-odm-test.xml')
+        documents = []
+        for single_pass in [True, False]:
+            loader = OL.XMLODMLoader(single_pass=single_pass)
+            loader.create_document(odm_file)
+            documents.append(loader.load_odm().to_dict())
+        self.assertDictEqual(documents[0], documents[1])
+
+    def test_single_pass_matches_find_define(self):
+        define_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'defineV21-SDTM.xml')
+        documents = []
+        for single_pass in [True, False]:
+            loader = DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1",
+                                        single_pass=single_pass)
+            loader.create_document(define_file)
+            documents.append(loader.load_odm().to_dict())
+        self.assertDictEqual(documents[0], documents[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
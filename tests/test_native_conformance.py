@@ -0,0 +1,136 @@
+import unittest
+import os
+import odmlib.conformance as CONF
+import odmlib.odm_loader as OL
+import odmlib.loader as LD
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.odm_1_3_2.rules.metadata_schema as METADATA
+import odmlib.define_2_0.rules.metadata_schema as DEFINE20
+import odmlib.define_2_1.rules.metadata_schema as DEFINE21
+from cerberus import validator
+
+
+def valid_value(rule, depth=0):
+    """ returns a value that conforms to a cerberus rule """
+    if "allowed" in rule:
+        return rule["allowed"][0]
+    rule_type = rule.get("type")
+    if rule_type == "list":
+        return [valid_value(rule["schema"], depth + 1)] if "schema" in rule and depth < 6 else []
+    if rule_type == "dict" or (rule_type is None and "schema" in rule):
+        return valid_document(rule.get("schema", {}), depth + 1)
+    return {"string": "text", "integer": 1, "float": 1.5, "boolean": True}.get(rule_type, "text")
+
+
+def valid_document(schema, depth=0):
+    """ returns a document with the required fields of a cerberus schema, or all its fields below a few levels """
+    return {name: valid_value(rule, depth) for name, rule in schema.items() if rule.get("required") or depth < 2}
+
+
+def invalid_values(rule):
+    """ returns values that violate a cerberus rule """
+    rule_type = rule.get("type")
+    values = []
+    if rule_type in ("string", "dict", "list"):
+        values.append(12345)
+    elif rule_type in ("integer", "float", "boolean"):
+        values.append("one")
+    if "allowed" in rule:
+        values.append("NotAnAllowedValue")
+    if "schema" in rule and rule_type in ("dict", None):
+        values.append({"UnknownField": "text"})
+    if "schema" in rule and rule_type == "list":
+        values.append([valid_value(rule["schema"]), invalid_values(rule["schema"])[0]]
+                      if invalid_values(rule["schema"]) else [12345])
+    return values
+
+
+def documents_for(schema, depth=0):
+    """ returns a conforming document followed by documents that each violate one rule of a cerberus schema """
+    base = valid_document(schema, depth)
+    documents = [base]
+    for name, rule in schema.items():
+        if rule.get("required"):
+            documents.append({key: value for key, value in base.items() if key != name})
+        for value in invalid_values(rule):
+            documents.append({**base, name: value})
+        if "schema" in rule and rule.get("type") in ("dict", None) and depth < 3:
+            for nested in documents_for(rule["schema"], depth + 1)[1:]:
+                documents.append({**base, name: nested})
+    documents.append({**base, "UnknownField": "text"})
+    return documents
+
+
+def cerberus_violations(errors, path):
+    """ flattens cerberus errors into the (path, message) pairs reported by the native checks """
+    violations = set()
+    for key, items in errors.items():
+        item_path = f"{path}[{key}]" if isinstance(key, int) else f"{path}/{key}"
+        for item in items:
+            if isinstance(item, str):
+                violations.add((item_path, item))
+            else:
+                violations.update(cerberus_violations(item, item_path))
+    return violations
+
+
+class TestNativeConformance(unittest.TestCase):
+    def setUp(self) -> None:
+        self.odm_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'cdash-odm-test.xml')
+        self.validator = CONF.NativeConformanceChecker(METADATA.MetadataSchema())
+
+    def test_conforming_odm(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(self.odm_file)
+        odm = loader.root()
+        self.assertTrue(odm.verify_conformance(self.validator))
+        self.assertTrue(odm.verify_conformance(METADATA.MetadataSchema()))
+        self.assertListEqual(self.validator.find_violations(odm.Study[0].MetaDataVersion[0], "MetaDataVersion"), [])
+
+    def test_missing_required_element(self):
+        method = ODM.MethodDef(OID="ODM.MT.AGE", Name="Algorithm to derive AGE", Type="Computation")
+        method.FormalExpression = [ODM.FormalExpression(Context="Python 3.7", _content="print('hello world')")]
+        with self.assertRaises(ValueError):
+            method.verify_conformance(self.validator)
+        with self.assertRaises(ValueError):
+            method.verify_conformance(METADATA.MetadataSchema())
+        self.assertListEqual(self.validator.find_violations(method, "MethodDef"),
+                             [{"path": "MethodDef/Description", "message": "required field"}])
+
+    def test_all_violations_with_paths(self):
+        item = ODM.ItemDef(OID="ODM.IT.AE.AEYN", Name="Any AEs?", DataType="text")
+        item.Question.TranslatedText = [ODM.TranslatedText(_content="Any AEs?", lang="en"), ODM.TranslatedText(_content="x", lang="fr")]
+        item.Alias = [ODM.Alias(Context="SDTM", Name="AEYN")]
+        # bypass the descriptors to create values the schema rejects
+        item.__dict__["Length"] = "one"
+        item.Alias[0].__dict__["Name"] = None
+        del item.Question.TranslatedText[1].__dict__["_content"]
+        violations = self.validator.find_violations(item, "ItemDef", "MetaDataVersion/ItemDef[0]")
+        self.assertListEqual(violations, [
+            {"path": "MetaDataVersion/ItemDef[0]/Length", "message": "must be of integer type"},
+            {"path": "MetaDataVersion/ItemDef[0]/Question/TranslatedText[1]/_content", "message": "required field"},
+            {"path": "MetaDataVersion/ItemDef[0]/Alias[0]/Name", "message": "required field"}])
+
+    def test_unknown_schema(self):
+        with self.assertRaises(ValueError):
+            self.validator.find_violations(ODM.Alias(Context="SDTM", Name="AEYN"), "NotASchema")
+
+    def test_native_matches_cerberus(self):
+        for metadata_module in [METADATA, DEFINE20, DEFINE21]:
+            metadata_schema = metadata_module.MetadataSchema()
+            native = CONF.NativeConformanceChecker(metadata_schema)
+            for schema_name, schema in metadata_schema._schemas.items():
+                cerberus_validator = validator.Validator(schema)
+                for document in documents_for(schema):
+                    with self.subTest(model=metadata_module.__name__, schema=schema_name, document=document):
+                        cerberus_validator.validate(document)
+                        expected = cerberus_violations(cerberus_validator.errors, schema_name)
+                        violations = native.find_violations(document, schema_name, schema_name)
+                        self.assertSetEqual({(v["path"], v["message"]) for v in violations}, expected)
+
+    def test_unsupported_rules(self):
+        schema = {"Name": {"type": "string", "maxlength": 8}}
+        with self.assertRaises(ValueError):
+            self.validator._compile_schema(schema)
+        with self.assertRaises(ValueError):
+            self.validator._compile_rule({"type": "datetime"})
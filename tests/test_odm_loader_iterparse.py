@@ -0,0 +1,72 @@
+import unittest
+import odmlib.odm_loader as OL
+import odmlib.odm_parser as P
+import odmlib.loader as LD
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.ns_registry as NS
+import os
+
+
+class TestODMLoaderIterParse(unittest.TestCase):
+    def setUp(self) -> None:
+        self.odm_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'odm-data-snapshot.xml')
+        self.loader = LD.ODMLoader(OL.XMLODMLoader())
+
+    def test_iter_subject_data(self):
+        subjects = list(self.loader.iter_subject_data(self.odm_file))
+        self.assertEqual(len(subjects), 2)
+        self.assertIsInstance(subjects[0], ODM.SubjectData)
+        self.assertEqual(subjects[0].SubjectKey, "SS_0001")
+        self.assertEqual(subjects[1].SubjectKey, "SS_0002")
+        self.assertEqual(subjects[0].StudyEventData[0].StudyEventOID, "SE.SCREENING")
+
+    def test_iter_subject_data_matches_full_load(self):
+        self.loader.open_odm_document(self.odm_file)
+        odm = self.loader.root()
+        streamed = [sd.to_dict() for sd in self.loader.iter_subject_data(self.odm_file)]
+        loaded = [sd.to_dict() for sd in odm.ClinicalData[0].SubjectData]
+        self.assertListEqual(streamed, loaded)
+
+    def test_iter_item_group_data(self):
+        igd_count = 0
+        for igd in self.loader.iter_item_group_data(self.odm_file):
+            self.assertIsInstance(igd, ODM.ItemGroupData)
+            igd_count += 1
+        self.assertEqual(igd_count, 60)
+
+    def test_iter_item_group_data_context(self):
+        contexts = [(context["SubjectData"]["SubjectKey"], context["StudyEventData"]["StudyEventOID"],
+                     context["FormData"]["FormOID"], igd.ItemGroupOID)
+                    for context, igd in self.loader.iter_item_group_data(self.odm_file, with_context=True)]
+        self.assertEqual(len(contexts), 60)
+        self.assertEqual(contexts[0], ("SS_0001", "SE.SCREENING", "DM", "IG.DM"))
+        self.assertEqual(contexts[-1][0], "SS_0002")
+
+    def test_iter_elements_detaches_finished_elements(self):
+        iter_parser = P.ODMIterParser(self.odm_file)
+        for context, elem in iter_parser.iter_elements("ItemGroupData", with_context=True):
+            # the finished elements before the enclosing SubjectData, StudyEventData and FormData have been removed
+            parent = iter_parser.root
+            for name in ["ClinicalData", "SubjectData", "StudyEventData", "FormData"]:
+                parent = parent[0]
+                self.assertDictEqual(dict(parent.attrib), context[name])
+            self.assertIs(parent[0], elem)
+        self.assertEqual(len(iter_parser.root), 0)
+
+    def test_iter_dataset_item_group_data(self):
+        dataset_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'ae.xml')
+        loader = OL.XMLODMLoader(model_package="dataset_1_0_1", ns_uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        NS.NamespaceRegistry(prefix="odm", uri="http://www.cdisc.org/ns/odm/v1.3", is_default=True)
+        ns = NS.NamespaceRegistry(prefix="data", uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        records = list(loader.iter_item_group_data(dataset_file, ns))
+        self.assertEqual(records[0].ItemGroupOID, "IG.AE")
+        self.assertEqual(records[0].ItemGroupDataSeq, 1)
+        self.assertEqual(records[0].ItemData[2].Value, "CDISC01.100008")
+
+    def test_iter_unknown_namespace(self):
+        with self.assertRaises(ValueError):
+            list(self.loader.iter_document(self.odm_file, "SubjectData", ns_prefix="xyz"))
+
+
+if __name__ == '__main__':
+    unittest.main()
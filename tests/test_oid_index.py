@@ -50,3 +50,30 @@ class TestOIDIndex(unittest.TestCase):
         idx = self.odm.build_oid_index()
         with self.assertRaises(ValueError):
             found = idx.find_all("ODM.CL.XXXX")
+
+    def test_attribute_index_find(self):
+        idx = self.odm.build_attribute_index([("ItemDef", "Name"), ("CodeListItem", "CodedValue")])
+        item = idx.find("ItemDef", "Name", "Site")
+        self.assertEqual(item.OID, "ODM.IT.Common.SiteID")
+        self.assertEqual(len(idx.find_all("CodeListItem", "CodedValue", "AXILLA")), 2)
+        self.assertIsNone(idx.find("ItemDef", "Name", "XXXX"))
+        self.assertListEqual(idx.find_all("CodeListItem", "CodedValue", "XXXX"), [])
+
+    def test_attribute_index_composite_key(self):
+        idx = self.odm.build_attribute_index([("ItemDef", ("Name", "DataType")), ("ItemDef", "OID")])
+        item = idx.find("ItemDef", ("Name", "DataType"), ("Site", "text"))
+        self.assertIs(item, idx.find("ItemDef", "OID", "ODM.IT.Common.SiteID"))
+        self.assertIsNone(idx.find("ItemDef", ("Name", "DataType"), ("Site", "integer")))
+
+    def test_attribute_index_define_domain(self):
+        self.define_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'defineV21-SDTM.xml')
+        self.loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1"))
+        self.loader.open_odm_document(self.define_file)
+        self.odm = self.loader.root()
+        idx = self.odm.build_attribute_index([("ItemGroupDef", "Domain")])
+        self.assertEqual(idx.find("ItemGroupDef", "Domain", "TS").OID, "IG.TS")
+
+    def test_attribute_index_key_not_indexed(self):
+        idx = self.odm.build_attribute_index([("ItemDef", "Name")])
+        with self.assertRaises(ValueError):
+            idx.find("ItemDef", "OID", "ODM.IT.Common.SiteID")
@@ -0,0 +1,47 @@
+import unittest
+import os
+import odmlib.parallel_loader as PL
+import odmlib.odm_loader as OL
+import odmlib.loader as LD
+import odmlib.odm_1_3_2.model as ODM
+
+
+class TestParallelLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        self.odm_file = os.path.join(self.data_path, 'odm-data-snapshot.xml')
+
+    def load_clinical_data(self, odm_file):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(odm_file)
+        return loader.root().ClinicalData
+
+    def test_matches_full_load(self):
+        expected = [cd.to_dict() for cd in self.load_clinical_data(self.odm_file)]
+        for max_workers in [0, 2]:
+            loader = PL.ParallelClinicalDataLoader(max_workers=max_workers, subjects_per_chunk=1)
+            clinical_data = loader.load_clinical_data(self.odm_file)
+            self.assertIsInstance(clinical_data[0], ODM.ClinicalData)
+            self.assertListEqual([cd.to_dict() for cd in clinical_data], expected)
+        self.assertEqual(clinical_data[0].SubjectData[1].SubjectKey, "SS_0002")
+        self.assertTrue(clinical_data[0].verify_order())
+
+    def test_split_at_subject_data(self):
+        loader = PL.ParallelClinicalDataLoader(subjects_per_chunk=1)
+        partitions = loader._split(self.odm_file)
+        self.assertEqual(len(partitions), 1)
+        self.assertEqual(len(partitions[0]), 2)
+        with open(self.odm_file, "rb") as odm_in:
+            data = odm_in.read()
+        prefix, start, end, suffix = partitions[0][1]
+        self.assertTrue(data[start:end].lstrip().startswith(b"<SubjectData"))
+        self.assertTrue(suffix.startswith(b"</ClinicalData>"))
+
+    def test_compact_trusted(self):
+        odm_file = os.path.join(self.data_path, 'test_clinical_data_01.xml')
+        expected = [cd.to_dict() for cd in self.load_clinical_data(odm_file)]
+        loader = PL.ParallelClinicalDataLoader(OL.XMLODMLoader(trusted=True, compact=True), max_workers=2,
+                                               subjects_per_chunk=2)
+        clinical_data = loader.load_clinical_data(odm_file)
+        self.assertIs(type(clinical_data[0]), ODM.ClinicalData.compact_class())
+        self.assertListEqual([cd.to_dict() for cd in clinical_data], expected)
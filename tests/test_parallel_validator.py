@@ -0,0 +1,78 @@
+import unittest
+import os
+import cerberus
+import odmlib.parallel_validator as PV
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.odm_1_3_2.rules.metadata_schema as METADATA
+import odmlib.odm_1_3_2.rules.oid_ref as OID
+import odmlib.define_2_1.rules.metadata_schema as DEFINE_METADATA
+import odmlib.define_2_1.rules.oid_ref as DEFINE_OID
+
+
+class MaxLengthSchema(METADATA.MetadataSchema):
+    """ ODM schemas with a cerberus maxlength rule, which the native conformance checks do not implement """
+    def get_schema(self, schema_name):
+        schema = super().get_schema(schema_name)
+        if schema_name == "MetaDataVersion":
+            item_def = dict(schema["ItemDef"]["schema"]["schema"])
+            item_def["Name"] = {**item_def["Name"], "maxlength": 8}
+            schema = {**schema, "ItemDef": {"type": "list", "schema": {"type": "dict", "schema": item_def}}}
+        return schema
+
+
+class TestParallelValidator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(os.path.join(self.data_path, 'cdash-odm-test.xml'))
+        self.mdv = loader.MetaDataVersion()
+
+    def test_clean_metadataversion(self):
+        validator = PV.ParallelValidator(METADATA.MetadataSchema, OID.OIDRef, max_workers=2, chunk_size=5)
+        report = validator.validate(self.mdv)
+        self.assertListEqual(report["conformance"], [])
+        self.assertListEqual(report["order"], [])
+        self.assertListEqual(report["oids"]["duplicates"], [])
+        oid_checker = OID.OIDRef(collect_errors=True)
+        self.mdv.verify_oids(oid_checker)
+        self.assertEqual(report["oids"], oid_checker.oid_report())
+
+    def test_errors_across_partitions(self):
+        # the ItemDef duplicates a CodeList OID and is referenced from an ItemGroupDef in another partition
+        self.mdv.ItemDef.append(ODM.ItemDef(OID="ODM.CL.NY_SUB_Y_N", Name="Duplicate", DataType="text"))
+        self.mdv.ItemGroupDef[0].ItemRef.append(ODM.ItemRef(ItemOID="ODM.IT.MISSING", Mandatory="No"))
+        del self.mdv.ItemDef[0].__dict__["Name"]
+        report = PV.ParallelValidator(METADATA.MetadataSchema, OID.OIDRef, max_workers=0, chunk_size=5).validate(self.mdv)
+        self.assertListEqual(report["conformance"], [{"path": "MetaDataVersion/ItemDef[0]/Name", "message": "required field"}])
+        self.assertEqual(report["oids"]["duplicates"][0]["first_path"], f"MetaDataVersion/ItemDef[{len(self.mdv.ItemDef) - 1}]")
+        self.assertEqual(report["oids"]["duplicates"][0]["element"], "CodeList")
+        self.assertEqual(report["oids"]["dangling"][0]["paths"], ["MetaDataVersion/ItemGroupDef[0]/ItemRef[" +
+                                                                  str(len(self.mdv.ItemGroupDef[0].ItemRef) - 1) + "]"])
+
+    def test_order_violation(self):
+        item = self.mdv.ItemDef[1]
+        item.__dict__["Description"] = item.__dict__.pop("Description")
+        report = PV.ParallelValidator(max_workers=0).validate(self.mdv)
+        self.assertEqual(report["order"][0]["path"], "MetaDataVersion/ItemDef[1]")
+        self.assertNotIn("oids", report)
+
+    def test_define_metadataversion(self):
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1"))
+        loader.open_odm_document(os.path.join(self.data_path, 'defineV21-SDTM.xml'))
+        mdv = loader.MetaDataVersion()
+        validator = PV.ParallelValidator(DEFINE_METADATA.MetadataSchema, DEFINE_OID.OIDRef, max_workers=2, chunk_size=50)
+        report = validator.validate(mdv)
+        serial_report = PV.ParallelValidator(DEFINE_METADATA.MetadataSchema, DEFINE_OID.OIDRef, max_workers=0,
+                                             chunk_size=len(mdv.ItemDef)).validate(mdv)
+        self.assertDictEqual(report, serial_report)
+
+    def test_unsupported_rule_uses_cerberus(self):
+        report = PV.ParallelValidator(MaxLengthSchema, max_workers=0, chunk_size=5).validate(self.mdv)
+        validator = cerberus.Validator(MaxLengthSchema().get_schema("MetaDataVersion"))
+        self.assertFalse(validator.validate(self.mdv.to_dict()))
+        expected = PV._flatten_errors(validator.errors, "MetaDataVersion")
+        self.assertTrue(expected)
+        self.assertCountEqual(report["conformance"], expected)
@@ -0,0 +1,71 @@
+import unittest
+import math
+import os
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.odm_loader as OL
+import odmlib.ns_registry as NS
+import odmlib.dataset_1_0_1.columnar as COL
+
+
+class TestReadDatasetColumns(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        self.odm_file = os.path.join(self.data_path, 'ae_test.xml')
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0"))
+        loader.open_odm_document(os.path.join(self.data_path, 'define2-0-0-sdtm-test.xml'))
+        self.mdv = loader.MetaDataVersion()
+
+    def load_dataset(self):
+        loader = OL.XMLODMLoader(model_package="dataset_1_0_1", ns_uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        NS.NamespaceRegistry(prefix="odm", uri="http://www.cdisc.org/ns/odm/v1.3", is_default=True)
+        ns = NS.NamespaceRegistry(prefix="data", uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        loader.create_document(self.odm_file, ns)
+        return loader.load_odm()
+
+    def test_columns_match_item_data(self):
+        datasets = COL.ColumnarDatasetReader(self.mdv, use_numpy=False).read(self.odm_file)
+        dataset = datasets["IG.AE"]
+        odm = self.load_dataset()
+        self.assertEqual(len(dataset), len(odm.ClinicalData.ItemGroupData))
+        for row, igd in enumerate(odm.ClinicalData.ItemGroupData):
+            self.assertEqual(dataset.seq[row], igd.ItemGroupDataSeq)
+            self.assertEqual(dataset.row_position(igd.ItemGroupDataSeq), row)
+            for item in igd.ItemData:
+                column = dataset[item.ItemOID]
+                self.assertTrue(column.present[row])
+                self.assertEqual(str(column.values[row]), item.Value)
+        self.assertEqual(dataset["IT.AE.AESEQ"].values.typecode, "q")
+        self.assertEqual(dataset["IT.AE.AETERM"].values[1], "ANXIETY")
+
+    def test_missing_values(self):
+        datasets = COL.ColumnarDatasetReader(data_types={"IT.AE.AESEQ": "float"}, use_numpy=False).read(self.odm_file)
+        dataset = datasets["IG.AE"]
+        for column in dataset.columns.values():
+            self.assertEqual(len(column), len(dataset))
+        column = COL.Column("IT.VS.VSSTRESN", "float")
+        column.append(1, "120.5")
+        column.fill(3)
+        self.assertTrue(math.isnan(column.values[0]))
+        self.assertEqual(column.values[1], 120.5)
+        self.assertEqual(list(column.present), [0, 1, 0])
+
+    def test_invalid_value(self):
+        column = COL.Column("IT.AE.AESEQ", "integer")
+        with self.assertRaises(ValueError):
+            column.append(0, "one")
+
+    def test_integer_outside_int64(self):
+        column = COL.Column("IT.AE.AESEQ", "integer")
+        column.append(1, "7")
+        column.append(2, "9223372036854775808")
+        column.append(3, "8")
+        column.fill(5)
+        self.assertEqual(column.values, [None, 7, 2 ** 63, 8, None])
+        self.assertEqual(list(column.present), [0, 1, 1, 1, 0])
+
+    @unittest.skipIf(COL.NP is None, "numpy is not installed")
+    def test_numpy_columns(self):
+        dataset = COL.ColumnarDatasetReader(self.mdv, use_numpy=True).read(self.odm_file)["IG.AE"]
+        self.assertEqual(dataset["IT.AE.AESEQ"].values.dtype, COL.NP.int64)
+        self.assertEqual(dataset["IT.AE.AESEQ"].present.dtype, COL.NP.bool_)
@@ -0,0 +1,95 @@
+import unittest
+import os
+import shutil
+import tempfile
+import odmlib
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.snapshot as SNAP
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.define_file = os.path.join(self.tmp_dir, 'define2-0-0-sdtm-test.xml')
+        shutil.copy(os.path.join(self.data_path, 'define2-0-0-sdtm-test.xml'), self.define_file)
+        self.snapshot_file = os.path.join(self.tmp_dir, 'define.odmsnap')
+        self.load_count = 0
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def load_define(self, compact=False):
+        self.load_count += 1
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0",
+                                                 compact=compact))
+        loader.open_odm_document(self.define_file)
+        return loader.root()
+
+    def test_read_snapshot(self):
+        odm = self.load_define()
+        SNAP.write_snapshot(self.snapshot_file, odm, SNAP.file_hash(self.define_file))
+        snapshot_odm = SNAP.read_snapshot(self.snapshot_file, SNAP.file_hash(self.define_file))
+        self.assertIs(type(snapshot_odm), type(odm))
+        self.assertDictEqual(snapshot_odm.to_dict(), odm.to_dict())
+        self.assertEqual(list(snapshot_odm.__dict__), list(odm.__dict__))
+        item = snapshot_odm.Study.MetaDataVersion.ItemDef[0]
+        self.assertEqual(item.OID, odm.Study.MetaDataVersion.ItemDef[0].OID)
+        self.assertEqual(item.Length, odm.Study.MetaDataVersion.ItemDef[0].Length)
+        snapshot_odm.verify_order()
+
+    def test_compact_snapshot(self):
+        odm = self.load_define(compact=True)
+        SNAP.write_snapshot(self.snapshot_file, odm)
+        snapshot_odm = SNAP.read_snapshot(self.snapshot_file)
+        self.assertIs(type(snapshot_odm), type(odm))
+        self.assertIs(type(snapshot_odm.Study), type(odm.Study))
+        self.assertDictEqual(snapshot_odm.to_dict(), odm.to_dict())
+
+    def test_snapshot_cache(self):
+        cache = SNAP.SnapshotCache(self.tmp_dir)
+        odm = cache.load(self.define_file, self.load_define)
+        self.assertTrue(os.path.exists(cache.snapshot_file(self.define_file)))
+        cached_odm = cache.load(self.define_file, self.load_define)
+        self.assertEqual(self.load_count, 1)
+        self.assertDictEqual(cached_odm.to_dict(), odm.to_dict())
+        # a change to the source file makes the snapshot out of date
+        with open(self.define_file, "a") as define_out:
+            define_out.write("\n")
+        cache.load(self.define_file, self.load_define)
+        self.assertEqual(self.load_count, 2)
+
+    def test_corrupt_snapshot(self):
+        cache = SNAP.SnapshotCache(self.tmp_dir)
+        odm = cache.load(self.define_file, self.load_define)
+        snapshot_file = cache.snapshot_file(self.define_file)
+        # the temporary file the snapshot is written to is renamed
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         ['define2-0-0-sdtm-test.xml', 'define2-0-0-sdtm-test.xml.odmsnap'])
+        with open(snapshot_file, "rb") as snapshot_in:
+            snapshot = snapshot_in.read()
+        # truncated in the header length, the JSON header and the marshal body, and a corrupt body
+        for corrupt in [snapshot[:10], snapshot[:20], snapshot[:len(snapshot) // 2], snapshot[:-1] + b"\xff"]:
+            with open(snapshot_file, "wb") as snapshot_out:
+                snapshot_out.write(corrupt)
+            with self.assertRaises(ValueError):
+                SNAP.read_snapshot(snapshot_file)
+            load_count = self.load_count
+            self.assertDictEqual(cache.load(self.define_file, self.load_define).to_dict(), odm.to_dict())
+            self.assertEqual(self.load_count, load_count + 1)
+            self.assertIsNotNone(SNAP.read_snapshot(snapshot_file))
+
+    def test_model_version(self):
+        SNAP.write_snapshot(self.snapshot_file, self.load_define())
+        version = odmlib.__version__
+        odmlib.__version__ = version + ".dev"
+        try:
+            self.assertIsNone(SNAP.read_snapshot(self.snapshot_file))
+        finally:
+            odmlib.__version__ = version
+        self.assertIsNotNone(SNAP.read_snapshot(self.snapshot_file))
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(ValueError):
+            SNAP.read_snapshot(self.define_file)
@@ -0,0 +1,75 @@
+import unittest
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.odm_element as OE
+import odmlib.odm_1_3_2.model as ODM
+import io
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+ET_ODM_FILE = os.path.join(DATA_DIR, 'test_stream_writer_et.xml')
+STREAM_ODM_FILE = os.path.join(DATA_DIR, 'test_stream_writer.xml')
+
+
+class TestStreamWriter(unittest.TestCase):
+    def tearDown(self) -> None:
+        for odm_file in [ET_ODM_FILE, STREAM_ODM_FILE]:
+            if os.path.exists(odm_file):
+                os.remove(odm_file)
+
+    def _assert_same_as_elementtree(self, odm):
+        odm.write_xml(ET_ODM_FILE)
+        odm.stream_xml(STREAM_ODM_FILE)
+        with open(ET_ODM_FILE, "rb") as et_in, open(STREAM_ODM_FILE, "rb") as stream_in:
+            self.assertEqual(et_in.read(), stream_in.read())
+
+    def test_stream_odm_matches_write_xml(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(os.path.join(DATA_DIR, 'cdash-odm-test.xml'))
+        self._assert_same_as_elementtree(loader.root())
+
+    def test_stream_clinical_data_matches_write_xml(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(os.path.join(DATA_DIR, 'odm-data-snapshot.xml'))
+        self._assert_same_as_elementtree(loader.root())
+
+    def test_stream_define_matches_write_xml(self):
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1"))
+        loader.open_odm_document(os.path.join(DATA_DIR, 'defineV21-SDTM.xml'))
+        self._assert_same_as_elementtree(loader.root())
+
+    def test_escaping(self):
+        item = ODM.ItemData(ItemOID="IT.AETERM", Value="rash & \"itch\" <mild>\n")
+        out = io.StringIO()
+        OE.ODMStreamWriter().write_odm(out, item)
+        self.assertIn('Value="rash &amp; &quot;itch&quot; &lt;mild&gt;&#10;"', out.getvalue())
+        tt = ODM.TranslatedText(_content="AE < 3 & > 1", lang="en")
+        out = io.BytesIO()
+        OE.ODMStreamWriter().write_odm(out, tt)
+        self.assertIn(b'<TranslatedText xml:lang="en"', out.getvalue())
+        self.assertIn(b'>AE &lt; 3 &amp; &gt; 1</TranslatedText>', out.getvalue())
+
+    def test_stream_subject_data_generator(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        snapshot_file = os.path.join(DATA_DIR, 'odm-data-snapshot.xml')
+        loader.open_odm_document(snapshot_file)
+        odm = loader.root()
+        subjects = odm.ClinicalData[0].SubjectData
+        odm.ClinicalData[0].SubjectData = []
+        odm.ClinicalData[0].AuditRecords = [ODM.AuditRecords()]
+        odm.stream_xml(STREAM_ODM_FILE, subject_data=(sd for sd in loader.iter_subject_data(snapshot_file)))
+        loader.open_odm_document(STREAM_ODM_FILE)
+        streamed_odm = loader.root()
+        self.assertListEqual([sd.to_dict() for sd in streamed_odm.ClinicalData[0].SubjectData],
+                             [sd.to_dict() for sd in subjects])
+        self.assertTrue(streamed_odm.verify_order())
+
+    def test_stream_subject_data_without_clinical_data(self):
+        study = ODM.Study(OID="ST.001")
+        with self.assertRaises(ValueError):
+            study.stream_xml(io.StringIO(), subject_data=[ODM.SubjectData(SubjectKey="001")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import os
+import shutil
+import tempfile
+import odmlib.loader as LD
+import odmlib.odm_loader as OL
+import odmlib.subject_index as SI
+
+
+class TestSubjectIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.odm_file = os.path.join(self.tmp_dir, 'odm-data-snapshot.xml')
+        shutil.copy(os.path.join(self.data_path, 'odm-data-snapshot.xml'), self.odm_file)
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(self.odm_file)
+        self.clinical_data = loader.root().ClinicalData[0]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_subject(self):
+        index = SI.SubjectIndex(self.odm_file).open()
+        self.assertEqual(index.subject_keys(), [subject.SubjectKey for subject in self.clinical_data.SubjectData])
+        subject = index.load_subject("SS_0002")
+        self.assertEqual(subject.__class__.__name__, "SubjectData")
+        self.assertDictEqual(subject.to_dict(), self.clinical_data.SubjectData[1].to_dict())
+        with self.assertRaises(KeyError):
+            index.load_subject("SS_9999")
+        with self.assertRaises(ValueError):
+            index.load_study_event("SS_0001", "SE.SCREENING")
+
+    def test_load_event_and_form(self):
+        index = SI.SubjectIndex(self.odm_file, include_events=True).open()
+        expected_event = self.clinical_data.SubjectData[0].StudyEventData[1]
+        event = index.load_study_event("SS_0001", expected_event.StudyEventOID, expected_event.StudyEventRepeatKey)
+        self.assertDictEqual(event.to_dict(), expected_event.to_dict())
+        form = index.load_form("SS_0001", "SE.SCREENING", "VS")
+        self.assertDictEqual(form.to_dict(), self.clinical_data.SubjectData[0].StudyEventData[0].FormData[1].to_dict())
+        with self.assertRaises(KeyError):
+            index.load_form("SS_0001", "SE.SCREENING", "AE")
+
+    def test_sidecar_index(self):
+        SI.SubjectIndex(self.odm_file).open()
+        self.assertTrue(os.path.exists(self.odm_file + ".subjects.json"))
+        index = SI.SubjectIndex(self.odm_file)
+        self.assertTrue(index.load())
+        self.assertEqual(index.subject_keys(), ["SS_0001", "SS_0002"])
+        # the index is out of date when it lacks the events or the ODM file changes
+        self.assertFalse(SI.SubjectIndex(self.odm_file, include_events=True).load())
+        with open(self.odm_file, "a") as odm_out:
+            odm_out.write("\n")
+        self.assertFalse(SI.SubjectIndex(self.odm_file).load())
+        self.assertEqual(SI.SubjectIndex(self.odm_file).open().load_subject("SS_0001").SubjectKey, "SS_0001")
+
+    def test_subject_key_in_two_clinical_data(self):
+        with open(self.odm_file, "r", encoding="utf-8") as odm_in:
+            odm_text = odm_in.read()
+        start, end = odm_text.index("<ClinicalData"), odm_text.index("</ClinicalData>") + len("</ClinicalData>")
+        clinical_data = odm_text[start:end]
+        second = clinical_data.replace('MetaDataVersionOID="v1.0.0"', 'MetaDataVersionOID="v2.0.0"')
+        with open(self.odm_file, "w", encoding="utf-8") as odm_out:
+            odm_out.write(odm_text[:end] + second + odm_text[end:])
+        index = SI.SubjectIndex(self.odm_file, include_events=True).open()
+        self.assertEqual(index.subject_keys(), ["SS_0001", "SS_0002"])
+        with self.assertRaises(ValueError):
+            index.load_subject("SS_0002")
+        subject = index.load_subject("SS_0002", "1001_virus", "v2.0.0")
+        self.assertDictEqual(subject.to_dict(), self.clinical_data.SubjectData[1].to_dict())
+        form = index.load_form("SS_0001", "SE.SCREENING", "VS", metadata_version_oid="v1.0.0")
+        self.assertDictEqual(form.to_dict(), self.clinical_data.SubjectData[0].StudyEventData[0].FormData[1].to_dict())
+        with self.assertRaises(KeyError):
+            index.load_subject("SS_0001", "1001_virus", "v3.0.0")
+
+    def test_invalid_subject_keys(self):
+        with open(self.odm_file, "r", encoding="utf-8") as odm_in:
+            odm_text = odm_in.read()
+        with open(self.odm_file, "w", encoding="utf-8") as odm_out:
+            odm_out.write(odm_text.replace('SubjectKey="SS_0002"', 'SubjectKey="SS_0001"'))
+        with self.assertRaises(ValueError):
+            SI.SubjectIndex(self.odm_file).build()
+        with open(self.odm_file, "w", encoding="utf-8") as odm_out:
+            odm_out.write(odm_text.replace(' SubjectKey="SS_0002"', ''))
+        with self.assertRaises(ValueError):
+            SI.SubjectIndex(self.odm_file).build()
+
+    def test_document_encoding(self):
+        with open(self.odm_file, "r", encoding="utf-8") as odm_in:
+            odm_text = odm_in.read()
+        odm_text = odm_text.replace('encoding="UTF-8"', 'encoding="ISO-8859-1"', 1)
+        odm_text = odm_text.replace('SubjectKey="SS_0001"', 'SubjectKey="SS_é01"')
+        odm_text = odm_text.replace('SubjectKey="SS_0002"', 'SubjectKey="SS_&#233;&#x41;02"')
+        latin_file = os.path.join(self.tmp_dir, 'odm-latin-1.xml')
+        with open(latin_file, "wb") as odm_out:
+            odm_out.write(odm_text.encode("iso-8859-1", "xmlcharrefreplace"))
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(latin_file)
+        clinical_data = loader.root().ClinicalData[0]
+        index = SI.SubjectIndex(latin_file, include_events=True).open()
+        self.assertEqual(index.subject_keys(), ["SS_é01", "SS_éA02"])
+        self.assertDictEqual(index.load_subject("SS_éA02").to_dict(), clinical_data.SubjectData[1].to_dict())
+        self.assertDictEqual(index.load_form("SS_é01", "SE.SCREENING", "VS").to_dict(),
+                             clinical_data.SubjectData[0].StudyEventData[0].FormData[1].to_dict())
+
+    def test_wide_encoding(self):
+        with open(self.odm_file, "r", encoding="utf-8") as odm_in:
+            odm_text = odm_in.read().replace('encoding="UTF-8"', 'encoding="UTF-16"', 1)
+        utf16_file = os.path.join(self.tmp_dir, 'odm-utf-16.xml')
+        with open(utf16_file, "wb") as odm_out:
+            odm_out.write(odm_text.encode("utf-16"))
+        with self.assertRaises(ValueError):
+            SI.SubjectIndex(utf16_file).build()
@@ -0,0 +1,82 @@
+import unittest
+import odmlib.load_plan as LP
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+import os
+
+
+class TestTrustedLoad(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+
+    def test_trusted_matches_validated_odm(self):
+        odm_file = os.path.join(self.data_path, 'cdash-odm-test.xml')
+        documents = []
+        for trusted in [False, True]:
+            loader = OL.XMLODMLoader(trusted=trusted)
+            loader.create_document(odm_file)
+            odm = loader.load_odm()
+            documents.append(odm.to_dict())
+        self.assertDictEqual(documents[0], documents[1])
+        odm.validate()
+        self.assertTrue(odm.verify_order())
+
+    def test_trusted_matches_validated_define(self):
+        define_file = os.path.join(self.data_path, 'defineV21-SDTM.xml')
+        documents = []
+        for trusted in [False, True]:
+            loader = DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1",
+                                        trusted=trusted)
+            loader.create_document(define_file)
+            documents.append(loader.load_odm())
+        self.assertDictEqual(documents[0].to_dict(), documents[1].to_dict())
+        self.assertEqual(documents[0].to_xml_string(), documents[1].to_xml_string())
+        documents[1].validate()
+
+    def test_trusted_matches_validated_json(self):
+        json_file = os.path.join(self.data_path, 'cdash_odm_test.json')
+        documents = []
+        for trusted in [False, True]:
+            loader = OL.JSONODMLoader(trusted=trusted)
+            loader.create_document(json_file)
+            documents.append(loader.load_odm().to_dict())
+        self.assertDictEqual(documents[0], documents[1])
+
+    def test_trusted_converts_numbers(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemDef")
+        item = plan.create({"OID": "IT.AGE", "Name": "Age", "DataType": "integer", "Length": "3",
+                            "SignificantDigits": "0"}, trusted=True)
+        self.assertEqual(item.Length, 3)
+        self.assertIsInstance(item.Length, int)
+
+    def test_validate_invalid_value(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemDef")
+        item = plan.create({"OID": "IT.AGE", "Name": "Age", "DataType": "integer", "Length": "three"}, trusted=True)
+        self.assertEqual(item.Length, "three")
+        with self.assertRaises(TypeError):
+            item.validate()
+
+    def test_validate_missing_required(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemRef")
+        item_ref = plan.create({"Mandatory": "Yes"}, trusted=True)
+        with self.assertRaises(ValueError):
+            item_ref.validate()
+
+    def test_validate_child_element(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemGroupDef")
+        igd = plan.create({"OID": "IG.VS", "Name": "VS", "Repeating": "Yes"}, trusted=True)
+        item_ref = LP.LoadPlan.get_plan(ODM, "ItemRef").create({"ItemOID": "IT.VSTESTCD", "Mandatory": "Yes",
+                                                                 "OrderNumber": "first"}, trusted=True)
+        plan.set_child(igd, ODM.ItemGroupDef.ItemRef, [item_ref], trusted=True)
+        with self.assertRaises(TypeError):
+            igd.validate()
+
+    def test_trusted_unknown_attribute(self):
+        plan = LP.LoadPlan.get_plan(ODM, "ItemRef")
+        with self.assertRaises(TypeError):
+            plan.create({"ItemOID": "IT.VSTESTCD", "Mandatory": "Yes", "Required": "Yes"}, trusted=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
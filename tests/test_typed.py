@@ -224,6 +224,17 @@ class TestTyped(unittest.TestCase):
         with self.assertRaises(ValueError):
             odm = ODM.ODM(**attrs)
 
+    def test_datetime_type_repeated_values(self):
+        # validation results are cached so repeated values must still be checked on every assignment
+        for _ in range(3):
+            stamp = ODM.DateTimeStamp(_content="2020-07-13T00:13:51")
+            self.assertEqual(stamp._content, "2020-07-13T00:13:51")
+            with self.assertRaises(ValueError):
+                ODM.DateTimeStamp(_content="2020-07-13T00:13:61")
+        with self.assertRaises(ValueError):
+            stamp._content = "2020-07-13T00:13:61"
+        self.assertEqual(stamp._content, "2020-07-13T00:13:51")
+
     def set_datetime(self):
         """return the current datetime in ISO 8601 format"""
         return datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
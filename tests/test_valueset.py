@@ -0,0 +1,47 @@
+import unittest
+import odmlib.odm_1_3_2.model as ODM
+import odmlib.define_2_1.model as DEFINE
+import odmlib.valueset as VS
+
+
+class SponsorItemRef(ODM.ItemRef):
+    pass
+
+
+class TestValueSet(unittest.TestCase):
+    def test_value_set_bound_to_class(self):
+        value_set = ODM.ItemRef.Mandatory.value_sets[ODM.ItemRef]
+        self.assertIsInstance(value_set, frozenset)
+        self.assertSetEqual(value_set, {"Yes", "No"})
+        # descriptors shared by the define model classes are bound for each class
+        self.assertIs(DEFINE.ItemGroupDef.Repeating, ODM.ItemGroupDef.Repeating)
+        self.assertSetEqual(DEFINE.ItemGroupDef.Repeating.value_sets[DEFINE.ItemGroupDef],
+                            set(VS.ValueSet.value_set("ItemGroupDef.Repeating")))
+
+    def test_invalid_value(self):
+        item_ref = ODM.ItemRef(ItemOID="IT.VS.VSTESTCD", Mandatory="Yes")
+        with self.assertRaises(ValueError) as context:
+            item_ref.Mandatory = "Maybe"
+        self.assertEqual(str(context.exception), "Invalid value Maybe for Mandatory. Value must be one of No, Yes")
+        self.assertEqual(item_ref.Mandatory, "Yes")
+
+    def test_inherited_descriptor(self):
+        item_ref = SponsorItemRef()
+        item_ref.Mandatory = "No"
+        self.assertEqual(item_ref.Mandatory, "No")
+        with self.assertRaises(ValueError):
+            item_ref.Mandatory = "Maybe"
+
+    def test_package_value_sets(self):
+        odm_132 = VS.ValueSet.package_value_sets("odmlib.odm_1_3_2.model")
+        self.assertIs(odm_132, VS.ValueSet.package_value_sets("odmlib.odm_1_3_2.model"))
+        self.assertIn("CRF", odm_132["Origin.Type"])
+        odm_20 = VS.ValueSet.package_value_sets("odmlib.odm_2_0.model")
+        self.assertIn("Collected", odm_20["Origin.Type"])
+        self.assertNotIn("CRF", odm_20["Origin.Type"])
+        # entries missing from the odm_2_0 value sets come from odmlib.valueset
+        self.assertSetEqual(odm_20["ItemRef.Core"], set(VS.ValueSet.value_set("ItemRef.Core")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import io
+import os
+import odmlib.define_loader as DL
+import odmlib.loader as LD
+import odmlib.odm_loader as OL
+import odmlib.ns_registry as NS
+import odmlib.dataset_1_0_1.columnar as COL
+
+
+class TestWriteDatasetColumns(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        self.odm_file = os.path.join(self.data_path, 'ae_test.xml')
+        self.output_file = os.path.join(self.data_path, 'ae_columns_test.xml')
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_0", ns_uri="http://www.cdisc.org/ns/def/v2.0"))
+        loader.open_odm_document(os.path.join(self.data_path, 'define2-0-0-sdtm-test.xml'))
+        self.mdv = loader.MetaDataVersion()
+        self.item_group_def = self.mdv.find("ItemGroupDef", "OID", "IG.AE")
+        self.writer = COL.ColumnarDatasetWriter(self.item_group_def, "ODM.DATASET.001", "cdisc.odmlib.001", "MDV.001",
+                                                {"Originator": "swhume", "SourceSystem": "odmlib"})
+
+    def tearDown(self) -> None:
+        if os.path.exists(self.output_file):
+            os.remove(self.output_file)
+
+    def load_dataset(self, odm_file):
+        loader = OL.XMLODMLoader(model_package="dataset_1_0_1", ns_uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        NS.NamespaceRegistry(prefix="odm", uri="http://www.cdisc.org/ns/odm/v1.3", is_default=True)
+        ns = NS.NamespaceRegistry(prefix="data", uri="http://www.cdisc.org/ns/Dataset-XML/v1.0")
+        loader.create_document(odm_file, ns)
+        return loader.load_odm()
+
+    def test_write_columns(self):
+        dataset = COL.ColumnarDatasetReader(self.mdv, use_numpy=False).read(self.odm_file)["IG.AE"]
+        self.writer.write_columns(self.output_file, dataset)
+        odm = self.load_dataset(self.output_file)
+        original = self.load_dataset(self.odm_file)
+        self.assertEqual(odm.FileOID, "ODM.DATASET.001")
+        self.assertEqual(odm.Originator, "swhume")
+        self.assertEqual(odm.ClinicalData.StudyOID, "cdisc.odmlib.001")
+        self.assertEqual(len(odm.ClinicalData.ItemGroupData), len(original.ClinicalData.ItemGroupData))
+        for igd, original_igd in zip(odm.ClinicalData.ItemGroupData, original.ClinicalData.ItemGroupData):
+            self.assertEqual(igd.ItemGroupOID, "IG.AE")
+            self.assertEqual(igd.ItemGroupDataSeq, original_igd.ItemGroupDataSeq)
+            self.assertEqual([(item.ItemOID, item.Value) for item in igd.ItemData],
+                             [(item.ItemOID, item.Value) for item in original_igd.ItemData])
+
+    def test_float_round_trip(self):
+        data_types = {"IT.AE.AESEQ": "float"}
+        dataset = COL.ColumnarDatasetReader(data_types=data_types, use_numpy=False).read(self.odm_file)["IG.AE"]
+        dataset["IT.AE.AESEQ"].values[0] = 1.5
+        self.writer.write_columns(self.output_file, dataset)
+        odm = self.load_dataset(self.output_file)
+        original = self.load_dataset(self.odm_file)
+        values = [igd.ItemData[3].Value for igd in odm.ClinicalData.ItemGroupData]
+        self.assertEqual(values[0], "1.5")
+        self.assertEqual(values[1:], [igd.ItemData[3].Value for igd in original.ClinicalData.ItemGroupData[1:]])
+        self.assertEqual(values[1], "2")
+
+    def test_write_rows(self):
+        rows = ({"IT.STUDYID": "CDISC01", "IT.AE.AESEQ": seq, "IT.AE.AETERM": "HEADACHE" if seq % 2 else None,
+                 "IT.USUBJID": "CDISC01.100008"} for seq in range(1, 4))
+        out = io.StringIO()
+        self.writer.write_rows(out, rows)
+        igds = list(COL.ColumnarDatasetReader(use_numpy=False).read(io.StringIO(out.getvalue())).values())
+        dataset = igds[0]
+        self.assertEqual(list(dataset.seq), [1, 2, 3])
+        self.assertEqual(list(dataset.columns), ["IT.STUDYID", "IT.USUBJID", "IT.AE.AESEQ", "IT.AE.AETERM"])
+        self.assertEqual(dataset["IT.AE.AETERM"].values, ["HEADACHE", None, "HEADACHE"])
+        self.assertEqual(list(dataset["IT.AE.AETERM"].present), [1, 0, 1])
+
+    def test_write_sequence_rows(self):
+        row = ["CDISC01", "AE", "CDISC01.100008", 1, None, "A & B <C>"] + [None] * (len(self.writer.item_oids) - 6)
+        out = io.BytesIO()
+        self.writer.write_rows(out, [row], start_seq=10)
+        content = out.getvalue().decode("utf-8")
+        self.assertIn("data:ItemGroupDataSeq=\"10\"", content)
+        self.assertIn("<ItemData ItemOID=\"IT.AE.AETERM\" Value=\"A &amp; B &lt;C&gt;\" />", content)
+        self.assertNotIn("IT.AE.AESPID", content)
+
+    def test_invalid_columns(self):
+        with self.assertRaises(ValueError):
+            self.writer.write_columns(io.StringIO(), {"IT.STUDYID": ["CDISC01"], "IT.VS.VSTESTCD": ["SYSBP"]})
+        with self.assertRaises(ValueError):
+            self.writer.write_columns(io.StringIO(), {"IT.STUDYID": ["CDISC01"], "IT.AE.AESEQ": [1, 2]})
+        with self.assertRaises(ValueError):
+            self.writer.write_rows(io.StringIO(), [["CDISC01", "AE"]])
@@ -0,0 +1,88 @@
+import unittest
+import odmlib.odm_loader as OL
+import odmlib.define_loader as DL
+import odmlib.odm_parser as P
+import odmlib.xml_backend as XB
+import odmlib.loader as LD
+import odmlib.odm_element as OE
+import os
+
+ODM_XML_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'cdash-odm-test.xml')
+DEFINE_XML_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'defineV21-SDTM.xml')
+LXML_ODM_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'test_lxml_writer.xml')
+
+
+class TestXMLBackend(unittest.TestCase):
+    def test_default_backend(self):
+        self.assertIsInstance(XB.get_backend(), XB.ElementTreeBackend)
+        self.assertEqual(XB.get_backend("etree").name, "etree")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            XB.get_backend("sax")
+
+    def test_lxml_fallback(self):
+        backend = XB.get_backend("lxml")
+        self.assertEqual(backend.name, "lxml" if XB.LXML is not None else "etree")
+
+    def test_static_writer(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(ODM_XML_FILE)
+        odm = loader.root()
+        OE.ODMWriter.write_odm(LXML_ODM_FILE, odm.to_xml())
+        loader.open_odm_document(LXML_ODM_FILE)
+        self.assertDictEqual(loader.root().to_dict(), odm.to_dict())
+        os.remove(LXML_ODM_FILE)
+
+    @unittest.skipIf(XB.LXML is None, "lxml is not installed")
+    def test_lxml_parser_odm(self):
+        documents = []
+        for backend in ["etree", "lxml"]:
+            loader = LD.ODMLoader(OL.XMLODMLoader(xml_backend=backend))
+            loader.open_odm_document(ODM_XML_FILE)
+            documents.append(loader.root().to_dict())
+        self.assertDictEqual(documents[0], documents[1])
+
+    @unittest.skipIf(XB.LXML is None, "lxml is not installed")
+    def test_lxml_parser_define(self):
+        documents = []
+        for backend in ["etree", "lxml"]:
+            loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1",
+                                                     xml_backend=backend))
+            loader.open_odm_document(DEFINE_XML_FILE)
+            documents.append(loader.MetaDataVersion().to_dict())
+        self.assertDictEqual(documents[0], documents[1])
+
+    @unittest.skipIf(XB.LXML is None, "lxml is not installed")
+    def test_lxml_string_parser(self):
+        with open(ODM_XML_FILE, "r", encoding="utf-8") as odm_in:
+            odm_string = odm_in.read()
+        parser = P.ODMStringParser(odm_string, xml_backend="lxml")
+        root = parser.parse()
+        self.assertEqual(root.attrib["FileOID"], "CDASH_File_2011-10-24")
+        self.assertEqual(len(parser.MetaDataVersion()), 1)
+
+    @unittest.skipIf(XB.LXML is None, "lxml is not installed")
+    def test_lxml_writer(self):
+        loader = LD.ODMLoader(OL.XMLODMLoader())
+        loader.open_odm_document(ODM_XML_FILE)
+        odm = loader.root()
+        odm.write_xml(LXML_ODM_FILE, xml_backend="lxml")
+        loader.open_odm_document(LXML_ODM_FILE)
+        self.assertDictEqual(loader.root().to_dict(), odm.to_dict())
+        os.remove(LXML_ODM_FILE)
+
+    @unittest.skipIf(XB.LXML is None, "lxml is not installed")
+    def test_lxml_writer_define_namespaces(self):
+        loader = LD.ODMLoader(DL.XMLDefineLoader(model_package="define_2_1", ns_uri="http://www.cdisc.org/ns/def/v2.1"))
+        loader.open_odm_document(DEFINE_XML_FILE)
+        odm = loader.root()
+        OE.ODMWriter.write_odm(LXML_ODM_FILE, odm.to_xml(), xml_backend="lxml")
+        loader.open_odm_document(LXML_ODM_FILE)
+        mdv = loader.MetaDataVersion()
+        self.assertDictEqual(mdv.to_dict(), odm.Study.MetaDataVersion.to_dict())
+        os.remove(LXML_ODM_FILE)
+
+
+if __name__ == '__main__':
+    unittest.main()